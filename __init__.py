@@ -9,14 +9,15 @@ bl_info = {
 }
 
 from pathlib import Path
-from typing import Tuple, Union
+from typing import Tuple
 
-from bpy.app.timers import register as register_timer
 from bpy.types import Context, Event, Operator, SpaceView3D, WindowManager
 from bpy.utils import register_class, unregister_class
 
-from .bwl.content import Font, Texture
-from .bwl.style import Align, Color, Corners, Direction, Display, Sides, Size, Style, Visibility
+from .bwl.animation import add_frame_callback, remove_frame_callback
+from .bwl.resources import get_resource_manager
+from .bwl.sheet import StyleSheet
+from .bwl.style import Align, Color, Corners, Direction, Display, Sides, Size, Style, Transition, Visibility
 from .bwl.utility import hide_hud, show_hud
 from .bwl.widget import Widget
 
@@ -34,11 +35,12 @@ class ExampleOperator(Operator):
         try:
             ExampleOperator.should_close = False
 
-            # Load resources.
+            # Load resources, running the operator again reuses them if they weren't freed yet.
+            resources = get_resource_manager()
             resources_path = Path(__file__).parent.joinpath('resources')
-            res_texture_blender = Texture.from_file(resources_path.joinpath('blender.png'))
-            res_texture_cross = Texture.from_file(resources_path.joinpath('cross.png'))
-            res_font_roboto = Font(resources_path.joinpath('roboto.ttf'))
+            res_texture_blender = resources.texture(resources_path.joinpath('blender.png'))
+            res_texture_cross = resources.texture(resources_path.joinpath('cross.png'))
+            res_font_roboto = resources.font(resources_path.joinpath('roboto.ttf'))
 
             self.resources = (
                 res_texture_blender,
@@ -78,8 +80,10 @@ class ExampleOperator(Operator):
                 def on_mouse_move(self, context: Context, event: Event) -> bool:
                     if 'MIDDLEMOUSE' in self.buttons:
                         mouse_x, mouse_y = self.get_mouse_pos(context, event)
-                        self.styles[0].offset_x += mouse_x - self.mouse_prev_x
-                        self.styles[0].offset_y += mouse_y - self.mouse_press_y
+                        self.styles[0] = self.styles[0].replace(
+                            offset_x=self.styles[0].offset_x + mouse_x - self.mouse_prev_x,
+                            offset_y=self.styles[0].offset_y + mouse_y - self.mouse_press_y,
+                        )
                         self.mouse_prev_x, self.mouse_press_y = mouse_x, mouse_y
 
                 def on_key_press(self, context: Context, event: Event) -> bool:
@@ -173,70 +177,48 @@ class ExampleOperator(Operator):
                 ),
             ]
 
-            # Create scroll box widget type.
-            class ScrollBox(Widget):
-                moving: bool = False
-
-                def get_limit(self) -> float:
-                    if self._style.direction is Direction.HORIZONTAL:
-                        return self._layout.content.width - self._layout.inside.width
-                    elif self._style.direction is Direction.VERTICAL:
-                        return self._layout.content.height - self._layout.inside.height
-
-                def get_mouse_pos(self, context: Context, event: Event) -> float:
-                    if self._style.direction is Direction.HORIZONTAL:
-                        return event.mouse_region_x
-                    elif self._style.direction is Direction.VERTICAL:
-                        return context.area.height - event.mouse_region_y
-
-                def on_mouse_press(self, context: Context, event: Event) -> bool:
-                    if event.type == 'LEFTMOUSE':
-                        self.mouse_prev = self.get_mouse_pos(context, event)
-                        return True
-
-                def on_mouse_release(self, context: Context, event: Event) -> bool:
-                    if event.type == 'LEFTMOUSE':
-                        self.moving = False
-
-                def on_mouse_move(self, context: Context, event: Event) -> bool:
-                    if 'LEFTMOUSE' in self.buttons:
-                        mouse = self.get_mouse_pos(context, event)
-                        delta = mouse - self.mouse_prev
-
-                        if self.moving:
-                            self.styles[0].scroll = max(0, min(self.get_limit(), self.styles[0].scroll - delta))
-                            self.mouse_prev = mouse
-
-                        elif abs(delta) > 10:
-                            self.moving = True
-                            self.mouse_prev = mouse
-
-                def on_mouse_scroll(self, context: Context, event: Event) -> bool:
-                    wheel = 10 if event.type == 'WHEELUPMOUSE' else -10
-                    self.styles[0].scroll = max(0, min(self.get_limit(), self.styles[0].scroll - wheel))
-                    return True
-
-            # Create scroll box item widget type.
+            # Create scroll box item widget type, scroll boxes scroll by themselves.
             class ScrollBoxItem(Widget):
-                select: bool = False
 
                 def on_mouse_release(self, context: Context, event: Event) -> bool:
-                    if not self.parent.moving:
+                    if not self.parent.scroller.dragging:
                         if event.type == 'LEFTMOUSE':
                             if event.ctrl:
-                                self.select = not self.select
+                                self.classes = self.classes ^ {'selected'}
                             else:
                                 for sibling in self.siblings:
-                                    sibling.select = False
-                                self.select = True
+                                    sibling.classes = sibling.classes - {'selected'}
+                                self.classes = self.classes | {'selected'}
+
+            # Share item styles through a style sheet instead of repeating them per item.
+            self.root.style_sheet = StyleSheet({
+                '.item': Style(
+                    align_x=Align.CENTER,
+                    align_y=Align.CENTER,
+                    width=Size.absolute(200),
+                    height=Size.absolute(70),
+                    margin=Sides(2),
+                    foreground_color=Color(0.85),
+                    background_color=Color(0.3),
+                    border_color=Color(0.15),
+                    border_thickness=1,
+                    font=res_font_roboto,
+                    transition=Transition(0.15, properties=('foreground_color', 'background_color')),
+                ),
+                '.item:hover': Style(
+                    foreground_color=Color(1.0),
+                    background_color=Color(0.4),
+                ),
+                '.item.selected': Style(background_color=Color(0.25, 0.45, 0.65)),
+                '.item.selected:hover': Style(background_color=Color(0.35, 0.55, 0.75)),
+            })
 
             # Setup scroll boxes.
             for direction in Direction:
-                scroll_box = ScrollBox(parent=frame)
+                scroll_box = Widget(parent=frame)
                 scroll_box.styles = [
                     Style(
                         display=Display.SCROLL,
-                        scroll=0,
                         direction=direction,
                         width=Size.flexible() if direction is Direction.HORIZONTAL else Size.children(),
                         height=Size.flexible() if direction is Direction.VERTICAL else Size.children(),
@@ -257,33 +239,7 @@ class ExampleOperator(Operator):
                 # Setup scroll box items.
                 for number in range(1, 11):
                     element = ScrollBoxItem(parent=scroll_box)
-                    element.styles = [
-                        Style(
-                            align_x=Align.CENTER,
-                            align_y=Align.CENTER,
-                            width=Size.absolute(200),
-                            height=Size.absolute(70),
-                            margin=Sides(2),
-                            foreground_color=Color(0.85),
-                            background_color=Color(0.3),
-                            border_color=Color(0.15),
-                            border_thickness=1,
-                            font=res_font_roboto,
-                        ),
-                        Style(
-                            criteria=lambda widget, context: widget.hover,
-                            foreground_color=Color(1.0),
-                            background_color=Color(0.4),
-                        ),
-                        Style(
-                            criteria=lambda widget, context: widget.select,
-                            background_color=Color(0.25, 0.45, 0.65),
-                        ),
-                        Style(
-                            criteria=lambda widget, context: widget.hover and widget.select,
-                            background_color=Color(0.35, 0.55, 0.75),
-                        ),
-                    ]
+                    element.classes = {'item'}
                     element.text = f'Item number {number}'
 
             # Finally compute layout and styles.
@@ -319,14 +275,28 @@ class ExampleOperator(Operator):
             raise
 
     def draw_callback(self, context: Context):
+        # Animated styles can change layout, so compute before drawing an animation frame.
+        if self.animation_frame:
+            self.animation_frame = False
+            self.root.compute(context)
+
         self.root.render(context)
 
+    def frame_callback(self):
+        self.animation_frame = True
+        self.area.tag_redraw()
+
     def setup(self, context: Context) -> bool:
         hide_hud(context, sidebar=True, redo=True)
 
         self.draw_handler = SpaceView3D.draw_handler_add(self.draw_callback, (context,), 'WINDOW', 'POST_PIXEL')
         context.area.tag_redraw()
 
+        # Redraw while transitions run, the animation timer stops by itself when they're done.
+        self.area = context.area
+        self.animation_frame = False
+        add_frame_callback(self.frame_callback)
+
         if not WindowManager.modal_handler_add(self):
             raise Exception('Failed to add modal handler')
 
@@ -335,6 +305,7 @@ class ExampleOperator(Operator):
         for step in (
             lambda: show_hud(context),
             lambda: SpaceView3D.draw_handler_remove(self.draw_handler, 'WINDOW'),
+            lambda: remove_frame_callback(self.frame_callback),
             lambda: context.area.tag_redraw(),
         ):
             try:
@@ -342,16 +313,12 @@ class ExampleOperator(Operator):
             except:
                 pass
 
-        # Clean up textures and fonts.
-        def cleanup_resources(resources: Tuple[Union[Texture, Font], ...]):
-            for resource in resources:
-                try:
-                    resource.remove()
-                except:
-                    pass
-
-        # Delay resource cleanup until operator is likely finished.
-        register_timer(lambda: cleanup_resources(self.resources))
+        # Release textures and fonts, the resource manager frees them on a timer once the operator is finished.
+        for resource in self.resources:
+            try:
+                get_resource_manager().release(resource)
+            except:
+                pass
 
 
 classes = (ExampleOperator,)
@@ -0,0 +1 @@
+'''Benchmarks for style, layout, event dispatch and rendering, run with `python -m benchmarks`.'''
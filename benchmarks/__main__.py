@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import json
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+from .suite import run
+from .trees import TREES
+
+
+def main() -> int:
+    parser = ArgumentParser(prog='python -m benchmarks', description='Benchmark the Blender Widget Library.')
+    parser.add_argument('--trees', nargs='+', choices=sorted(TREES), default=list(TREES))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--threshold', type=float, default=1.2, help='scaling exponent that counts as a regression')
+    parser.add_argument('--output', type=Path, help='write results to this JSON file instead of stdout')
+    args = parser.parse_args()
+
+    results = run(args.trees, args.sizes, args.repeat, args.threshold)
+    text = json.dumps(results, indent=2)
+
+    if args.output is not None:
+        args.output.write_text(text)
+    else:
+        print(text)
+
+    for regression in results['regressions']:
+        print(f"{regression['tree']}.{regression['stage']} scales with exponent {regression['scaling']:.2f}", file=sys.stderr)
+
+    return 1 if results['regressions'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import gc
+import math
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Sequence
+
+from bwl.backends import set_backend
+from bwl.backends.headless import Context, Event, HeadlessBackend
+from bwl.layout import (
+    compute_height,
+    compute_scissor,
+    compute_text_size,
+    compute_text_x,
+    compute_text_y,
+    compute_width,
+    compute_x,
+    compute_y,
+)
+from bwl.render import render_widget
+from bwl.style import compute_style
+from bwl.widget import Widget
+
+from .trees import TREES
+
+# Area size used for every benchmark.
+WIDTH = 1920
+HEIGHT = 1080
+
+
+def _best(function: Callable[[], None], repeat: int) -> float:
+    '''Best time in seconds out of several runs, without garbage collection pauses.'''
+    best = math.inf
+    enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if enabled:
+            gc.enable()
+
+    return best
+
+
+def _events(kind: str, count: int = 100) -> List[Event]:
+    '''Synthesize a stream of events spread over the area.'''
+    events = []
+
+    for index in range(count):
+        x = (index * 37) % WIDTH
+        y = (index * 53) % HEIGHT
+
+        if kind == 'move':
+            events.append(Event('MOUSEMOVE', mouse_region_x=x, mouse_region_y=y))
+        elif kind == 'press':
+            events.append(Event('MOUSEMOVE', mouse_region_x=x, mouse_region_y=y))
+            events.append(Event('LEFTMOUSE', 'PRESS', mouse_region_x=x, mouse_region_y=y))
+            events.append(Event('LEFTMOUSE', 'RELEASE', mouse_region_x=x, mouse_region_y=y))
+        elif kind == 'scroll':
+            events.append(Event('WHEELDOWNMOUSE', 'PRESS', mouse_region_x=x, mouse_region_y=y))
+
+    return events
+
+
+def benchmark_tree(root: Widget, context: Context, repeat: int) -> Dict[str, float]:
+    '''Time every stage of a frame for one tree.'''
+    results = {}
+
+    results['compute_style'] = _best(lambda: compute_style(root, context), repeat)
+
+    results['compute_width'] = _best(lambda: compute_width(root, context), repeat)
+    results['compute_height'] = _best(lambda: compute_height(root, context), repeat)
+    results['compute_x'] = _best(lambda: compute_x(root, context), repeat)
+    results['compute_y'] = _best(lambda: compute_y(root, context), repeat)
+    results['compute_scissor'] = _best(lambda: compute_scissor(root, context), repeat)
+    results['compute_text_size'] = _best(lambda: compute_text_size(root, context), repeat)
+    results['compute_text_x'] = _best(lambda: compute_text_x(root, context), repeat)
+    results['compute_text_y'] = _best(lambda: compute_text_y(root, context), repeat)
+
+    for kind in ('move', 'press', 'scroll'):
+        events = _events(kind)
+
+        def handle():
+            for event in events:
+                root.handle(context, event)
+
+        results[f'handle_{kind}'] = _best(handle, repeat) / len(events)
+
+    results['render_widget'] = _best(lambda: render_widget(root, context), repeat)
+    results['frame'] = _best(lambda: (root.compute(context), root.render(context)), repeat)
+
+    return results
+
+
+def count_widgets(root: Widget) -> int:
+    '''Number of widgets in a tree.'''
+    return 1 + sum(count_widgets(child) for child in root._children)
+
+
+def memory_per_widget(build: Callable[[], Widget], context: Context) -> float:
+    '''Bytes allocated per widget to build and compute a tree.'''
+    tracemalloc.start()
+
+    try:
+        root = build()
+        root.compute(context)
+        allocated = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    return allocated / count_widgets(root)
+
+
+def scaling(sizes: Sequence[int], times: Sequence[float]) -> float:
+    '''Exponent of a power law fitted to time over size, 1 means linear.'''
+    points = [(math.log(size), math.log(max(seconds, 1e-9))) for size, seconds in zip(sizes, times)]
+
+    if len(points) < 2:
+        return math.nan
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    denominator = sum((x - mean_x)**2 for x, _ in points)
+    return numerator / denominator
+
+
+def run(trees: Sequence[str], sizes: Sequence[int], repeat: int = 3, threshold: float = 1.2) -> dict:
+    '''Run benchmarks for the given trees and sizes, return results as a JSON compatible dict.'''
+    set_backend(HeadlessBackend(WIDTH, HEIGHT))
+    context = Context(WIDTH, HEIGHT)
+
+    results = {
+        'sizes': list(sizes),
+        'repeat': repeat,
+        'trees': {},
+        'regressions': [],
+    }
+
+    for name in trees:
+        timings: Dict[str, List[float]] = {}
+        memory: List[float] = []
+
+        for size in sizes:
+            memory.append(memory_per_widget(lambda: TREES[name](size), context))
+
+            root = TREES[name](size)
+            root.compute(context)
+
+            for stage, seconds in benchmark_tree(root, context, repeat).items():
+                timings.setdefault(stage, []).append(seconds)
+
+        exponents = {stage: scaling(sizes, times) for stage, times in timings.items()}
+        results['trees'][name] = {'seconds': timings, 'scaling': exponents, 'bytes_per_widget': memory}
+
+        # Anything growing clearly faster than the widget count is a regression.
+        for stage, exponent in exponents.items():
+            if exponent > threshold:
+                results['regressions'].append({'tree': name, 'stage': stage, 'scaling': exponent})
+
+    set_backend(None)
+    return results
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from typing import Callable, Dict
+
+from bwl.backends.headless import Image
+from bwl.content import Font, Texture
+from bwl.grid import GridView
+from bwl.sheet import StyleSheet
+from bwl.style import Align, Color, Corners, Direction, Display, Sides, Size, Style
+from bwl.widget import Widget
+
+
+def _root() -> Widget:
+    root = Widget()
+    root.styles = [Style(width=Size.flexible(), height=Size.flexible())]
+    return root
+
+
+def deep(count: int, depth: int = 64) -> Widget:
+    '''Chains of nested widgets, each chain at most depth widgets long.'''
+    root = _root()
+    style = Style(padding=Sides(1), border_thickness=1, background_color=Color(0.2))
+
+    for start in range(0, count, depth):
+        parent = root
+        for _ in range(min(depth, count - start)):
+            parent = Widget(parent=parent)
+            parent.styles = [style]
+
+    return root
+
+
+def wide(count: int) -> Widget:
+    '''One scroll box with a long flat list of items.'''
+    root = _root()
+    box = Widget(parent=root)
+    box.styles = [Style(display=Display.SCROLL, width=Size.absolute(400), height=Size.flexible(), padding=Sides(4))]
+    style = Style(width=Size.flexible(), height=Size.absolute(24), margin=Sides(1), background_color=Color(0.3))
+
+    for _ in range(count):
+        item = Widget(parent=box)
+        item.styles = [style]
+
+    return root
+
+
+def styled(count: int, styles: int = 8) -> Widget:
+    '''Flat list where every widget has many styles with criteria.'''
+    root = _root()
+    box = Widget(parent=root)
+    box.styles = [Style(display=Display.SCROLL, width=Size.flexible(), height=Size.flexible())]
+
+    base = Style(width=Size.absolute(200), height=Size.absolute(24), margin=Sides(2), border_thickness=1)
+    extra = [
+        Style(
+            criteria=lambda widget, context, index=index: (index % 2 == 0) or widget.hover,
+            background_color=Color(index / styles),
+            border_radius=Corners(index),
+        ) for index in range(styles)
+    ]
+
+    for _ in range(count):
+        item = Widget(parent=box)
+        item.styles = [base, *extra]
+
+    return root
+
+
+def sheet(count: int, classes: int = 8) -> Widget:
+    '''Flat list styled through a style sheet with class and state selectors.'''
+    root = _root()
+    root.style_sheet = StyleSheet({
+        '.item': Style(width=Size.absolute(200), height=Size.absolute(24), margin=Sides(2), border_thickness=1),
+        '.item:hover': Style(background_color=Color(0.4)),
+        '.item:active': Style(background_color=Color(0.5)),
+    })
+
+    for index in range(classes):
+        root.style_sheet.add(f'.item.variant{index}', Style(border_radius=Corners(index)))
+        root.style_sheet.add(f'.item.variant{index}:hover', Style(background_color=Color(index / classes)))
+
+    box = Widget(parent=root)
+    box.styles = [Style(display=Display.SCROLL, width=Size.flexible(), height=Size.flexible())]
+
+    for index in range(count):
+        item = Widget(parent=box)
+        item.classes = ('item', f'variant{index % classes}')
+
+    return root
+
+
+def text(count: int) -> Widget:
+    '''Rows of labels in horizontal containers.'''
+    root = _root()
+    font = Font(None)
+    row_style = Style(direction=Direction.HORIZONTAL, width=Size.flexible(), height=Size.absolute(20))
+    label_style = Style(width=Size.flexible(), height=Size.flexible(), align_y=Align.CENTER, font=font, font_size=12)
+
+    for start in range(0, count, 4):
+        row = Widget(parent=root)
+        row.styles = [row_style]
+
+        for index in range(start, min(start + 4, count)):
+            label = Widget(parent=row)
+            label.styles = [label_style]
+            label.text = f'Label number {index}'
+
+    return root
+
+
+def textured(count: int) -> Widget:
+    '''Grid of thumbnails, each with its own texture.'''
+    root = _root()
+    row_style = Style(direction=Direction.HORIZONTAL, width=Size.children(), height=Size.children())
+    thumb_style = Style(width=Size.texture(), height=Size.texture(), margin=Sides(2), border_radius=Corners(4))
+
+    for start in range(0, count, 16):
+        row = Widget(parent=root)
+        row.styles = [row_style]
+
+        for index in range(start, min(start + 16, count)):
+            thumb = Widget(parent=row)
+            thumb.styles = [thumb_style]
+            thumb.texture = Texture(Image(f'thumb{index}', 64, 64))
+
+    return root
+
+
+def gallery(count: int) -> Widget:
+    '''Grid view of thumbnails, only the cells in view exist.'''
+    root = _root()
+    textures = [Texture(Image(f'thumb{index}', 64, 64)) for index in range(16)]
+
+    class Gallery(GridView):
+
+        def create_cell(self) -> Widget:
+            cell = Widget()
+            cell.styles = [Style(width=Size.texture(), height=Size.texture(), margin=Sides(2), border_radius=Corners(4))]
+            cell.texture = textures[0]
+            return cell
+
+        def update_cell(self, cell: Widget, index: int):
+            cell.texture = textures[index % len(textures)]
+
+    grid = Gallery(parent=root, count=count)
+    grid.styles = [
+        Style(
+            display=Display.GRID,
+            width=Size.flexible(),
+            height=Size.flexible(),
+            cell_width=Size.flexible(),
+            cell_height=Size.absolute(68),
+        ),
+    ]
+
+    return root
+
+
+TREES: Dict[str, Callable[[int], Widget]] = {
+    'deep': deep,
+    'wide': wide,
+    'styled': styled,
+    'sheet': sheet,
+    'text': text,
+    'textured': textured,
+    'gallery': gallery,
+}
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+from enum import Enum, auto
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Set, Tuple, Union
+
+from .backends import get_backend
+from .dirty import restyle
+
+if TYPE_CHECKING:
+    from .style import ComputedStyle
+    from .widget import Widget
+
+
+class Easing(Enum):
+    '''How a transition progresses over time.'''
+    LINEAR = auto()
+    EASE_IN = auto()
+    EASE_OUT = auto()
+    EASE_IN_OUT = auto()
+
+
+def ease(easing: Easing, factor: float) -> float:
+    '''Apply easing to a factor between 0 and 1.'''
+    if easing is Easing.EASE_IN:
+        return factor * factor * factor
+    elif easing is Easing.EASE_OUT:
+        return 1 - (1 - factor)**3
+    elif easing is Easing.EASE_IN_OUT:
+        return 4 * factor**3 if factor < 0.5 else 1 - (-2 * factor + 2)**3 / 2
+    return factor
+
+
+# Style properties that can be animated.
+ANIMATABLE: Tuple[str, ...] = (
+    'offset_x',
+    'offset_y',
+    'width',
+    'height',
+    'margin',
+    'padding',
+    'foreground_color',
+    'background_color',
+    'border_color',
+    'border_radius',
+    'border_thickness',
+)
+
+
+class Transition:
+    '''How style properties animate when they change, used as a style property.'''
+    __slots__ = ('duration', 'easing', 'properties')
+
+    def __init__(self, duration: float, easing: Easing = Easing.EASE_OUT, properties: Tuple[str, ...] = None):
+        object.__setattr__(self, 'duration', duration)
+        object.__setattr__(self, 'easing', easing)
+
+        # None means all animatable properties.
+        object.__setattr__(self, 'properties', ANIMATABLE if (properties is None) else tuple(properties))
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError('Transition is immutable, create a new one instead')
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Transition):
+            return NotImplemented
+        return (self.duration, self.easing, self.properties) == (other.duration, other.easing, other.properties)
+
+    def __hash__(self) -> int:
+        return hash((self.duration, self.easing, self.properties))
+
+    def __reduce__(self):
+        return Transition, (self.duration, self.easing, self.properties)
+
+
+class _Track:
+    '''Animation of one property.'''
+    __slots__ = ('start', 'end', 'time', 'duration', 'easing')
+
+    def __init__(self, start: Any, end: Any, time: float, transition: Transition):
+        self.start = start
+        self.end = end
+        self.time = time
+        self.duration = transition.duration
+        self.easing = transition.easing
+
+
+class _WidgetAnimation:
+    '''Animated properties of a widget, and the style they animate towards.'''
+    __slots__ = ('target', 'tracks')
+
+    def __init__(self, target: ComputedStyle):
+        self.target = target
+        self.tracks: Dict[str, _Track] = {}
+
+
+class _Animations:
+    '''Stored animation state.'''
+    widgets: Set[Widget] = set()
+    animators: Set[Callable[[float], bool]] = set()
+    callbacks: List[Callable[[], None]] = []
+    running: bool = False
+    interval: float = 1 / 60
+
+
+def is_animating() -> bool:
+    '''Whether any transition or animator is running.'''
+    return bool(_Animations.widgets or _Animations.animators)
+
+
+def animate(function: Callable[[float], bool]):
+    '''Call a function with the current time every animation step, until it returns False.'''
+    _Animations.animators.add(function)
+    _start()
+
+
+def add_frame_callback(callback: Callable[[], None]):
+    '''Call a function after every animation step, for example to request a redraw.'''
+    _Animations.callbacks.append(callback)
+
+
+def remove_frame_callback(callback: Callable[[], None]):
+    '''Stop calling a function after animation steps.'''
+    if callback in _Animations.callbacks:
+        _Animations.callbacks.remove(callback)
+
+
+def transition_style(widget: Widget, target: ComputedStyle) -> ComputedStyle:
+    '''Start or update transitions towards a newly computed style, return the style to use now.'''
+    animation: Union[_WidgetAnimation, None] = widget._animation
+    shown = widget._style
+
+    if animation is None:
+        animation = _WidgetAnimation(shown)
+
+    changed = target is not animation.target
+
+    if changed:
+        now = get_backend().time()
+        transition: Union[Transition, None] = target.transition
+        properties = transition.properties if (transition is not None) else ()
+
+        for name in ANIMATABLE:
+            end = getattr(target, name)
+            track = animation.tracks.get(name)
+            previous = track.end if (track is not None) else getattr(animation.target, name)
+
+            if end == previous:
+                continue
+
+            start = getattr(shown, name)
+
+            if (name in properties) and (transition.duration > 0) and _interpolable(start, end):
+                animation.tracks[name] = _Track(start, end, now, transition)
+            elif track is not None:
+                del animation.tracks[name]
+
+        animation.target = target
+
+    if not animation.tracks:
+        widget._animation = None
+        _Animations.widgets.discard(widget)
+        return target
+
+    if widget._animation is None:
+        widget._animation = animation
+        _Animations.widgets.add(widget)
+        _start()
+
+    # Between steps, keep showing the values from the last step.
+    return _animated(animation, get_backend().time()) if changed else shown
+
+
+def stop_animation(widget: Widget):
+    '''Stop the transitions of a widget, it shows the style they were going to.'''
+    animation: Union[_WidgetAnimation, None] = widget._animation
+
+    if animation is not None:
+        widget._style = animation.target
+        widget._animation = None
+        _Animations.widgets.discard(widget)
+
+
+def step(now: float = None):
+    '''Interpolate all running transitions and run animators in one pass.'''
+    if now is None:
+        now = get_backend().time()
+
+    for widget in tuple(_Animations.widgets):
+        animation: _WidgetAnimation = widget._animation
+        previous = widget._style
+        widget._style = _animated(animation, now)
+        restyle(widget, previous, widget._style)
+
+        if not animation.tracks:
+            widget._animation = None
+            _Animations.widgets.discard(widget)
+
+    for function in tuple(_Animations.animators):
+        if not function(now):
+            _Animations.animators.discard(function)
+
+
+def _animated(animation: _WidgetAnimation, now: float) -> ComputedStyle:
+    '''Create a style with current values of animated properties, drop finished tracks.'''
+    values = {}
+
+    for name, track in tuple(animation.tracks.items()):
+        factor = (now - track.time) / track.duration
+
+        if factor >= 1:
+            del animation.tracks[name]
+        else:
+            values[name] = _interpolate(track.start, track.end, ease(track.easing, max(factor, 0)))
+
+    if not values:
+        return animation.target
+
+    # Instance values shadow the lazily resolved ones, the rest still comes from the layers.
+    style = type(animation.target)(animation.target.layers)
+    style.__dict__.update(values)
+    return style
+
+
+def _start():
+    if not _Animations.running:
+        _Animations.running = True
+        get_backend().register_timer(_tick, first_interval=_Animations.interval)
+
+
+def _tick() -> Union[float, None]:
+    step()
+
+    for callback in tuple(_Animations.callbacks):
+        callback()
+
+    # Stop the timer when idle, so nothing runs or redraws until the next animation.
+    if not is_animating():
+        _Animations.running = False
+        return None
+
+    return _Animations.interval
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _interpolable(start: Any, end: Any) -> bool:
+    '''Numbers can be interpolated, and style values whose non numeric fields match.'''
+    if _is_number(start) and _is_number(end):
+        return True
+
+    if (type(start) is not type(end)) or not hasattr(start, '_fields'):
+        return False
+
+    for name in start._fields:
+        a, b = getattr(start, name), getattr(end, name)
+        if not (a == b or (_is_number(a) and _is_number(b))):
+            return False
+
+    return True
+
+
+def _interpolate(start: Any, end: Any, factor: float) -> Any:
+    if _is_number(start):
+        return start + (end - start) * factor
+
+    values = []
+
+    for name in start._fields:
+        a, b = getattr(start, name), getattr(end, name)
+        values.append(a + (b - a) * factor if _is_number(a) and _is_number(b) else b)
+
+    return type(start)._intern(tuple(values))
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Tuple, Union
+
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+    from ..content import Texture
+    from ..style import Color, Corners
+
+
+class Backend:
+    '''Interface to the application that provides text metrics, area size, textures and drawing.'''
+
+    def area_size(self, context: Context) -> Tuple[float, float]:
+        '''Get the width and height of the area widgets are computed and rendered in.'''
+        raise NotImplementedError
+
+    def load_font(self, path: Path) -> int:
+        '''Load a font file, return its ID.'''
+        raise NotImplementedError
+
+    def unload_font(self, path: Path, id: int):
+        '''Unload a font which was loaded from the given path.'''
+        raise NotImplementedError
+
+    def text_dimensions(self, font_id: int, font_size: int, text: str) -> Tuple[float, float]:
+        '''Get the width and height of the given text.'''
+        raise NotImplementedError
+
+    def load_image(self, path: Path) -> Any:
+        '''Load an image file, return the image data.'''
+        raise NotImplementedError
+
+    def new_image(self, name: str, buffer: bytes, width: int, height: int) -> Any:
+        '''Create image data from an encoded buffer.'''
+        raise NotImplementedError
+
+    def new_image_from_pixels(self, name: str, pixels: memoryview, width: int, height: int) -> Any:
+        '''Create image data from RGBA float pixels, a flat view with the bottom row first.'''
+        raise NotImplementedError
+
+    def update_image(self, image: Any, pixels: memoryview, x: int, y: int, width: int, height: int):
+        '''Replace the pixels of a rectangle in image data, with pixels like in new_image_from_pixels.'''
+        raise NotImplementedError
+
+    def remove_image(self, image: Any):
+        '''Free image data.'''
+        raise NotImplementedError
+
+    def image_size(self, image: Any) -> Tuple[int, int]:
+        '''Get the width and height of image data.'''
+        raise NotImplementedError
+
+    def time(self) -> float:
+        '''Get a monotonic time in seconds, used for animation.'''
+        raise NotImplementedError
+
+    def register_timer(self, function: Callable[[], Union[float, None]], first_interval: float = 0):
+        '''Call a function after an interval, again after the interval it returns, until it returns None.'''
+        raise NotImplementedError
+
+    def get_clipboard(self, context: Context) -> str:
+        '''Get the text on the system clipboard.'''
+        raise NotImplementedError
+
+    def set_clipboard(self, context: Context, text: str):
+        '''Put text on the system clipboard.'''
+        raise NotImplementedError
+
+    def compile_shaders(self, recompile: bool = False):
+        '''Prepare whatever is needed for drawing.'''
+        pass
+
+    def set_scissor(self, x: int, y: int, width: int, height: int):
+        '''Clip drawing to the given area, in framebuffer coordinates.'''
+        raise NotImplementedError
+
+    def clear_scissor(self):
+        '''Stop clipping drawing.'''
+        raise NotImplementedError
+
+    def draw_rect(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        color: Color,
+        border_color: Color,
+        border_radius: Corners,
+        border_thickness: float,
+        texture: Union[Texture, None] = None,
+    ):
+        '''Draw a rounded rectangle with border, in framebuffer coordinates.'''
+        raise NotImplementedError
+
+    def draw_text(self, font_id: int, font_size: int, color: Color, x: float, y: float, text: str):
+        '''Draw text with its baseline at the given position, in framebuffer coordinates.'''
+        raise NotImplementedError
+
+    def new_lines(self, points: Any) -> Any:
+        '''Upload a line strip from an array of points with shape (N, 2), return lines that can be drawn many times.'''
+        raise NotImplementedError
+
+    def draw_lines(self, lines: Any, x: float, y: float, color: Color, thickness: float):
+        '''Draw uploaded lines with their origin at the given position, in framebuffer coordinates.'''
+        raise NotImplementedError
+
+
+def copy_pixels(target: memoryview, target_width: int, pixels: memoryview, x: int, y: int, width: int, height: int):
+    '''Copy RGBA pixels of a rectangle into a larger image, both flat views, one slice per row.'''
+    stride = width * 4
+
+    for row in range(height):
+        start = ((y + row) * target_width + x) * 4
+        target[start:start + stride] = pixels[row * stride:(row + 1) * stride]
+
+
+class _Backends:
+    '''Stored backend.'''
+    current: Backend = None
+
+
+def get_backend() -> Backend:
+    '''Get the current backend, use Blender if none was set.'''
+    if _Backends.current is None:
+        from .blender import BlenderBackend
+        _Backends.current = BlenderBackend()
+
+    return _Backends.current
+
+
+def set_backend(backend: Union[Backend, None]):
+    '''Set the backend used for text metrics, area size, textures and drawing.'''
+    _Backends.current = backend
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import time
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Tuple, Union
+
+import bgl
+import blf
+import bpy
+import gpu
+from bpy.types import Context, Image
+from gpu.types import GPUBatch, GPUShader
+from gpu_extras.batch import batch_for_shader
+
+from . import Backend, copy_pixels
+
+if TYPE_CHECKING:
+    from ..content import Texture
+    from ..style import Color, Corners
+
+
+class _Shaders:
+    '''Stored shaders.'''
+    standard: GPUShader = None
+    textured: GPUShader = None
+    lines: GPUShader = None
+
+
+class BlenderBackend(Backend):
+    '''Backend which uses blf, bgl and gpu to draw inside Blender.'''
+
+    def area_size(self, context: Context) -> Tuple[float, float]:
+        return context.area.width, context.area.height
+
+    def load_font(self, path: Path) -> int:
+        return blf.load(str(path))
+
+    def unload_font(self, path: Path, id: int):
+        blf.unload(str(path))
+
+    def text_dimensions(self, font_id: int, font_size: int, text: str) -> Tuple[float, float]:
+        blf.size(font_id, font_size, 72)
+        return blf.dimensions(font_id, text)
+
+    def load_image(self, path: Path) -> Image:
+        data = bpy.data.images.load(str(path), check_existing=True)
+        data.colorspace_settings.name = 'Raw'
+        data.name = f'.bwl.{data.name}'
+        return data
+
+    def new_image(self, name: str, buffer: bytes, width: int, height: int) -> Image:
+        data = bpy.data.images.new(name, width, height, is_data=True)
+        data.pack(buffer, len(buffer))
+        data.name = f'.bwl.{data.name}'
+        return data
+
+    def new_image_from_pixels(self, name: str, pixels: memoryview, width: int, height: int) -> Image:
+        data = bpy.data.images.new(name, width, height, alpha=True, float_buffer=True, is_data=True)
+        data.name = f'.bwl.{data.name}'
+
+        # Buffers are set in bulk, without converting them to a list.
+        data.pixels.foreach_set(pixels)
+        data.update()
+        return data
+
+    def update_image(self, image: Image, pixels: memoryview, x: int, y: int, width: int, height: int):
+        image_width, image_height = image.size
+
+        if (width, height) == (image_width, image_height):
+            image.pixels.foreach_set(pixels)
+        else:
+            # Images can only be set whole, the rectangle is copied into the current pixels.
+            buffer = array('f', bytes(image_width * image_height * 16))
+            image.pixels.foreach_get(buffer)
+            copy_pixels(memoryview(buffer), image_width, pixels, x, y, width, height)
+            image.pixels.foreach_set(buffer)
+
+        image.update()
+
+    def remove_image(self, image: Image):
+        bpy.data.images.remove(image)
+
+    def image_size(self, image: Image) -> Tuple[int, int]:
+        return image.size[0], image.size[1]
+
+    def time(self) -> float:
+        return time.perf_counter()
+
+    def register_timer(self, function: Callable[[], Union[float, None]], first_interval: float = 0):
+        bpy.app.timers.register(function, first_interval=first_interval)
+
+    def get_clipboard(self, context: Context) -> str:
+        return context.window_manager.clipboard
+
+    def set_clipboard(self, context: Context, text: str):
+        context.window_manager.clipboard = text
+
+    def compile_shaders(self, recompile: bool = False):
+        '''Compile the UI shaders.'''
+        folder = Path(__file__).parent.parent.joinpath('shaders')
+
+        if recompile or _Shaders.standard is None:
+            vertex_source = folder.joinpath('standard_vs.glsl').read_text()
+            fragment_source = folder.joinpath('standard_fs.glsl').read_text()
+            _Shaders.standard = GPUShader(vertex_source, fragment_source)
+
+        if recompile or _Shaders.textured is None:
+            vertex_source = folder.joinpath('textured_vs.glsl').read_text()
+            fragment_source = folder.joinpath('textured_fs.glsl').read_text()
+            _Shaders.textured = GPUShader(vertex_source, fragment_source)
+
+        if _Shaders.lines is None:
+            _Shaders.lines = gpu.shader.from_builtin('2D_UNIFORM_COLOR')
+
+    def set_scissor(self, x: int, y: int, width: int, height: int):
+        bgl.glScissor(x, y, width, height)
+        bgl.glEnable(bgl.GL_SCISSOR_TEST)
+
+    def clear_scissor(self):
+        bgl.glDisable(bgl.GL_SCISSOR_TEST)
+
+    def draw_rect(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        color: Color,
+        border_color: Color,
+        border_radius: Corners,
+        border_thickness: float,
+        texture: Union[Texture, None] = None,
+    ):
+        vertices = (
+            (x - border_thickness - 2, y - border_thickness - 2),
+            (x + width + border_thickness + 2, y - border_thickness - 2),
+            (x + width + border_thickness + 2, y + height + border_thickness + 2),
+            (x - border_thickness - 2, y + height + border_thickness + 2),
+        )
+
+        indices = (
+            (0, 1, 2),
+            (2, 3, 0),
+        )
+
+        bgl.glEnable(bgl.GL_BLEND)
+
+        if texture is None:
+            _render_standard(
+                x=x,
+                y=y,
+                width=width,
+                height=height,
+                color=color,
+                border_color=border_color,
+                border_radius=border_radius,
+                border_thickness=border_thickness,
+                vertices=vertices,
+                indices=indices,
+            )
+
+        else:
+            _render_texture(
+                texture=texture,
+                x=x,
+                y=y,
+                width=width,
+                height=height,
+                color=color,
+                border_color=border_color,
+                border_radius=border_radius,
+                border_thickness=border_thickness,
+                vertices=vertices,
+                indices=indices,
+            )
+
+        bgl.glDisable(bgl.GL_BLEND)
+
+    def draw_text(self, font_id: int, font_size: int, color: Color, x: float, y: float, text: str):
+        bgl.glEnable(bgl.GL_BLEND)
+
+        blf.color(font_id, *color)
+        blf.size(font_id, font_size, 72)
+        blf.position(font_id, x, y, 0)
+        blf.draw(font_id, text)
+
+        bgl.glDisable(bgl.GL_BLEND)
+
+    def new_lines(self, points: Any) -> GPUBatch:
+        if _Shaders.lines is None:
+            raise Exception('Shader must be compiled first.')
+
+        return batch_for_shader(_Shaders.lines, 'LINE_STRIP', {'pos': points})
+
+    def draw_lines(self, lines: GPUBatch, x: float, y: float, color: Color, thickness: float):
+        bgl.glEnable(bgl.GL_BLEND)
+        bgl.glEnable(bgl.GL_LINE_SMOOTH)
+        bgl.glLineWidth(thickness)
+
+        # The batch stays the same when only the widget moved.
+        with gpu.matrix.push_pop():
+            gpu.matrix.translate((x, y))
+            _Shaders.lines.bind()
+            _Shaders.lines.uniform_float('color', color)
+            lines.draw(_Shaders.lines)
+
+        bgl.glLineWidth(1)
+        bgl.glDisable(bgl.GL_LINE_SMOOTH)
+        bgl.glDisable(bgl.GL_BLEND)
+
+
+def _render_standard(
+    x: float,
+    y: float,
+    width: float,
+    height: float,
+    color: Color,
+    border_color: Color,
+    border_radius: Corners,
+    border_thickness: float,
+    vertices: tuple,
+    indices: tuple,
+):
+    if _Shaders.standard is None:
+        raise Exception('Shader must be compiled first.')
+
+    _Shaders.standard.bind()
+    _Shaders.standard.uniform_float('u_position', [x, y])
+    _Shaders.standard.uniform_float('u_size', [width, height])
+    _Shaders.standard.uniform_float('u_color', color)
+    _Shaders.standard.uniform_float('u_border_color', border_color)
+    _Shaders.standard.uniform_float('u_border_radius', border_radius)
+    _Shaders.standard.uniform_float('u_border_thickness', border_thickness)
+
+    batch: GPUBatch = batch_for_shader(_Shaders.standard, 'TRIS', {'position': vertices}, indices=indices)
+    batch.draw(_Shaders.standard)
+
+
+def _render_texture(
+    texture: Texture,
+    x: float,
+    y: float,
+    width: float,
+    height: float,
+    color: Color,
+    border_color: Color,
+    border_radius: Corners,
+    border_thickness: float,
+    vertices: tuple,
+    indices: tuple,
+):
+    if _Shaders.textured is None:
+        raise Exception('Shader must be compiled first.')
+
+    if texture.gl_load():
+        raise Exception('Failed to load texture.')
+
+    _Shaders.textured.bind()
+    _Shaders.textured.uniform_float('u_position', [x, y])
+    _Shaders.textured.uniform_float('u_size', [width, height])
+    _Shaders.textured.uniform_float('u_color', color)
+    _Shaders.textured.uniform_float('u_border_color', border_color)
+    _Shaders.textured.uniform_float('u_border_radius', border_radius)
+    _Shaders.textured.uniform_float('u_border_thickness', border_thickness)
+    _Shaders.textured.uniform_int('u_texture', 0)
+
+    bgl.glActiveTexture(bgl.GL_TEXTURE0)
+    bgl.glBindTexture(bgl.GL_TEXTURE_2D, texture.bindcode)
+    bgl.glTexParameteri(bgl.GL_TEXTURE_2D, bgl.GL_TEXTURE_MIN_FILTER, bgl.GL_LINEAR)
+    bgl.glTexParameteri(bgl.GL_TEXTURE_2D, bgl.GL_TEXTURE_MAG_FILTER, bgl.GL_LINEAR)
+    bgl.glTexParameteri(bgl.GL_TEXTURE_2D, bgl.GL_TEXTURE_WRAP_S, bgl.GL_CLAMP_TO_BORDER)
+    bgl.glTexParameteri(bgl.GL_TEXTURE_2D, bgl.GL_TEXTURE_WRAP_T, bgl.GL_CLAMP_TO_BORDER)
+
+    batch: GPUBatch = batch_for_shader(_Shaders.textured, 'TRIS', {'position': vertices}, indices=indices)
+    batch.draw(_Shaders.textured)
+
+    bgl.glBindTexture(bgl.GL_TEXTURE_2D, 0)
+
+    texture.gl_free()
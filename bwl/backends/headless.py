@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, List, Tuple, Union
+
+from . import Backend, copy_pixels
+
+if TYPE_CHECKING:
+    from ..content import Texture
+    from ..style import Color, Corners
+
+
+class Image:
+    '''Image data used by the headless backend, mirrors the parts of bpy.types.Image that BWL uses.'''
+
+    def __init__(self, name: str, width: int, height: int, pixels: Any = None):
+        self.name = name
+        self.size = (width, height)
+        self.pixels = pixels
+
+
+class Area:
+    '''Stand-in for bpy.types.Area.'''
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+
+
+class Context:
+    '''Stand-in for bpy.types.Context.'''
+
+    def __init__(self, width: int = 1920, height: int = 1080):
+        self.area = Area(width, height)
+
+
+class Event:
+    '''Stand-in for bpy.types.Event.'''
+
+    def __init__(
+        self,
+        type: str,
+        value: str = 'NOTHING',
+        mouse_region_x: int = 0,
+        mouse_region_y: int = 0,
+        ctrl: bool = False,
+        shift: bool = False,
+        alt: bool = False,
+        unicode: str = '',
+    ):
+        self.type = type
+        self.value = value
+        self.mouse_region_x = mouse_region_x
+        self.mouse_region_y = mouse_region_y
+        self.ctrl = ctrl
+        self.shift = shift
+        self.alt = alt
+        self.unicode = unicode
+
+
+class HeadlessBackend(Backend):
+    '''Pure Python backend which approximates text metrics and optionally records draw calls.'''
+
+    def __init__(self, width: int = 1920, height: int = 1080, record: bool = False):
+        self.width = width
+        self.height = height
+
+        # Draw calls as tuples of method name and arguments, only filled when recording.
+        self.record = record
+        self.commands: List[Tuple[str, tuple]] = []
+
+        self._fonts: List[Path] = []
+
+        # Time only moves when advanced, so animation is deterministic.
+        self.clock = 0.0
+        self._timers: List[Tuple[float, Callable[[], Union[float, None]]]] = []
+
+        # Clipboard of this process only.
+        self.clipboard = ''
+
+    def area_size(self, context: Context) -> Tuple[float, float]:
+        if context is not None:
+            return context.area.width, context.area.height
+        return self.width, self.height
+
+    def load_font(self, path: Path) -> int:
+        self._fonts.append(path)
+        return len(self._fonts)
+
+    def unload_font(self, path: Path, id: int):
+        pass
+
+    def text_dimensions(self, font_id: int, font_size: int, text: str) -> Tuple[float, float]:
+        # Monospaced approximation, roughly the proportions of a sans-serif font.
+        return len(text) * font_size * 0.5, font_size * 0.7 if text else 0
+
+    def load_image(self, path: Path) -> Image:
+        width, height = _read_png_size(path)
+        return Image(f'.bwl.{Path(path).name}', width, height)
+
+    def new_image(self, name: str, buffer: bytes, width: int, height: int) -> Image:
+        return Image(f'.bwl.{name}', width, height)
+
+    def new_image_from_pixels(self, name: str, pixels: memoryview, width: int, height: int) -> Image:
+        # Copied like an upload, so changing the source afterwards doesn't change the image.
+        return Image(f'.bwl.{name}', width, height, memoryview(bytearray(pixels)).cast('f', (height, width, 4)))
+
+    def update_image(self, image: Image, pixels: memoryview, x: int, y: int, width: int, height: int):
+        copy_pixels(image.pixels.cast('B').cast('f'), image.size[0], pixels, x, y, width, height)
+
+    def remove_image(self, image: Image):
+        image.pixels = None
+
+    def image_size(self, image: Image) -> Tuple[int, int]:
+        return image.size
+
+    def time(self) -> float:
+        return self.clock
+
+    def register_timer(self, function: Callable[[], Union[float, None]], first_interval: float = 0):
+        self._timers.append((self.clock + first_interval, function))
+
+    def advance(self, seconds: float):
+        '''Move the clock forward, calling timers that are due in order.'''
+        end = self.clock + seconds
+
+        while self._timers:
+            self._timers.sort(key=lambda timer: timer[0])
+            due, function = self._timers[0]
+
+            if due > end:
+                break
+
+            self._timers.pop(0)
+            self.clock = max(self.clock, due)
+            interval = function()
+
+            if interval is not None:
+                self._timers.append((self.clock + interval, function))
+
+        self.clock = end
+
+    def get_clipboard(self, context: Context) -> str:
+        return self.clipboard
+
+    def set_clipboard(self, context: Context, text: str):
+        self.clipboard = text
+
+    def set_scissor(self, x: int, y: int, width: int, height: int):
+        if self.record:
+            self.commands.append(('set_scissor', (x, y, width, height)))
+
+    def clear_scissor(self):
+        if self.record:
+            self.commands.append(('clear_scissor', ()))
+
+    def draw_rect(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        color: Color,
+        border_color: Color,
+        border_radius: Corners,
+        border_thickness: float,
+        texture: Union[Texture, None] = None,
+    ):
+        if self.record:
+            self.commands.append((
+                'draw_rect',
+                (x, y, width, height, color, border_color, border_radius, border_thickness, texture),
+            ))
+
+    def draw_text(self, font_id: int, font_size: int, color: Color, x: float, y: float, text: str):
+        if self.record:
+            self.commands.append(('draw_text', (font_id, font_size, color, x, y, text)))
+
+    def new_lines(self, points: Any) -> Any:
+        if self.record:
+            self.commands.append(('new_lines', (len(points),)))
+        return points
+
+    def draw_lines(self, lines: Any, x: float, y: float, color: Color, thickness: float):
+        if self.record:
+            self.commands.append(('draw_lines', (lines, x, y, color, thickness)))
+
+
+def _read_png_size(path: Path) -> Tuple[int, int]:
+    '''Read the size from a PNG header without decoding the image.'''
+    with open(path, 'rb') as file:
+        header = file.read(24)
+
+    if header[:8] != b'\x89PNG\r\n\x1a\n':
+        raise Exception(f'Only PNG images can be loaded without Blender: {path}')
+
+    return struct.unpack('>II', header[16:24])
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import struct
+import zlib
+from math import ceil, floor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Tuple, Union
+
+import numpy as np
+
+from .headless import HeadlessBackend
+
+if TYPE_CHECKING:
+    from ..content import Texture
+    from ..style import Color, Corners
+
+
+class RasterBackend(HeadlessBackend):
+    '''Headless backend which rasterizes draw calls on the CPU with the same math as the shaders.
+
+    The framebuffer is a float RGBA array with the first row at the bottom, like OpenGL.
+    Text has no glyphs here, it's drawn as a solid box the size of its measured dimensions.
+    Images with pixels set to a float RGBA array are sampled, other images sample as white.
+    '''
+
+    def __init__(self, width: int = 1920, height: int = 1080, record: bool = False):
+        super().__init__(width=width, height=height, record=record)
+        self.pixels = np.zeros((height, width, 4), dtype=np.float32)
+        self._scissor: Union[Tuple[int, int, int, int], None] = None
+
+        # Counters for measuring frame cost.
+        self.draw_calls = 0
+        self.fragments = 0
+
+    def clear(self, color: Tuple[float, float, float, float] = (0, 0, 0, 0)):
+        '''Clear the framebuffer and reset counters, call this before rendering a frame.'''
+        self.pixels[:] = color
+        self.draw_calls = 0
+        self.fragments = 0
+
+    def set_scissor(self, x: int, y: int, width: int, height: int):
+        super().set_scissor(x, y, width, height)
+        self._scissor = (x, y, width, height)
+
+    def clear_scissor(self):
+        super().clear_scissor()
+        self._scissor = None
+
+    def draw_rect(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        color: Color,
+        border_color: Color,
+        border_radius: Corners,
+        border_thickness: float,
+        texture: Union[Texture, None] = None,
+    ):
+        super().draw_rect(x, y, width, height, color, border_color, border_radius, border_thickness, texture)
+
+        # Same quad as the vertices used on the GPU.
+        region = self._region(
+            x - border_thickness - 2,
+            y - border_thickness - 2,
+            x + width + border_thickness + 2,
+            y + height + border_thickness + 2,
+        )
+
+        if region is None:
+            return
+
+        frag_x, frag_y, rows, columns = region
+        position_x = frag_x - x - width / 2
+        position_y = frag_y - y - height / 2
+        half_width = width / 2 + border_thickness
+        half_height = height / 2 + border_thickness
+
+        top_left, bottom_left, top_right, bottom_right = border_radius
+        radius_left = np.where(position_y > 0, top_left, bottom_left)
+        radius_right = np.where(position_y > 0, top_right, bottom_right)
+        radius = np.where(position_x < 0, radius_left, radius_right)
+
+        dist_outside = _rect_sdf(position_x, position_y, half_width, half_height, radius)
+        outside_mask = _smoothstep(-1.0, 1.0, dist_outside * 1.5)
+
+        fill = np.asarray(tuple(color), dtype=np.float32)
+
+        if texture is None:
+            fill = np.broadcast_to(fill, position_x.shape + (4,))
+        else:
+            u = (frag_x - x) / width if width else np.zeros_like(frag_x)
+            v = (frag_y - y) / height if height else np.zeros_like(frag_y)
+            fill = fill * _sample(texture.data.pixels, u, v)
+
+        if border_thickness > 0:
+            inside_mask = _smoothstep(-1.0, 1.0, (dist_outside + border_thickness) * 1.5)[..., None]
+            border = np.asarray(tuple(border_color), dtype=np.float32)
+            fragment = fill * (1 - inside_mask) + border * inside_mask
+        else:
+            fragment = np.array(fill)
+
+        fragment[..., 3] *= 1 - outside_mask
+        self._blend(rows, columns, fragment)
+
+    def draw_text(self, font_id: int, font_size: int, color: Color, x: float, y: float, text: str):
+        super().draw_text(font_id, font_size, color, x, y, text)
+
+        width, height = self.text_dimensions(font_id, font_size, text)
+        region = self._region(x, y, x + width, y + height)
+
+        if region is None:
+            return
+
+        frag_x, _, rows, columns = region
+        fragment = np.broadcast_to(np.asarray(tuple(color), dtype=np.float32), frag_x.shape + (4,))
+        self._blend(rows, columns, fragment)
+
+    def draw_lines(self, lines: Any, x: float, y: float, color: Color, thickness: float):
+        super().draw_lines(lines, x, y, color, thickness)
+
+        # Lines are one pixel wide without smoothing here, sampled once per pixel along each segment.
+        points = np.asarray(lines, dtype=np.float64) + (x, y)
+        if len(points) < 2:
+            return
+
+        starts = points[:-1]
+        deltas = points[1:] - starts
+        steps = np.ceil(np.abs(deltas).max(axis=1)).astype(np.intp) + 1
+        segments = np.repeat(np.arange(len(starts)), steps)
+        first = np.repeat(np.cumsum(steps) - steps, steps)
+        t = (np.arange(len(segments)) - first) / np.maximum(steps - 1, 1)[segments]
+        samples = starts[segments] + deltas[segments] * t[:, None]
+
+        left, bottom, right, top = 0, 0, self.pixels.shape[1], self.pixels.shape[0]
+        if self._scissor is not None:
+            sx, sy, sw, sh = self._scissor
+            left, bottom, right, top = max(left, sx), max(bottom, sy), min(right, sx + sw), min(top, sy + sh)
+
+        columns = np.floor(samples[:, 0]).astype(np.intp)
+        rows = np.floor(samples[:, 1]).astype(np.intp)
+        mask = (columns >= left) & (columns < right) & (rows >= bottom) & (rows < top)
+
+        # Each pixel is blended once, even where segments overlap.
+        indices = np.unique(rows[mask] * self.pixels.shape[1] + columns[mask])
+        rows, columns = np.divmod(indices, self.pixels.shape[1])
+
+        self.draw_calls += 1
+        self.fragments += len(indices)
+
+        fragment = np.asarray(tuple(color), dtype=np.float32)
+        target = self.pixels[rows, columns]
+        alpha = fragment[3]
+        target[:, :3] = fragment[:3] * alpha + target[:, :3] * (1 - alpha)
+        target[:, 3] = alpha + target[:, 3] * (1 - alpha)
+        self.pixels[rows, columns] = target
+
+    def image(self) -> np.ndarray:
+        '''Get the framebuffer as 8 bit RGBA with the first row at the top.'''
+        return (np.clip(self.pixels[::-1], 0, 1) * 255 + 0.5).astype(np.uint8)
+
+    def write_png(self, path: Path):
+        '''Save the framebuffer as a PNG file, for golden images.'''
+        pixels = self.image()
+        height, width = pixels.shape[:2]
+        rows = np.concatenate((np.zeros((height, 1), dtype=np.uint8), pixels.reshape(height, width * 4)), axis=1)
+
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+        header = struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)
+        data = zlib.compress(rows.tobytes(), 6)
+        Path(path).write_bytes(b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', data) + chunk(b'IEND', b''))
+
+    def _region(self, x0: float, y0: float, x1: float, y1: float):
+        '''Get fragment coordinates and framebuffer slices for pixels covered by the given bounds.'''
+        left, bottom, right, top = floor(x0), floor(y0), ceil(x1), ceil(y1)
+
+        if self._scissor is not None:
+            sx, sy, sw, sh = self._scissor
+            left, bottom, right, top = max(left, sx), max(bottom, sy), min(right, sx + sw), min(top, sy + sh)
+
+        left, bottom = max(left, 0), max(bottom, 0)
+        right, top = min(right, self.pixels.shape[1]), min(top, self.pixels.shape[0])
+
+        if (left >= right) or (bottom >= top):
+            return None
+
+        # Fragment coordinates are at pixel centers, like gl_FragCoord.
+        frag_x, frag_y = np.meshgrid(
+            np.arange(left, right, dtype=np.float32) + 0.5,
+            np.arange(bottom, top, dtype=np.float32) + 0.5,
+        )
+
+        return frag_x, frag_y, slice(bottom, top), slice(left, right)
+
+    def _blend(self, rows: slice, columns: slice, fragment: np.ndarray):
+        '''Alpha blend fragments over the framebuffer.'''
+        self.draw_calls += 1
+        self.fragments += fragment.shape[0] * fragment.shape[1]
+
+        target = self.pixels[rows, columns]
+        alpha = fragment[..., 3:4]
+        target[..., :3] = fragment[..., :3] * alpha + target[..., :3] * (1 - alpha)
+        target[..., 3:4] = alpha + target[..., 3:4] * (1 - alpha)
+
+
+def _rect_sdf(px: np.ndarray, py: np.ndarray, sx: float, sy: float, r: np.ndarray) -> np.ndarray:
+    dx = np.abs(px) - sx + r
+    dy = np.abs(py) - sy + r
+    return np.minimum(np.maximum(dx, dy), 0.0) + np.hypot(np.maximum(dx, 0.0), np.maximum(dy, 0.0)) - r
+
+
+def _smoothstep(edge0: float, edge1: float, x: np.ndarray) -> np.ndarray:
+    t = np.clip((x - edge0) / (edge1 - edge0), 0.0, 1.0)
+    return t * t * (3.0 - 2.0 * t)
+
+
+def _sample(pixels: Union[np.ndarray, None], u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    '''Bilinear texture lookup with a transparent border, like GL_LINEAR with GL_CLAMP_TO_BORDER.'''
+    if pixels is None:
+        return np.ones(u.shape + (4,), dtype=np.float32)
+
+    height, width = pixels.shape[:2]
+    padded = np.zeros((height + 2, width + 2, 4), dtype=np.float32)
+    padded[1:-1, 1:-1] = pixels
+
+    # Texel centers are at half coordinates, shifted by one for the border.
+    tx = np.clip(u * width + 0.5, 0, width + 1)
+    ty = np.clip(v * height + 0.5, 0, height + 1)
+    x0 = np.minimum(np.floor(tx).astype(np.intp), width)
+    y0 = np.minimum(np.floor(ty).astype(np.intp), height)
+    fx = (tx - x0)[..., None]
+    fy = (ty - y0)[..., None]
+
+    top = padded[y0, x0] * (1 - fx) + padded[y0, x0 + 1] * fx
+    bottom = padded[y0 + 1, x0] * (1 - fx) + padded[y0 + 1, x0 + 1] * fx
+    return top * (1 - fy) + bottom * fy
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import weakref
+from typing import Any, Callable, Dict, List, Union
+
+from .widget import Widget
+
+
+class Observable:
+    '''Value which tells its subscribers when it changes.'''
+    __slots__ = ('_value', '_subscribers')
+
+    def __init__(self, value: Any = None):
+        self._value = value
+        self._subscribers: List[Callable[[], None]] = []
+
+    @property
+    def value(self) -> Any:
+        '''The current value, setting a different one notifies the subscribers.'''
+        return self._value
+
+    @value.setter
+    def value(self, value: Any):
+        if value != self._value:
+            self._value = value
+
+            for callback in self._subscribers[:]:
+                callback()
+
+    def subscribe(self, callback: Callable[[], None]):
+        '''Call a function whenever the value changes.'''
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[], None]):
+        '''Stop calling a function when the value changes.'''
+        self._subscribers.remove(callback)
+
+
+class Binding:
+    '''Attribute of a widget kept equal to a source, through an optional format function.'''
+    __slots__ = ('name', 'source', 'format', '_widget', '_bindings', '__weakref__')
+
+    def __init__(
+        self,
+        bindings: Bindings,
+        widget: Widget,
+        name: str,
+        source: Union[Observable, Callable[[], Any]],
+        format: Callable[[Any], Any] = None,
+    ):
+        self.name = name
+        self.source = source
+        self.format = format
+
+        # Bindings don't keep widgets alive, they're dropped with their widget.
+        self._widget = weakref.ref(widget, self._collected)
+        self._bindings = bindings
+
+    @property
+    def widget(self) -> Union[Widget, None]:
+        '''The bound widget, or none if it no longer exists.'''
+        return self._widget()
+
+    def _changed(self):
+        self._bindings._pending[self] = None
+
+    def _collected(self, reference: weakref.ref):
+        # This can run during an update, so the binding is only marked and unbound later.
+        self._bindings._collected.append(self)
+
+
+class Bindings:
+    '''Bindings of widget attributes like text, texture, styles and classes to sources, call update once per frame.
+
+    Observable sources mark their bindings when they change, only those are evaluated on update.
+    Getter sources can't tell when they change, so they're called on every update, once per getter
+    however many widgets use it. An attribute is only set when its value differs, so text that didn't change
+    isn't measured again, and changed text is measured without computing layout.
+    '''
+
+    def __init__(self):
+        self._polled: List[Binding] = []
+        self._observed: List[Binding] = []
+
+        # Bindings whose observable changed since the last update, a dict keeps them unique and in order.
+        self._pending: Dict[Binding, None] = {}
+
+        # Bindings whose widget was garbage collected, unbound on the next bind or update.
+        self._collected: List[Binding] = []
+
+    def __len__(self) -> int:
+        self._prune()
+        return len(self._polled) + len(self._observed)
+
+    def bind(
+        self,
+        widget: Widget,
+        name: str,
+        source: Union[Observable, Callable[[], Any]],
+        format: Callable[[Any], Any] = None,
+    ) -> Binding:
+        '''Keep an attribute of a widget equal to an observable or the result of a getter, applied on next update.'''
+        self._prune()
+        binding = Binding(self, widget, name, source, format)
+
+        if isinstance(source, Observable):
+            source.subscribe(binding._changed)
+            self._observed.append(binding)
+        else:
+            self._polled.append(binding)
+
+        self._pending[binding] = None
+        return binding
+
+    def unbind(self, binding: Binding):
+        '''Stop updating an attribute.'''
+        if isinstance(binding.source, Observable):
+            binding.source.unsubscribe(binding._changed)
+            self._observed.remove(binding)
+        else:
+            self._polled.remove(binding)
+
+        self._pending.pop(binding, None)
+
+    def update(self) -> int:
+        '''Evaluate changed and polled bindings and set the values that differ, return how many were set.'''
+        self._prune()
+        values: Dict[Callable[[], Any], Any] = {}
+        dead: List[Binding] = []
+        count = 0
+
+        pending = self._pending
+        self._pending = {}
+
+        for binding in self._polled:
+            if binding.source not in values:
+                values[binding.source] = binding.source()
+
+            value = values[binding.source]
+            count += self._apply(binding, value, dead)
+            pending.pop(binding, None)
+
+        for binding in pending:
+            count += self._apply(binding, binding.source.value, dead)
+
+        for binding in dead:
+            self.unbind(binding)
+
+        return count
+
+    def _prune(self):
+        '''Unbind bindings whose widget was collected, so observables don't keep them.'''
+        collected, self._collected = self._collected, []
+
+        for binding in collected:
+            if (binding in self._observed) or (binding in self._polled):
+                self.unbind(binding)
+
+    def _apply(self, binding: Binding, value: Any, dead: List[Binding]) -> bool:
+        widget = binding._widget()
+
+        if widget is None:
+            dead.append(binding)
+            return False
+
+        if binding.format is not None:
+            value = binding.format(value)
+
+        # Styles are stored as a list and classes as a set, compare like with like.
+        current = getattr(widget, binding.name)
+        if isinstance(current, list):
+            value = list(value)
+        elif isinstance(current, frozenset):
+            value = frozenset(value)
+
+        if current == value:
+            return False
+
+        setattr(widget, binding.name, value)
+        return True
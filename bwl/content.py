@@ -1,32 +1,49 @@
 from __future__ import annotations
 
+import sys
 from pathlib import Path
+from typing import Any
 
-import blf
-import bpy
+from .backends import get_backend
+
+# Buffer formats of native 32-bit floats.
+_FLOAT_FORMATS = ('f', '@f', '=f', '<f' if (sys.byteorder == 'little') else '>f')
 
 
 class Texture:
 
-    def __init__(self, data: bpy.types.Image):
+    def __init__(self, data: Any):
         self.data = data
 
     @classmethod
     def from_file(cls, path: Path) -> Texture:
-        data = bpy.data.images.load(str(path), check_existing=True)
-        data.colorspace_settings.name = 'Raw'
-        data.name = f'.bwl.{data.name}'
-        return cls(data)
+        return cls(get_backend().load_image(path))
 
     @classmethod
     def from_buffer(cls, name: str, buffer: bytes, width: int, height: int) -> Texture:
-        data = bpy.data.images.new(name, width, height, is_data=True)
-        data.pack(buffer, len(buffer))
-        data.name = f'.bwl.{data.name}'
-        return cls(data)
+        return cls(get_backend().new_image(name, buffer, width, height))
+
+    @classmethod
+    def from_pixels(cls, name: str, pixels: Any, width: int, height: int) -> Texture:
+        '''Create a texture from RGBA float pixels with the bottom row first, like a float32 NumPy array.
+
+        Any object with the buffer protocol of 32-bit floats works, like a memoryview or array, or bytes of them.
+        Pixels are uploaded in bulk, without copying them into a list.
+        '''
+        return cls(get_backend().new_image_from_pixels(name, _pixel_view(pixels, width, height), width, height))
+
+    def update(self, pixels: Any, x: int = 0, y: int = 0, width: int = None, height: int = None):
+        '''Replace the pixels of a rectangle, the whole texture by default, for textures that change like previews.'''
+        width = self.width if (width is None) else width
+        height = self.height if (height is None) else height
+
+        if (x < 0) or (y < 0) or (x + width > self.width) or (y + height > self.height):
+            raise Exception('Rectangle is outside of the texture')
+
+        get_backend().update_image(self.data, _pixel_view(pixels, width, height), x, y, width, height)
 
     def remove(self):
-        bpy.data.images.remove(self.data)
+        get_backend().remove_image(self.data)
 
     def gl_load(self) -> int:
         return self.data.gl_load()
@@ -36,11 +53,11 @@ class Texture:
 
     @property
     def width(self) -> int:
-        return self.data.size[0]
+        return get_backend().image_size(self.data)[0]
 
     @property
     def height(self) -> int:
-        return self.data.size[1]
+        return get_backend().image_size(self.data)[1]
 
     @property
     def bindcode(self) -> int:
@@ -51,9 +68,27 @@ class Font:
 
     def __init__(self, path: Path = None):
         self.path = path
-        self.id = blf.load(str(path)) if (self.path is not None) else 0
+        self.id = get_backend().load_font(path) if (self.path is not None) else 0
 
     def remove(self):
         if self.id > 0:
-            blf.unload(str(self.path))
+            get_backend().unload_font(self.path, self.id)
             self.id = 0
+
+
+def _pixel_view(pixels: Any, width: int, height: int) -> memoryview:
+    '''Flat view of 32-bit float pixels, which shares memory with the given buffer.'''
+    view = memoryview(pixels)
+
+    if not view.c_contiguous:
+        raise Exception('Pixels must be contiguous')
+
+    # Bytes are taken as the memory of floats, other buffers must say they hold native 32-bit floats.
+    if not isinstance(pixels, (bytes, bytearray)) and ((view.format not in _FLOAT_FORMATS) or (view.itemsize != 4)):
+        raise Exception(f'Pixels must be 32-bit floats, not format {view.format!r}, like a float32 NumPy array')
+
+    view = view.cast('B')
+    if len(view) != width * height * 16:
+        raise Exception(f'Pixels must be {width}x{height} RGBA 32-bit floats')
+
+    return view.cast('f')
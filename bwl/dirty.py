@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    from .widget import Widget
+
+# Style properties that change sizes, so layout must be computed again.
+LAYOUT_PROPERTIES: Tuple[str, ...] = (
+    'display',
+    'direction',
+    'align_x',
+    'align_y',
+    'width',
+    'height',
+    'cell_width',
+    'cell_height',
+    'margin',
+    'padding',
+    'border_thickness',
+    'font',
+    'font_size',
+)
+
+# Style properties that only move a widget or its children.
+POSITION_PROPERTIES: Tuple[str, ...] = (
+    'offset_x',
+    'offset_y',
+    'scroll',
+)
+
+
+# Style properties that only change how text is broken into lines.
+TEXT_PROPERTIES: Tuple[str, ...] = ('text_wrap',)
+
+
+def mark_dirty(widget: Widget):
+    '''Mark a widget and its ancestors for computing layout.'''
+    while widget is not None:
+        widget._layout.dirty = True
+        widget = widget._parent
+
+
+def mark_moved(widget: Widget):
+    '''Mark a widget for moving or measuring text, and its ancestors to find it.'''
+    while widget is not None:
+        widget._layout.moved = True
+        widget = widget._parent
+
+
+def mark_text(widget: Widget):
+    '''Mark a widget for measuring its text.'''
+    widget._layout.text_dirty = True
+    mark_moved(widget)
+
+
+def restyle(widget: Widget, previous, style):
+    '''Mark what needs to be done after the style of a widget changed.'''
+    for name in LAYOUT_PROPERTIES:
+        if getattr(previous, name) != getattr(style, name):
+            mark_dirty(widget)
+            return
+
+    for name in TEXT_PROPERTIES:
+        if getattr(previous, name) != getattr(style, name):
+            mark_text(widget)
+            break
+
+    for name in POSITION_PROPERTIES:
+        if getattr(previous, name) != getattr(style, name):
+            mark_moved(widget)
+            return
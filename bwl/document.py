@@ -0,0 +1,388 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Type, Union
+
+from .animation import Easing, Transition
+from .content import Font, Texture
+from .reconcile import Spec, build
+from .resources import get_resource_manager
+from .sheet import StyleSheet
+from .style import Align, Color, Corners, Direction, Display, Sides, Size, Style, TextWrap, Visibility
+from .widget import Widget
+
+if TYPE_CHECKING:
+    from enum import Enum
+
+# Changed whenever the compiled form changes, so older cache files are compiled again.
+VERSION = 1
+
+
+def _user_cache_folder() -> Path:
+    '''Cache folder of the current user, unlike the temporary folder other users can't write files into it.'''
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA')
+    elif sys.platform == 'darwin':
+        base = Path.home().joinpath('Library', 'Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME')
+
+    return Path(base or Path.home().joinpath('.cache')).joinpath('bwl')
+
+
+# Where compiled files are cached by default.
+CACHE_FOLDER = _user_cache_folder()
+
+# Style properties by how their values are written in a file.
+_ENUMS: Dict[str, Type[Enum]] = {
+    'display': Display,
+    'visibility': Visibility,
+    'direction': Direction,
+    'align_x': Align,
+    'align_y': Align,
+    'text_wrap': TextWrap,
+}
+_SIZES = ('width', 'height', 'cell_width', 'cell_height')
+_VALUES = {'margin': Sides, 'padding': Sides, 'border_radius': Corners}
+_COLORS = ('foreground_color', 'background_color', 'border_color')
+_NUMBERS = ('scroll', 'offset_x', 'offset_y', 'border_thickness', 'font_size')
+
+
+class _Documents:
+    '''Stored compiled files by hash, so opening a file again in the same session skips reading the cache.
+
+    Styles, sheet and specs are stored with the resources they use, documents that got the same resources share them.
+    They're kept while a document of the file isn't removed, so they don't keep its fonts and textures alive.
+    '''
+    compiled: Dict[str, tuple] = {}
+    decoded: Dict[str, tuple] = {}
+    users: Dict[str, int] = {}
+
+
+class Document:
+    '''UI loaded from a JSON or TOML file, with its resources, named styles, style sheet and widget tree.
+
+    A file has these sections, all optional except root:
+    fonts and textures map names to paths relative to the file,
+    styles maps names to style properties, sheet maps selectors to a style name or properties,
+    root is a widget with key, class, text, texture, styles, classes and children.
+    Styles of widgets are style names or properties, fonts and textures are used by name.
+    '''
+
+    def __init__(self, compiled: tuple, folder: Path, digest: str = None):
+        _, fonts, textures, styles, sheet, tree = compiled
+        self.digest = digest
+        self.folder = folder
+
+        # Resources are shared with other documents and code that load the same files.
+        resources = get_resource_manager()
+        self.fonts: Dict[str, Font] = {name: resources.font(folder.joinpath(path)) for name, path in fonts}
+        self.textures: Dict[str, Texture] = {name: resources.texture(folder.joinpath(path)) for name, path in textures}
+
+        self._tree = tree
+        self._counted = digest is not None
+        if self._counted:
+            _Documents.users[digest] = _Documents.users.get(digest, 0) + 1
+
+        used = (*self.fonts.values(), *self.textures.values())
+        decoded = _Documents.decoded.get(digest)
+
+        # Styles are shared by every tree built from this document, and by documents with the same resources.
+        if (decoded is not None) and (len(decoded[0]) == len(used)) and all(a is b for a, b in zip(decoded[0], used)):
+            _, self._styles, self.styles, self.sheet, self._specs = decoded
+            return
+
+        self._styles = [Style(**{field: self._decode(field, value) for field, value in props}) for _, props in styles]
+        self.styles: Dict[str, Style] = {name: style for (name, _), style in zip(styles, self._styles) if name}
+
+        self.sheet: Union[StyleSheet, None] = None
+        if sheet:
+            self.sheet = StyleSheet()
+            for selector, index in sheet:
+                self.sheet.add(selector, self._styles[index])
+
+        self._specs: Dict[Tuple[Tuple[str, type], ...], Spec] = {}
+
+        if digest is not None:
+            _Documents.decoded[digest] = (used, self._styles, self.styles, self.sheet, self._specs)
+
+    def build(self, classes: Dict[str, Type[Widget]] = None) -> Widget:
+        '''Create the widget tree, class names of widgets are looked up in classes.'''
+        root = build(self.spec(classes))
+
+        if self.sheet is not None:
+            root.style_sheet = self.sheet
+
+        return root
+
+    def spec(self, classes: Dict[str, Type[Widget]] = None) -> Spec:
+        '''Spec of the widget tree, to reconcile an existing tree with, made once per set of classes.'''
+        classes = {'Widget': Widget, **(classes or {})}
+        key = tuple(sorted(classes.items()))
+        spec = self._specs.get(key)
+
+        if spec is None:
+            spec = self._specs[key] = self._spec(self._tree, classes)
+
+        return spec
+
+    def remove(self):
+        '''Release the fonts and textures of this document, other documents keep theirs.
+
+        Resources nobody else uses are freed later by the resource manager, outside of drawing.
+        '''
+        resources = get_resource_manager()
+
+        for font in self.fonts.values():
+            resources.release(font)
+
+        for texture in self.textures.values():
+            resources.release(texture)
+
+        # Removing again does nothing.
+        self.fonts = {}
+        self.textures = {}
+
+        # The last document of a file lets go of the styles, which use its resources.
+        if self._counted:
+            self._counted = False
+            _Documents.users[self.digest] -= 1
+            if not _Documents.users[self.digest]:
+                del _Documents.users[self.digest]
+                _Documents.decoded.pop(self.digest, None)
+
+    def _spec(self, node: tuple, classes: Dict[str, Type[Widget]]) -> Spec:
+        key, cls, text, texture, styles, names, children = node
+
+        if cls not in classes:
+            raise Exception(f'Unknown widget class {cls}')
+
+        return Spec(
+            key=key,
+            cls=classes[cls],
+            text=text,
+            texture=self.textures[texture] if (texture is not None) else None,
+            styles=[self._styles[index] for index in styles],
+            classes=names,
+            children=[self._spec(child, classes) for child in children] if (children is not None) else None,
+        )
+
+    def _decode(self, field: str, value: Any) -> Any:
+        '''Style value from its compiled form.'''
+        if field in _ENUMS:
+            return _ENUMS[field][value]
+        elif field in _SIZES:
+            return Size(Size.Type[value[0]], value[1])
+        elif field in _VALUES:
+            return _VALUES[field](*value)
+        elif field in _COLORS:
+            return Color(*value)
+        elif field == 'font':
+            return self.fonts[value]
+        elif field == 'transition':
+            return Transition(value[0], Easing[value[1]], value[2])
+        return value
+
+
+def load_document(path: Path, cache_folder: Union[Path, None] = CACHE_FOLDER) -> Document:
+    '''Load a UI file, compiled once per file content and cached in the cache folder.
+
+    Every load gives a new document with its own use of the resources, remove it when it's no longer used.
+    '''
+    path = Path(path)
+    source = path.read_bytes()
+    digest = hashlib.sha256(source + bytes((VERSION,))).hexdigest()
+    compiled = _Documents.compiled.get(digest)
+
+    if compiled is not None:
+        return Document(compiled, path.parent, digest)
+
+    cache = cache_folder.joinpath(f'{digest}.bwlc') if (cache_folder is not None) else None
+
+    if (cache is not None) and cache.exists():
+        try:
+            compiled = marshal.loads(cache.read_bytes())
+        except (EOFError, ValueError, TypeError):
+            compiled = None
+
+    if not _is_compiled(compiled):
+        compiled = compile_document(_parse(path, source))
+
+        if cache is not None:
+            cache_folder.mkdir(mode=0o700, parents=True, exist_ok=True)
+            temporary = cache.with_suffix('.tmp')
+            temporary.write_bytes(marshal.dumps(compiled))
+            temporary.replace(cache)
+
+    _Documents.compiled[digest] = compiled
+    return Document(compiled, path.parent, digest)
+
+
+def compile_document(data: Dict[str, Any]) -> tuple:
+    '''Check a parsed UI file and convert it to nested tuples of plain values, which load fast.'''
+    if 'root' not in data:
+        raise Exception('UI file has no root widget')
+
+    fonts = tuple((name, str(path)) for name, path in data.get('fonts', {}).items())
+    textures = tuple((name, str(path)) for name, path in data.get('textures', {}).items())
+    known = {'fonts': {name for name, _ in fonts}, 'textures': {name for name, _ in textures}}
+
+    styles: List[Tuple[Union[str, None], tuple]] = []
+    names: Dict[str, int] = {}
+
+    for name, props in data.get('styles', {}).items():
+        names[name] = len(styles)
+        styles.append((name, _compile_style(props, known, name)))
+
+    def style_index(style: Union[str, Dict[str, Any]], where: str) -> int:
+        if isinstance(style, str):
+            if style not in names:
+                raise Exception(f'Unknown style {style} in {where}')
+            return names[style]
+
+        # Properties given in place are stored like an unnamed style.
+        styles.append((None, _compile_style(style, known, where)))
+        return len(styles) - 1
+
+    sheet = tuple((selector, style_index(style, selector)) for selector, style in data.get('sheet', {}).items())
+
+    def widget(node: Dict[str, Any], where: str) -> tuple:
+        texture = node.get('texture')
+        if (texture is not None) and (texture not in known['textures']):
+            raise Exception(f'Unknown texture {texture} in {where}')
+
+        key = node.get('key')
+        where = f'{where}/{key}' if (key is not None) else where
+
+        styles = node.get('styles', [])
+        if not isinstance(styles, list):
+            styles = [styles]
+
+        children = node.get('children')
+        if children is not None:
+            children = tuple(widget(child, f'{where}[{index}]') for index, child in enumerate(children))
+
+        return (
+            key,
+            node.get('class', 'Widget'),
+            node.get('text'),
+            texture,
+            tuple(style_index(style, where) for style in styles),
+            tuple(node.get('classes', ())),
+            children,
+        )
+
+    tree = widget(data['root'], 'root')
+    return VERSION, fonts, textures, tuple(styles), sheet, tree
+
+
+
+def _is_compiled(compiled: Any) -> bool:
+    '''Whether a value read from a cache file has the shape of a compiled file of this version.'''
+    def pairs(value: Any, second: type) -> bool:
+        return isinstance(value, tuple) and all(
+            isinstance(pair, tuple) and (len(pair) == 2) and isinstance(pair[0], str) and isinstance(pair[1], second)
+            for pair in value
+        )
+
+    def node(value: Any) -> bool:
+        if not (isinstance(value, tuple) and (len(value) == 7)):
+            return False
+
+        styles, names, children = value[4:]
+        return (
+            isinstance(value[1], str)
+            and isinstance(styles, tuple)
+            and all((type(index) is int) and (0 <= index < count) for index in styles)
+            and isinstance(names, tuple)
+            and ((children is None) or (isinstance(children, tuple) and all(map(node, children))))
+        )
+
+    if not (isinstance(compiled, tuple) and (len(compiled) == 6) and (compiled[0] == VERSION)):
+        return False
+
+    _, fonts, textures, styles, sheet, tree = compiled
+    if not (pairs(fonts, str) and pairs(textures, str) and isinstance(styles, tuple) and pairs(sheet, int)):
+        return False
+
+    count = len(styles)
+    return (
+        all(isinstance(style, tuple) and (len(style) == 2) and pairs(style[1], object) for style in styles)
+        and all(0 <= index < count for _, index in sheet)
+        and node(tree)
+    )
+
+def _parse(path: Path, source: bytes) -> Dict[str, Any]:
+    if path.suffix == '.toml':
+        try:
+            import tomllib
+        except ImportError:
+            raise Exception('Reading TOML needs Python 3.11 or newer')
+        return tomllib.loads(source.decode('utf-8'))
+
+    return json.loads(source)
+
+
+def _compile_style(props: Dict[str, Any], known: Dict[str, set], where: str) -> tuple:
+    '''Style properties as pairs of name and plain value.'''
+    result = []
+
+    for field, value in props.items():
+        if (field not in Style._fields) or (field == 'criteria'):
+            raise Exception(f'Unknown style property {field} in {where}')
+
+        try:
+            result.append((field, _compile_value(field, value, known)))
+        except (KeyError, TypeError, ValueError) as error:
+            raise Exception(f'Invalid value {value!r} for {field} in {where}') from error
+
+    return tuple(result)
+
+
+def _compile_value(field: str, value: Any, known: Dict[str, set]) -> Any:
+    '''Plain value written in a file to the plain value it's stored as.'''
+    if field in _ENUMS:
+        return _ENUMS[field][value.upper()].name
+
+    elif field in _SIZES:
+        # A number of pixels, a percentage, a keyword, or a mapping from kind to value.
+        if isinstance(value, (int, float)):
+            return 'ABSOLUTE', value
+        elif isinstance(value, str) and value.endswith('%'):
+            return 'RELATIVE', float(value[:-1]) / 100
+        elif isinstance(value, str):
+            kind = Size.Type[value.upper()]
+            return kind.name, 1 if (kind is Size.Type.FLEXIBLE) else None
+        elif isinstance(value, dict) and (len(value) == 1):
+            (kind, amount), = value.items()
+            return Size.Type[kind.upper()].name, amount
+        raise ValueError(value)
+
+    elif (field in _VALUES) or (field in _COLORS):
+        values = tuple(value) if isinstance(value, list) else (value,)
+        if not (1 <= len(values) <= 4) or not all(isinstance(item, (int, float)) for item in values):
+            raise ValueError(value)
+        return values
+
+    elif field == 'font':
+        if value not in known['fonts']:
+            raise KeyError(value)
+        return value
+
+    elif field == 'transition':
+        duration = value['duration'] if isinstance(value, dict) else value
+        easing = Easing[value.get('easing', 'ease_out').upper()].name if isinstance(value, dict) else 'EASE_OUT'
+        properties = tuple(value['properties']) if isinstance(value, dict) and ('properties' in value) else None
+        return float(duration), easing, properties
+
+    elif field in _NUMBERS:
+        if not isinstance(value, (int, float)):
+            raise TypeError(value)
+        return value
+
+    return value
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from bpy.types import Event
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bpy.types import Event
 
 
 def is_move(event: Event) -> bool:
@@ -155,4 +158,5 @@ class _EventTypes:
         'PAGE_UP',
         'PAGE_DOWN',
         'END',
+        'TEXTINPUT',
     }
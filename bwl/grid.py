@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Tuple, Union
+
+from .dirty import mark_dirty
+from .style import DEFAULT_STYLE, compute_style
+from .widget import Widget, _leave
+
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+    from .sheet import StyleSheet
+
+
+class GridView(Widget):
+    '''Grid which only has widgets for the cells in view, and reuses them for other cells while scrolling.
+
+    Give it a style with display grid, set count to the number of items,
+    override create_cell to make a widget for a cell and update_cell to show an item in it,
+    and release_cell to stop work for an item that left the view.
+    The children of a grid view are its cells in view, don't add children yourself.
+    '''
+    __slots__ = ('_count', '_cells', '_free')
+
+    def __init__(self, parent: Union[Widget, None] = None, count: int = 0):
+        super().__init__(parent)
+        self._count = count
+        self._cells: Dict[int, Widget] = {}
+        self._free: List[Widget] = []
+
+    @property
+    def count(self) -> int:
+        '''Number of items in the grid.'''
+        return self._count
+
+    @count.setter
+    def count(self, count: int):
+        if count != self._count:
+            self._count = count
+            mark_dirty(self)
+
+    @property
+    def cells(self) -> Tuple[Tuple[int, Widget], ...]:
+        '''Index and widget of the cells that exist, sorted by index.'''
+        return tuple(sorted(self._cells.items()))
+
+    def refresh(self):
+        '''Update the cells that exist, call this when the items changed.'''
+        for index, cell in self._cells.items():
+            if index < self._count:
+                self.update_cell(cell, index)
+
+    def create_cell(self) -> Widget:
+        '''Create a widget for a cell, it's reused for other items later.'''
+        return Widget()
+
+    def update_cell(self, cell: Widget, index: int):
+        '''Show the item at the given index in a cell.'''
+        pass
+
+    def release_cell(self, cell: Widget, index: int):
+        '''Called when a cell leaves the view, before it's reused, like to stop loading what it showed.'''
+        pass
+
+    def grid_count(self) -> int:
+        return self._count
+
+    def grid_cells(self, context: Context, start: int, stop: int) -> List[Tuple[int, Widget]]:
+        cells = self._cells
+        sheet = None
+
+        # Cells that left the view are free to show other items, without transitions from the items they showed.
+        for index in [index for index in cells if not (start <= index < stop)]:
+            cell = cells.pop(index)
+            self.release_cell(cell, index)
+            cell._parent = None
+            cell._hover = False
+            _leave(cell)
+            cell._style = DEFAULT_STYLE
+            self._free.append(cell)
+
+        for index in range(start, stop):
+            if index not in cells:
+                cell = self._free.pop() if self._free else self.create_cell()
+
+                # Style the cell before it has a parent, so its changes don't mark the whole tree.
+                self.update_cell(cell, index)
+                if sheet is None:
+                    sheet = _style_sheet(self)
+                compute_style(cell, context, sheet)
+
+                cell._parent = self
+                cells[index] = cell
+
+        result = [(index, cells[index]) for index in range(start, stop)]
+        self._children[:] = [cell for _, cell in result]
+        return result
+
+
+def _style_sheet(widget: Widget) -> Union[StyleSheet, None]:
+    '''The style sheet used for the children of this widget.'''
+    while widget is not None:
+        if widget.style_sheet is not None:
+            return widget.style_sheet
+        widget = widget._parent
+    return None
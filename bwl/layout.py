@@ -1,18 +1,22 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Union, overload
-
-import blf
-from bpy.types import Context, Event
+from math import ceil
+from typing import TYPE_CHECKING, List, Sequence, Tuple, Union, overload
 
+from .backends import get_backend
+from .packed import AREAS, Packed, packable
 from .style import Align, Direction, Display, Size
+from .text import Lines, fit_text
 
 if TYPE_CHECKING:
+    from bpy.types import Context, Event
+
     from .widget import Widget
 
 
 class Area:
     '''Area defined by position and size.'''
+    __slots__ = ('x', 'y', 'width', 'height')
 
     def __init__(self, x: float = 0, y: float = 0, width: float = 0, height: float = 0):
         self.x = x
@@ -50,8 +54,86 @@ class Area:
             return (self.x < x < self.x + self.width) and (self.y < y < self.y + self.height)
 
 
+class PackedArea(Area):
+    '''Area of a packed child, a view into the arrays of its parent.'''
+    __slots__ = ('_packed', '_area', '_index')
+
+    def __init__(self, packed: Packed, area: int, index: int):
+        self._packed = packed
+        self._area = area
+        self._index = index
+
+    @property
+    def x(self) -> float:
+        return self._packed.areas.item(self._area, 0, self._index)
+
+    @x.setter
+    def x(self, value: float):
+        self._packed.areas[self._area, 0, self._index] = value
+
+    @property
+    def y(self) -> float:
+        return self._packed.areas.item(self._area, 1, self._index)
+
+    @y.setter
+    def y(self, value: float):
+        self._packed.areas[self._area, 1, self._index] = value
+
+    @property
+    def width(self) -> float:
+        return self._packed.areas.item(self._area, 2, self._index)
+
+    @width.setter
+    def width(self, value: float):
+        self._packed.areas[self._area, 2, self._index] = value
+
+    @property
+    def height(self) -> float:
+        return self._packed.areas.item(self._area, 3, self._index)
+
+    @height.setter
+    def height(self, value: float):
+        self._packed.areas[self._area, 3, self._index] = value
+
+
+class Grid:
+    '''Cell arrangement of a grid widget, cells fill lines which stack along its direction.'''
+    __slots__ = ('count', 'per_line', 'cell_width', 'cell_height', 'scroll', 'visible')
+
+    def __init__(self):
+        self.count: int = 0
+        self.per_line: int = 1
+        self.cell_width: float = 0
+        self.cell_height: float = 0
+
+        # Scroll the cells were placed with, and the cells in view.
+        self.scroll: float = None
+        self.visible: List[Widget] = []
+
+
 class Layout:
     '''Position and size of a widget.'''
+    __slots__ = (
+        'text',
+        'content',
+        'inside',
+        'padding',
+        'border',
+        'margin',
+        'scissor',
+        'dirty',
+        'moved',
+        'text_dirty',
+        'given_width',
+        'given_height',
+        'offset_x',
+        'offset_y',
+        'scroll',
+        'area_size',
+        'packed',
+        'grid',
+        'lines',
+    )
 
     def __init__(self) -> None:
         self.text = Area()
@@ -64,10 +146,34 @@ class Layout:
         # None means don't use scissor.
         self.scissor: Union[Area, None] = None
 
+        # Whether this or a descendant needs layout, or only moving and text measuring.
+        self.dirty = True
+        self.moved = False
+        self.text_dirty = False
+
+        # Sizes the parent gave when this layout was computed, clean widgets given the same keep their layout.
+        self.given_width: Union[float, None] = None
+        self.given_height: Union[float, None] = None
+
+        # Style values this layout was computed with, to move by the difference.
+        self.offset_x: float = 0
+        self.offset_y: float = 0
+        self.scroll: float = 0
+        self.area_size: Tuple[float, float] = None
+
+        # Array layout of our children, when they can share one.
+        self.packed: Union[Packed, None] = None
+
+        # Cell arrangement, when display is grid.
+        self.grid: Union[Grid, None] = None
+
+        # Our text fitted to our width, cached for each width it had.
+        self.lines: Union[Lines, None] = None
+
     def under_mouse(self, context: Context, event: Event) -> bool:
         '''Check whether the cursor is inside this layout.'''
         mouse_x = event.mouse_region_x
-        mouse_y = context.area.height - event.mouse_region_y
+        mouse_y = get_backend().area_size(context)[1] - event.mouse_region_y
 
         if self.scissor is not None:
             if not self.scissor.contains(mouse_x, mouse_y):
@@ -79,32 +185,104 @@ class Layout:
         return True
 
 
+def scroll_offset(widget: Widget) -> float:
+    '''Offset from the scroller of a scroll widget, added to the scroll in its style.'''
+    return widget._scroller.offset if (widget._scroller is not None) else 0
+
+
 def compute_layout(widget: Widget, context: Context):
     '''Compute layout for the given widget and its children.'''
     # Don't bother calculating layout for widgets with display none.
     if widget._style.display is Display.NONE:
         return
 
+    area_size = get_backend().area_size(context)
+
+    # When only offsets, scroll or text changed, move and measure just those widgets.
+    if not widget._layout.dirty and (widget._layout.area_size == area_size):
+        if widget._layout.moved:
+            compute_moved(widget, context)
+        return
+
     # Calculate size first because it affects position.
+    # Subtrees that are clean and get the same size are skipped, or moved when their position changed.
     compute_width(widget, context)
     compute_height(widget, context)
     compute_x(widget, context)
     compute_y(widget, context)
 
-    compute_scissor(widget, context)
-
     compute_text_size(widget, context)
     compute_text_x(widget, context)
     compute_text_y(widget, context)
 
+    # Last because it marks the widgets it visits clean.
+    compute_scissor(widget, context)
+
+    widget._layout.area_size = area_size
+
+
+def compute_moved(widget: Widget, context: Context):
+    '''Move widgets whose offset or scroll changed and measure changed text, without computing sizes.'''
+    layout = widget._layout
+    style = widget._style
+    layout.moved = False
+
+    x = style.offset_x - layout.offset_x
+    y = style.offset_y - layout.offset_y
+
+    if x or y:
+        translate_layout(widget, x, y)
+        layout.offset_x = style.offset_x
+        layout.offset_y = style.offset_y
+
+    # Grids place the cells that scrolled into view, which may be different widgets.
+    if style.display is Display.GRID:
+        if layout.grid.scroll != style.scroll + scroll_offset(widget):
+            layout.scroll = style.scroll
+
+            for cell in compute_cells(widget, context):
+                compute_text_size(cell, context)
+                compute_text_x(cell, context)
+                compute_text_y(cell, context)
+                compute_scissor(cell, context, layout.scissor)
+
+    elif style.scroll != layout.scroll:
+        scroll = style.scroll - layout.scroll
+        x, y = (-scroll, 0) if style.direction is Direction.HORIZONTAL else (0, -scroll)
+        layout.scroll = style.scroll
+
+        translate_children(widget, x, y)
+
+    if layout.text_dirty:
+        _compute_text_size(widget)
+        _compute_text_x(widget)
+        _compute_text_y(widget)
+
+    for child in widget._children:
+        if child._layout.moved and (child._style.display is not Display.NONE):
+            compute_moved(child, context)
+
 
 def compute_width(widget: Widget, context: Context, width: float = None) -> float:
     '''Compute the content width of this widget and its children, take width taken in parent, return width taken in parent.'''
+    layout = widget._layout
+
+    if (width is not None) and not layout.dirty and (width == layout.given_width):
+        return layout.margin.width
+
+    # Later passes only visit widgets that are dirty.
+    layout.given_width = width
+    layout.dirty = True
+
+    # Many similar children are computed at once with arrays instead of one by one.
+    packed = pack_children(widget)
+    others = _stacked(widget)
+
     # Get relevant groups of child widgets.
-    children = [child for child in widget._children if child._style.display not in (Display.NONE, Display.FLOAT)]
+    children = [child for child in others if child._style.display not in (Display.NONE, Display.FLOAT)]
     flex_children = [child for child in children if child._style.width.type is Size.Type.FLEXIBLE]
     fixed_children = [child for child in children if child._style.width.type is not Size.Type.FLEXIBLE]
-    float_children = [child for child in widget._children if child._style.display is Display.FLOAT]
+    float_children = [child for child in others if child._style.display is Display.FLOAT]
 
     # Use the width defined in our own style.
     if widget._style.width.type is Size.Type.ABSOLUTE:
@@ -116,7 +294,7 @@ def compute_width(widget: Widget, context: Context, width: float = None) -> floa
     # Use a factor of our parent width.
     elif widget._style.width.type is Size.Type.RELATIVE:
         if width is None:
-            width = context.area.width
+            width = get_backend().area_size(context)[0]
 
         widget._layout.margin.width = widget._style.width.value * width
         widget._layout.border.width = widget._layout.margin.width - widget._style.margin.width
@@ -126,7 +304,7 @@ def compute_width(widget: Widget, context: Context, width: float = None) -> floa
     # Use the width given to us by our parent.
     elif widget._style.width.type is Size.Type.FLEXIBLE:
         if width is None:
-            width = context.area.width
+            width = get_backend().area_size(context)[0]
 
         widget._layout.margin.width = width
         widget._layout.border.width = widget._layout.margin.width - widget._style.margin.width
@@ -135,10 +313,10 @@ def compute_width(widget: Widget, context: Context, width: float = None) -> floa
 
     # Use the width of our texture.
     elif widget._style.width.type is Size.Type.TEXTURE:
-        if widget.texture is None:
+        if widget._texture is None:
             raise Exception('Widgets that get size from texture must have a texture')
 
-        widget._layout.padding.width = widget.texture.width
+        widget._layout.padding.width = widget._texture.width
         widget._layout.inside.width = widget._layout.padding.width - widget._style.padding.width
         widget._layout.border.width = widget._layout.padding.width + (widget._style.border_thickness * 2)
         widget._layout.margin.width = widget._layout.border.width + widget._style.margin.width
@@ -162,6 +340,9 @@ def compute_width(widget: Widget, context: Context, width: float = None) -> floa
         if flex_children:
             width_per_weight = widget._layout.inside.width
 
+    if packed is not None:
+        widget._layout.content.width = packed.compute_width(widget._style.direction, widget._layout.inside.width)
+
     # Stretch children to fit the stretchable width.
     for child in flex_children:
         compute_width(child, context, child._style.width.value * width_per_weight)
@@ -183,11 +364,22 @@ def compute_width(widget: Widget, context: Context, width: float = None) -> floa
 
 def compute_height(widget: Widget, context: Context, height: float = None) -> float:
     '''Compute the content height of this widget and its children, take height taken in parent, return height taken in parent.'''
+    layout = widget._layout
+
+    if (height is not None) and not layout.dirty and (height == layout.given_height):
+        return layout.margin.height
+
+    layout.given_height = height
+    layout.dirty = True
+
+    packed = widget._layout.packed
+    others = _stacked(widget)
+
     # Get relevant groups of child widgets.
-    children = [child for child in widget._children if child._style.display not in (Display.NONE, Display.FLOAT)]
+    children = [child for child in others if child._style.display not in (Display.NONE, Display.FLOAT)]
     flex_children = [child for child in children if child._style.height.type is Size.Type.FLEXIBLE]
     fixed_children = [child for child in children if child._style.height.type is not Size.Type.FLEXIBLE]
-    float_children = [child for child in widget._children if child._style.display is Display.FLOAT]
+    float_children = [child for child in others if child._style.display is Display.FLOAT]
 
     # Use the height defined in our own style.
     if widget._style.height.type is Size.Type.ABSOLUTE:
@@ -199,7 +391,7 @@ def compute_height(widget: Widget, context: Context, height: float = None) -> fl
     # Use a factor of our parent height.
     elif widget._style.height.type is Size.Type.RELATIVE:
         if height is None:
-            height = context.area.height
+            height = get_backend().area_size(context)[1]
 
         widget._layout.margin.height = widget._style.height.value * height
         widget._layout.border.height = widget._layout.margin.height - widget._style.margin.height
@@ -209,7 +401,7 @@ def compute_height(widget: Widget, context: Context, height: float = None) -> fl
     # Use the height given to us by our parent.
     elif widget._style.height.type is Size.Type.FLEXIBLE:
         if height is None:
-            height = context.area.height
+            height = get_backend().area_size(context)[1]
 
         widget._layout.margin.height = height
         widget._layout.border.height = widget._layout.margin.height - widget._style.margin.height
@@ -218,10 +410,10 @@ def compute_height(widget: Widget, context: Context, height: float = None) -> fl
 
     # Use the height of our texture.
     elif widget._style.height.type is Size.Type.TEXTURE:
-        if widget.texture is None:
+        if widget._texture is None:
             raise Exception('Widgets that get size from texture must have a texture')
 
-        widget._layout.padding.height = widget.texture.height
+        widget._layout.padding.height = widget._texture.height
         widget._layout.inside.height = widget._layout.padding.height - widget._style.padding.height
         widget._layout.border.height = widget._layout.padding.height + (widget._style.border_thickness * 2)
         widget._layout.margin.height = widget._layout.border.height + widget._style.margin.height
@@ -245,6 +437,12 @@ def compute_height(widget: Widget, context: Context, height: float = None) -> fl
         if flex_children:
             height_per_weight = inside_height
 
+    if packed is not None:
+        widget._layout.content.height = packed.compute_height(widget._style.direction, widget._layout.inside.height)
+
+    if widget._style.display is Display.GRID:
+        compute_grid(widget, context)
+
     # Fit our height to our children.
     if widget._style.height.type is Size.Type.CHILDREN:
         widget._layout.inside.height = widget._layout.content.height
@@ -265,13 +463,22 @@ def compute_height(widget: Widget, context: Context, height: float = None) -> fl
 
 
 def compute_x(widget: Widget, context: Context, x: float = None):
+    if (x is not None) and _clean(widget):
+        translate_layout(widget, widget._style.offset_x + x - widget._layout.margin.x, 0)
+        return
+
+    packed = widget._layout.packed
+    others = _stacked(widget)
+
     # Get relevant groups of child widgets.
-    children = [child for child in widget._children if child._style.display not in (Display.NONE, Display.FLOAT)]
+    children = [child for child in others if child._style.display not in (Display.NONE, Display.FLOAT)]
     flex_children = [child for child in children if child._style.width.type is Size.Type.FLEXIBLE]
-    float_children = [child for child in widget._children if child._style.display is Display.FLOAT]
+    float_children = [child for child in others if child._style.display is Display.FLOAT]
 
     # Start at the position defined in style.
     widget._layout.margin.x = widget._style.offset_x
+    widget._layout.offset_x = widget._style.offset_x
+    widget._layout.scroll = widget._style.scroll
 
     # Add the position given by our parent.
     if x is not None:
@@ -294,7 +501,7 @@ def compute_x(widget: Widget, context: Context, x: float = None):
                 widget._layout.content.x = widget._layout.inside.x + offset
 
         # Calculate position for children.
-        child_x = widget._layout.content.x - widget._style.scroll
+        child_x = widget._layout.content.x - widget._style.scroll - scroll_offset(widget)
         for child in children:
             compute_x(child, context, child_x)
             child_x += child._layout.margin.width
@@ -311,19 +518,32 @@ def compute_x(widget: Widget, context: Context, x: float = None):
                 elif widget._style.align_x is Align.END:
                     compute_x(child, context, widget._layout.inside.x + offset)
 
+    # Packed children are stacked from the same start, or aligned the same way.
+    if packed is not None:
+        start = widget._layout.content.x - widget._style.scroll - scroll_offset(widget)
+        packed.compute_x(widget._style.direction, widget._style.align_x, widget._layout.inside, start)
+
     # Floating children are placed relative to our inside position.
     for child in float_children:
         compute_x(child, context, widget._layout.inside.x)
 
 
 def compute_y(widget: Widget, context: Context, y: float = None):
+    if (y is not None) and _clean(widget):
+        translate_layout(widget, 0, widget._style.offset_y + y - widget._layout.margin.y)
+        return
+
+    packed = widget._layout.packed
+    others = _stacked(widget)
+
     # Get relevant groups of child widgets.
-    children = [child for child in widget._children if child._style.display not in (Display.NONE, Display.FLOAT)]
+    children = [child for child in others if child._style.display not in (Display.NONE, Display.FLOAT)]
     flex_children = [child for child in children if child._style.height.type is Size.Type.FLEXIBLE]
-    float_children = [child for child in widget._children if child._style.display is Display.FLOAT]
+    float_children = [child for child in others if child._style.display is Display.FLOAT]
 
     # Start at the position defined in style.
     widget._layout.margin.y = widget._style.offset_y
+    widget._layout.offset_y = widget._style.offset_y
 
     # Add the position given by our parent.
     if y is not None:
@@ -346,7 +566,7 @@ def compute_y(widget: Widget, context: Context, y: float = None):
                 widget._layout.content.y = widget._layout.inside.y + offset
 
         # Calculate position for children.
-        child_y = widget._layout.content.y - widget._style.scroll
+        child_y = widget._layout.content.y - widget._style.scroll - scroll_offset(widget)
         for child in children:
             compute_y(child, context, child_y)
             child_y += child._layout.margin.height
@@ -363,36 +583,281 @@ def compute_y(widget: Widget, context: Context, y: float = None):
                 elif widget._style.align_y is Align.END:
                     compute_y(child, context, widget._layout.inside.y + offset)
 
+    # Packed children are stacked from the same start, or aligned the same way.
+    if packed is not None:
+        start = widget._layout.content.y - widget._style.scroll - scroll_offset(widget)
+        packed.compute_y(widget._style.direction, widget._style.align_y, widget._layout.inside, start)
+
     # Floating children are placed relative to our inside position.
     for child in float_children:
-        compute_x(child, context, widget._layout.inside.y)
+        compute_y(child, context, widget._layout.inside.y)
+
+    # Grid cells are placed once our whole area is known, which is now.
+    if widget._style.display is Display.GRID:
+        compute_cells(widget, context)
+
+
+def translate_layout(widget: Widget, x: float, y: float):
+    '''Move the layout of a widget and its descendants without computing it.'''
+    if not (x or y):
+        return
+
+    layout = widget._layout
+
+    # Scissor areas are shared with the ancestor that clips, so they move along with it.
+    for area in (layout.text, layout.content, layout.inside, layout.padding, layout.border, layout.margin):
+        area.x += x
+        area.y += y
+
+    if layout.packed is not None:
+        layout.packed.translate(x, y)
+    else:
+        for child in widget._children:
+            if child._style.display is not Display.NONE:
+                translate_layout(child, x, y)
+
+
+def translate_children(widget: Widget, x: float, y: float):
+    '''Move the children that follow scroll, without computing layout.'''
+    if widget._layout.packed is not None:
+        widget._layout.packed.translate(x, y)
+    else:
+        for child in widget._children:
+            if child._style.display not in (Display.NONE, Display.FLOAT):
+                translate_layout(child, x, y)
+
+
+def compute_grid(widget: Widget, context: Context):
+    '''Compute the cell size and line length of a grid, and the size of its content.
+
+    Cell sizes can be absolute, relative to the inside of the grid, or flexible.
+    Across the direction, flexible cells fit as many as possible at the other cell size times the weight,
+    then stretch to fill the line. Along the direction, flexible cells are the other cell size times the weight.
+    '''
+    style = widget._style
+    layout = widget._layout
+
+    if layout.grid is None:
+        layout.grid = Grid()
+    grid = layout.grid
+
+    vertical = style.direction is Direction.VERTICAL
+    across, along = (style.cell_width, style.cell_height) if vertical else (style.cell_height, style.cell_width)
+    across_space, along_space = (layout.inside.width, layout.inside.height) if vertical else (layout.inside.height, layout.inside.width)
+
+    if across.type is Size.Type.FLEXIBLE:
+        along_size = _cell_size(along, along_space)
+        per_line = max(1, int(across_space // (along_size * across.value))) if along_size > 0 else 1
+        across_size = across_space / per_line
+    else:
+        across_size = _cell_size(across, across_space)
+        along_size = _cell_size(along, along_space, across_size)
+        per_line = max(1, int(across_space // across_size)) if across_size > 0 else 1
+
+    grid.count = widget.grid_count()
+    grid.per_line = per_line
+    grid.cell_width, grid.cell_height = (across_size, along_size) if vertical else (along_size, across_size)
+
+    lines = ceil(grid.count / per_line)
+    if vertical:
+        layout.content.width = min(grid.count, per_line) * across_size
+        layout.content.height = lines * along_size
+    else:
+        layout.content.width = lines * along_size
+        layout.content.height = min(grid.count, per_line) * across_size
+
+
+def compute_cells(widget: Widget, context: Context) -> List[Widget]:
+    '''Lay out the cells of a grid from their index, return the cells that were laid out.
+
+    Only the lines in view are asked for, widgets that don't create cells lazily give all their children.
+    '''
+    style = widget._style
+    layout = widget._layout
+    grid = layout.grid
+
+    # The content may have shrunk since the grid was scrolled.
+    if widget._scroller is not None:
+        widget._scroller.fit()
+
+    vertical = style.direction is Direction.VERTICAL
+    scroll = style.scroll + scroll_offset(widget)
+    grid.scroll = scroll
+
+    # Center or end align the content across the direction, it scrolls along it.
+    layout.content.x = layout.inside.x
+    layout.content.y = layout.inside.y
+
+    if vertical:
+        layout.content.x += _aligned(style.align_x, layout.inside.width - layout.content.width)
+        along_size, along_space = grid.cell_height, layout.inside.height
+    else:
+        layout.content.y += _aligned(style.align_y, layout.inside.height - layout.content.height)
+        along_size, along_space = grid.cell_width, layout.inside.width
+
+    # The lines in view follow from the scroll and the cell size.
+    if along_size > 0:
+        start = max(0, int(scroll // along_size)) * grid.per_line
+        stop = min(grid.count, ceil((scroll + along_space) / along_size) * grid.per_line)
+    else:
+        start = stop = 0
+
+    cells = []
+    visible = []
+
+    for index, cell in widget.grid_cells(context, start, max(start, stop)):
+        line, position = divmod(index, grid.per_line)
+
+        if vertical:
+            x = layout.content.x + position * grid.cell_width
+            y = layout.content.y + line * grid.cell_height - scroll
+        else:
+            x = layout.content.x + line * grid.cell_width - scroll
+            y = layout.content.y + position * grid.cell_height
+
+        # Cells fill their cell when flexible, and are aligned in it like the grid aligns its content.
+        compute_width(cell, context, grid.cell_width)
+        compute_height(cell, context, grid.cell_height)
+        compute_x(cell, context, x + _aligned(style.align_x, grid.cell_width - cell._layout.margin.width))
+        compute_y(cell, context, y + _aligned(style.align_y, grid.cell_height - cell._layout.margin.height))
+
+        cells.append(cell)
+        if start <= index < stop:
+            visible.append(cell)
+
+    grid.visible = visible
+    return cells
+
+
+def _cell_size(size: Size, space: float, other: float = None) -> float:
+    if size.type is Size.Type.ABSOLUTE:
+        return size.value
+    elif size.type is Size.Type.RELATIVE:
+        return size.value * space
+    elif (size.type is Size.Type.FLEXIBLE) and (other is not None):
+        return size.value * other
+    raise Exception('Grid cells must be absolute, relative or flexible, and only flexible in one direction')
+
+
+def _aligned(align: Align, space: float) -> float:
+    '''Offset that aligns something in the given remaining space.'''
+    if align is Align.CENTER:
+        return space / 2
+    elif align is Align.END:
+        return space
+    return 0
+
+
+def _clean(widget: Widget) -> bool:
+    '''Whether the layout of a widget and its descendants is up to date, apart from where it is.'''
+    return not (widget._layout.dirty or widget._layout.moved)
+
+
+def _stacked(widget: Widget) -> Sequence[Widget]:
+    '''Children laid out one by one, packed children and grid cells are laid out separately.'''
+    if (widget._layout.packed is not None) or (widget._style.display is Display.GRID):
+        return ()
+    return widget._children
+
+
+def pack_children(widget: Widget) -> Union[Packed, None]:
+    '''Give the children of this widget array layout if they can share one, return it or none.'''
+    style = packable(widget)
+    packed = widget._layout.packed
+
+    if style is None:
+        if packed is not None:
+            widget._layout.packed = None
+            unpack_children(packed, packed.children)
+        return None
+
+    if packed is None:
+        packed = widget._layout.packed = Packed()
+
+    previous = packed.children
+    if packed.attach(widget._children, style):
+        current = set(packed.children)
+        unpack_children(packed, [child for child in previous if child not in current])
+
+        for index, child in enumerate(packed.children):
+            layout = child._layout
+            view = layout.margin
+
+            # Children that stay packed keep their views, they only move to another index.
+            if (type(view) is PackedArea) and (view._packed is packed):
+                if view._index != index:
+                    for name in AREAS:
+                        getattr(layout, name)._index = index
+            else:
+                for area, name in enumerate(AREAS):
+                    setattr(layout, name, PackedArea(packed, area, index))
+
+    return packed
+
+
+def unpack_children(packed: Packed, children: List[Widget]):
+    '''Give packed children their own areas again, with the values they have in the arrays.'''
+    for child in children:
+        layout = child._layout
+        view = layout.margin
+
+        if (type(view) is PackedArea) and (view._packed is packed):
+            for name in AREAS:
+                view = getattr(layout, name)
+                setattr(layout, name, Area(view.x, view.y, view.width, view.height))
 
 
 def compute_scissor(widget: Widget, context: Context, area: Area = None):
     if area is not None:
-        widget._layout.scissor = area
-    elif widget._style.display is Display.SCROLL:
-        widget._layout.scissor = widget._layout.padding
+        scissor = area
+    elif widget._style.display in (Display.SCROLL, Display.GRID):
+        scissor = widget._layout.padding
     else:
-        widget._layout.scissor = None
+        scissor = None
 
-    for child in widget._children:
-        if child._style.display is not Display.NONE:
-            compute_scissor(child, context, widget._layout.scissor)
+    # Descendants of a clean widget whose scissor stays the same keep theirs too.
+    if _clean(widget) and (widget._layout.scissor is scissor):
+        return
+
+    widget._layout.scissor = scissor
+
+    # This is the last pass that visits every widget that got layout.
+    widget._layout.dirty = False
+    widget._layout.moved = False
+
+    if widget._layout.packed is not None:
+        _finish_packed(widget._layout.packed, widget._layout.scissor)
+    else:
+        for child in widget._children:
+            if child._style.display is not Display.NONE:
+                compute_scissor(child, context, widget._layout.scissor)
+
+
+def _finish_packed(packed: Packed, scissor: Union[Area, None]):
+    '''Set what the per child passes would have set on the layouts of packed children.'''
+    style = packed.style
+
+    for child in packed.children:
+        layout = child._layout
+        layout.scissor = scissor
+        layout.dirty = False
+        layout.moved = False
+        layout.given_width = None
+        layout.given_height = None
+        layout.offset_x = style.offset_x
+        layout.offset_y = style.offset_y
+        layout.scroll = style.scroll
 
 
 def compute_text_size(widget: Widget, context: Context):
-    if widget.text is not None:
-        font_id = widget._style.font.id
-        font_size = widget._style.font_size
-        blf.size(font_id, font_size, 72)
+    if _clean(widget):
+        return
 
-        # Get height from capital A because it looks better.
-        width = blf.dimensions(font_id, widget.text)[0]
-        height = blf.dimensions(font_id, 'A')[1]
+    _compute_text_size(widget)
 
-        widget._layout.text.width = width
-        widget._layout.text.height = height
+    if widget._layout.packed is not None:
+        widget._layout.packed.compute_text_size()
+        return
 
     for child in widget._children:
         if child._style.display is not Display.NONE:
@@ -400,7 +865,49 @@ def compute_text_size(widget: Widget, context: Context):
 
 
 def compute_text_x(widget: Widget, context: Context):
-    if widget.text is not None:
+    if _clean(widget):
+        return
+
+    _compute_text_x(widget)
+
+    if widget._layout.packed is not None:
+        widget._layout.packed.compute_text_x()
+        return
+
+    for child in widget._children:
+        if child._style.display is not Display.NONE:
+            compute_text_x(child, context)
+
+
+def compute_text_y(widget: Widget, context: Context):
+    if _clean(widget):
+        return
+
+    _compute_text_y(widget)
+
+    if widget._layout.packed is not None:
+        widget._layout.packed.compute_text_y()
+        return
+
+    for child in widget._children:
+        if child._style.display is not Display.NONE:
+            compute_text_y(child, context)
+
+
+def _compute_text_size(widget: Widget):
+    widget._layout.text_dirty = False
+
+    if widget._text is not None:
+        style = widget._style
+        lines = fit_text(style.font.id, style.font_size, widget._text, style.text_wrap, widget._layout.inside.width)
+
+        widget._layout.lines = lines
+        widget._layout.text.width = lines.width
+        widget._layout.text.height = lines.height
+
+
+def _compute_text_x(widget: Widget):
+    if widget._text is not None:
         if widget._style.align_x is Align.START:
             widget._layout.text.x = widget._layout.inside.x
         else:
@@ -410,13 +917,9 @@ def compute_text_x(widget: Widget, context: Context):
             elif widget._style.align_x is Align.END:
                 widget._layout.text.x = widget._layout.inside.x + offset
 
-    for child in widget._children:
-        if child._style.display is not Display.NONE:
-            compute_text_x(child, context)
 
-
-def compute_text_y(widget: Widget, context: Context):
-    if widget.text is not None:
+def _compute_text_y(widget: Widget):
+    if widget._text is not None:
         if widget._style.align_y is Align.START:
             widget._layout.text.y = widget._layout.inside.y
         else:
@@ -425,7 +928,3 @@ def compute_text_y(widget: Widget, context: Context):
                 widget._layout.text.y = widget._layout.inside.y + offset / 2
             elif widget._style.align_y is Align.END:
                 widget._layout.text.y = widget._layout.inside.y + offset
-
-    for child in widget._children:
-        if child._style.display is not Display.NONE:
-            compute_text_y(child, context)
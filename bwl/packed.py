@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Union
+
+from .dirty import LAYOUT_PROPERTIES, POSITION_PROPERTIES, TEXT_PROPERTIES
+from .style import Align, Direction, Display, Size
+from .text import fit_text
+
+if TYPE_CHECKING:
+    from .layout import Area
+    from .style import ComputedStyle, Style
+    from .widget import Widget
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Below this many children the per child layout code is faster than the array overhead.
+PACK_MINIMUM = 64
+
+# Rows of the area array, in the order of the layout areas they're views for.
+AREAS = ('text', 'content', 'inside', 'padding', 'border', 'margin')
+_TEXT, _CONTENT, _INSIDE, _PADDING, _BORDER, _MARGIN = range(6)
+
+# Columns of the area array, in the order of area attributes.
+_X, _Y, _WIDTH, _HEIGHT = range(4)
+
+# Where alignment puts the remaining space.
+_ALIGN = {Align.START: 0.0, Align.CENTER: 0.5, Align.END: 1.0}
+
+
+class Packed:
+    '''Layout of many children with the same layout style, stored as arrays and computed at once.
+
+    The areas array has a row per area kind, a column per coordinate and an entry per child.
+    The layouts of the children hold views into it, so reading them works like any layout.
+    '''
+    __slots__ = ('children', 'style', 'areas')
+
+    def __init__(self):
+        self.children: List[Widget] = []
+        self.style: Union[Style, ComputedStyle, None] = None
+        self.areas = np.zeros((6, 4, 0))
+
+    def attach(self, children: List[Widget], style: Union[Style, ComputedStyle]) -> bool:
+        '''Use arrays for these children, return whether they changed so views must be updated.'''
+        self.style = style
+
+        if children == self.children:
+            return False
+
+        self.children = children[:]
+        self.areas = np.zeros((6, 4, len(children)))
+        return True
+
+    def compute_width(self, direction: Direction, inside: float) -> float:
+        '''Compute the widths of the children, return the content width.'''
+        widths = self._size(self.style.width, inside, 'width')
+        self._fill(_WIDTH, self.style.width, widths, self.style.padding.width, self.style.margin.width)
+
+        if direction is Direction.HORIZONTAL:
+            return self.areas[_MARGIN, _WIDTH].sum().item()
+        else:
+            return self.areas[_MARGIN, _WIDTH].max().item()
+
+    def compute_height(self, direction: Direction, inside: float) -> float:
+        '''Compute the heights of the children, return the content height.'''
+        heights = self._size(self.style.height, inside, 'height')
+        self._fill(_HEIGHT, self.style.height, heights, self.style.padding.height, self.style.margin.height)
+
+        if direction is Direction.VERTICAL:
+            return self.areas[_MARGIN, _HEIGHT].sum().item()
+        else:
+            return self.areas[_MARGIN, _HEIGHT].max().item()
+
+    def compute_x(self, direction: Direction, align: Align, inside: Area, start: float):
+        '''Place the children horizontally, stacked from start or aligned inside.'''
+        margins = self.areas[_MARGIN]
+
+        if direction is Direction.HORIZONTAL:
+            margins[_X, 0] = start
+            np.cumsum(margins[_WIDTH, :-1], out=margins[_X, 1:])
+            margins[_X, 1:] += start
+        else:
+            margins[_X] = inside.x + (inside.width - margins[_WIDTH]) * _ALIGN[align]
+
+        style = self.style
+        self._place(_X, style.offset_x, style.margin.left, style.padding.left, Direction.HORIZONTAL, style.align_x)
+
+    def compute_y(self, direction: Direction, align: Align, inside: Area, start: float):
+        '''Place the children vertically, stacked from start or aligned inside.'''
+        margins = self.areas[_MARGIN]
+
+        if direction is Direction.VERTICAL:
+            margins[_Y, 0] = start
+            np.cumsum(margins[_HEIGHT, :-1], out=margins[_Y, 1:])
+            margins[_Y, 1:] += start
+        else:
+            margins[_Y] = inside.y + (inside.height - margins[_HEIGHT]) * _ALIGN[align]
+
+        style = self.style
+        self._place(_Y, style.offset_y, style.margin.top, style.padding.top, Direction.VERTICAL, style.align_y)
+
+    def compute_text_size(self):
+        '''Fit the text of the children to their width, the font is shared.'''
+        style = self.style
+        inside = self.areas[_INSIDE, _WIDTH].tolist()
+        widths = []
+        heights = []
+
+        for child, width in zip(self.children, inside):
+            layout = child._layout
+            layout.text_dirty = False
+
+            if child._text is not None:
+                layout.lines = fit_text(style.font.id, style.font_size, child._text, style.text_wrap, width)
+                widths.append(layout.lines.width)
+                heights.append(layout.lines.height)
+            else:
+                widths.append(0)
+                heights.append(0)
+
+        self.areas[_TEXT, _WIDTH] = widths
+        self.areas[_TEXT, _HEIGHT] = heights
+
+    def compute_text_x(self):
+        '''Align the text of the children horizontally.'''
+        self._align_text(_X, _WIDTH, self.style.align_x)
+
+    def compute_text_y(self):
+        '''Align the text of the children vertically.'''
+        self._align_text(_Y, _HEIGHT, self.style.align_y)
+
+    def translate(self, x: float, y: float):
+        '''Move all children, like translating each of their layouts.'''
+        self.areas[:, _X] += x
+        self.areas[:, _Y] += y
+
+    def visible(self, area: Area) -> List[Widget]:
+        '''Children whose border is at least partially inside the given area.'''
+        borders = self.areas[_BORDER]
+        mask = (area.x <= borders[_X] + borders[_WIDTH]) & (area.x + area.width >= borders[_X])
+        mask &= (area.y <= borders[_Y] + borders[_HEIGHT]) & (area.y + area.height >= borders[_Y])
+
+        children = self.children
+        return [children[index] for index in np.flatnonzero(mask).tolist()]
+
+    def _size(self, size: Size, inside: float, name: str):
+        '''Margin size of the children, or padding size for sizes that grow outward.'''
+        if size.type is Size.Type.ABSOLUTE:
+            return size.value
+        elif size.type is Size.Type.RELATIVE:
+            return size.value * inside
+        elif size.type is Size.Type.FLEXIBLE:
+            return inside
+        elif size.type is Size.Type.TEXTURE:
+            if any(child._texture is None for child in self.children):
+                raise Exception('Widgets that get size from texture must have a texture')
+            return np.fromiter((getattr(child._texture, name) for child in self.children), float, len(self.children))
+        else:
+            return 0
+
+    def _fill(self, column: int, size: Size, given, padding: float, margin: float):
+        '''Compute each area size from the margin or padding size, like the per child code does.'''
+        areas = self.areas
+        thickness = self.style.border_thickness * 2
+
+        # Leaf children have no content, so fitting to children fits to nothing.
+        areas[_CONTENT, column] = 0
+
+        if size.type in (Size.Type.RELATIVE, Size.Type.FLEXIBLE):
+            areas[_MARGIN, column] = given
+            areas[_BORDER, column] = areas[_MARGIN, column] - margin
+            areas[_PADDING, column] = areas[_BORDER, column] - thickness
+            areas[_INSIDE, column] = areas[_PADDING, column] - padding
+        else:
+            areas[_INSIDE, column] = given - padding if (size.type is not Size.Type.CHILDREN) else 0
+            areas[_PADDING, column] = areas[_INSIDE, column] + padding
+            areas[_BORDER, column] = areas[_PADDING, column] + thickness
+            areas[_MARGIN, column] = areas[_BORDER, column] + margin
+
+    def _place(self, column: int, offset: float, margin: float, padding: float, direction: Direction, align: Align):
+        '''Compute each area position from the margin position, like the per child code does.'''
+        areas = self.areas
+        areas[_MARGIN, column] += offset
+        areas[_BORDER, column] = areas[_MARGIN, column] + margin
+        areas[_PADDING, column] = areas[_BORDER, column] + self.style.border_thickness
+        areas[_INSIDE, column] = areas[_PADDING, column] + padding
+
+        # Leaf children align their empty content along their own direction.
+        size = _WIDTH if column == _X else _HEIGHT
+        if self.style.direction is direction:
+            areas[_CONTENT, column] = areas[_INSIDE, column] + areas[_INSIDE, size] * _ALIGN[align]
+        else:
+            areas[_CONTENT, column] = areas[_INSIDE, column]
+
+    def _align_text(self, column: int, size: int, align: Align):
+        areas = self.areas
+        areas[_TEXT, column] = areas[_INSIDE, column] + (areas[_INSIDE, size] - areas[_TEXT, size]) * _ALIGN[align]
+
+
+def packable(widget: Widget) -> Union[Style, ComputedStyle, None]:
+    '''The style shared by the children of this widget if they can be packed, or none.
+
+    Children are packed when there are many of them, none have children of their own,
+    and they agree on every style property that affects layout or text, except the main axis can't be flexible.
+    '''
+    children = widget._children
+
+    if (np is None) or (len(children) < PACK_MINIMUM) or (widget._style.display is Display.GRID):
+        return None
+
+    if any(child._children for child in children):
+        return None
+
+    styles = {child._style for child in children}
+    style = next(iter(styles))
+
+    if style.display is not Display.STANDARD:
+        return None
+
+    if widget._style.direction is Direction.HORIZONTAL:
+        if style.width.type is Size.Type.FLEXIBLE:
+            return None
+    elif style.height.type is Size.Type.FLEXIBLE:
+        return None
+
+    for other in styles:
+        if other is not style:
+            for name in LAYOUT_PROPERTIES + POSITION_PROPERTIES + TEXT_PROPERTIES:
+                if getattr(other, name) != getattr(style, name):
+                    return None
+
+    return style
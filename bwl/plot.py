@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, List, Tuple, Union
+
+from .backends import get_backend
+from .style import Color, Corners, Sides, Size, Style
+from .widget import Widget
+
+if TYPE_CHECKING:
+    from bpy.types import Context, Event
+
+    from .backends import Backend
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Series:
+    '''Line in a plot, from arrays of y values and optionally sorted x values, the x values are indices otherwise.
+
+    The arrays aren't copied, call set_data after changing them in place so the plot uploads the line again.
+    '''
+    __slots__ = ('x', 'y', 'color', 'thickness', '_version', '_key', '_lines')
+
+    def __init__(self, y: Any, x: Any = None, color: Color = Color(0.9), thickness: float = 1):
+        self.color = color
+        self.thickness = thickness
+
+        # The lines uploaded for the view and data they were made for.
+        self._version = 0
+        self._key: tuple = None
+        self._lines: Any = None
+
+        self.set_data(y, x)
+
+    def set_data(self, y: Any, x: Any = None):
+        '''Replace the data of this line.'''
+        self.y = np.asarray(y)
+        self.x = np.asarray(x) if (x is not None) else None
+        self._version += 1
+
+        if (self.x is not None) and (self.x.shape != self.y.shape):
+            raise Exception('Series x and y must have the same length')
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        '''Lowest and highest x and y value.'''
+        if self.x is not None:
+            x_min, x_max = self.x[0].item(), self.x[-1].item()
+        else:
+            x_min, x_max = 0, len(self.y) - 1
+
+        return x_min, x_max, np.nanmin(self.y).item(), np.nanmax(self.y).item()
+
+    def span(self, x_min: float, x_max: float) -> Tuple[int, int]:
+        '''Start and stop index of the values in a range of x, and the one on either side so lines reach the edges.'''
+        if self.x is not None:
+            start = int(np.searchsorted(self.x, x_min, 'right')) - 1
+            stop = int(np.searchsorted(self.x, x_max, 'left')) + 1
+        else:
+            start = int(np.floor(x_min))
+            stop = int(np.ceil(x_max)) + 1
+
+        return max(0, start), min(len(self.y), stop)
+
+
+class Plot(Widget):
+    '''Line plot of NumPy arrays, drag to pan and scroll to zoom, hold ctrl to zoom vertically.
+
+    Each series is cut to the values in view and reduced to the lowest and highest value per pixel column,
+    then uploaded as one line strip. It's drawn again as is until its data, the view or the plot size changes.
+    '''
+    __slots__ = ('_series', '_x_range', '_y_range', '_drag')
+
+    # How much one step of the mouse wheel zooms.
+    zoom_step: float = 1.25
+
+    # Styles of a plot, replace them on the class or on a subclass to theme plots.
+    plot_style = Style(
+        width=Size.flexible(),
+        height=Size.absolute(200),
+        padding=Sides(4),
+        background_color=Color(0.15),
+        border_color=Color(0.3),
+        border_radius=Corners(3),
+        border_thickness=1,
+    )
+
+    def __init__(self, parent: Union[Widget, None] = None):
+        if np is None:
+            raise Exception('Plot needs NumPy')
+
+        super().__init__(parent)
+        self.styles = [self.plot_style]
+
+        self._series: List[Series] = []
+        self._x_range: Tuple[float, float] = (0, 1)
+        self._y_range: Tuple[float, float] = (0, 1)
+
+        # Cursor position and view when dragging started.
+        self._drag: Union[Tuple[float, float, Tuple[float, float], Tuple[float, float]], None] = None
+
+    @property
+    def series(self) -> Tuple[Series, ...]:
+        '''The lines in this plot.'''
+        return tuple(self._series)
+
+    @property
+    def x_range(self) -> Tuple[float, float]:
+        '''Lowest and highest x value in view.'''
+        return self._x_range
+
+    @x_range.setter
+    def x_range(self, x_range: Tuple[float, float]):
+        self._x_range = _valid_range(x_range)
+
+    @property
+    def y_range(self) -> Tuple[float, float]:
+        '''Lowest and highest y value in view.'''
+        return self._y_range
+
+    @y_range.setter
+    def y_range(self, y_range: Tuple[float, float]):
+        self._y_range = _valid_range(y_range)
+
+    def add_series(self, y: Any, x: Any = None, color: Color = Color(0.9), thickness: float = 1) -> Series:
+        '''Add a line, the view is fitted to it if it's the first.'''
+        series = Series(y, x, color, thickness)
+        self._series.append(series)
+
+        if len(self._series) == 1:
+            self.fit()
+
+        return series
+
+    def remove_series(self, series: Series):
+        '''Remove a line.'''
+        self._series.remove(series)
+
+    def fit(self):
+        '''Fit the view to the data of all lines.'''
+        bounds = [series.bounds for series in self._series if len(series.y)]
+
+        if bounds:
+            self.x_range = min(bound[0] for bound in bounds), max(bound[1] for bound in bounds)
+            self.y_range = min(bound[2] for bound in bounds), max(bound[3] for bound in bounds)
+
+    def pan(self, x: float, y: float):
+        '''Move the content by a distance in pixels, with y going up.'''
+        inside = self._layout.inside
+        x_min, x_max = self._x_range
+        y_min, y_max = self._y_range
+
+        if inside.width > 0:
+            x = x * (x_max - x_min) / inside.width
+            self._x_range = (x_min - x, x_max - x)
+
+        if inside.height > 0:
+            y = y * (y_max - y_min) / inside.height
+            self._y_range = (y_min - y, y_max - y)
+
+    def zoom(self, factor: float, x: float = 0.5, y: float = None):
+        '''Zoom in by a factor around a point given as a fraction of the view, only horizontally without y.'''
+        x_min, x_max = self._x_range
+        center = x_min + (x_max - x_min) * x
+        self._x_range = _valid_range((center - (center - x_min) / factor, center + (x_max - center) / factor))
+
+        if y is not None:
+            y_min, y_max = self._y_range
+            center = y_min + (y_max - y_min) * y
+            self._y_range = _valid_range((center - (center - y_min) / factor, center + (y_max - center) / factor))
+
+    def draw(self, backend: Backend, area_height: float):
+        inside = self._layout.inside
+        width = round(inside.width)
+        height = round(inside.height)
+
+        if (width <= 0) or (height <= 0):
+            return
+
+        # Lines are clipped to the plot, within the scissor of the widget if it has one.
+        left = round(inside.x)
+        bottom = round(area_height - inside.y - inside.height)
+        right = left + width
+        top = bottom + height
+
+        scissor = self._layout.scissor
+        if scissor is not None:
+            scissor = round(scissor)
+            left = max(left, scissor.x)
+            right = min(right, scissor.x + scissor.width)
+            top = min(top, area_height - scissor.y)
+            bottom = max(bottom, area_height - scissor.y - scissor.height)
+
+        if (left >= right) or (bottom >= top):
+            return
+
+        backend.set_scissor(left, bottom, right - left, top - bottom)
+
+        for series in self._series:
+            key = (series._version, self._x_range, self._y_range, width, height)
+
+            if series._key != key:
+                series._key = key
+                points = self._points(series, width, height)
+                series._lines = backend.new_lines(points) if (len(points) > 1) else None
+
+            if series._lines is not None:
+                x = inside.x
+                y = area_height - inside.y - inside.height
+                backend.draw_lines(series._lines, x, y, series.color, series.thickness)
+
+        if scissor is not None:
+            backend.set_scissor(scissor.x, area_height - scissor.y - scissor.height, scissor.width, scissor.height)
+        else:
+            backend.clear_scissor()
+
+    def on_mouse_press(self, context: Context, event: Event) -> bool:
+        if event.type == 'LEFTMOUSE':
+            self._drag = (event.mouse_region_x, event.mouse_region_y, self._x_range, self._y_range)
+            return True
+        return False
+
+    def on_mouse_move(self, context: Context, event: Event) -> bool:
+        if (self._drag is not None) and ('LEFTMOUSE' in self._buttons):
+            x, y, self._x_range, self._y_range = self._drag
+            self.pan(event.mouse_region_x - x, event.mouse_region_y - y)
+            return True
+        return False
+
+    def on_mouse_release(self, context: Context, event: Event) -> bool:
+        if event.type == 'LEFTMOUSE':
+            self._drag = None
+            return True
+        return False
+
+    def on_mouse_scroll(self, context: Context, event: Event) -> bool:
+        inside = self._layout.inside
+        factor = self.zoom_step if event.type in ('WHEELUPMOUSE', 'WHEELINMOUSE') else 1 / self.zoom_step
+
+        # Zoom around the cursor, region y goes up while layout y goes down.
+        area_height = get_backend().area_size(context)[1]
+        x = (event.mouse_region_x - inside.x) / inside.width if inside.width else 0.5
+        y = (area_height - event.mouse_region_y - inside.y) / inside.height if inside.height else 0.5
+
+        self.zoom(factor, x, (1 - y) if event.ctrl else None)
+        return True
+
+    def on_event(self, context: Context, event: Event) -> bool:
+        # Dragging ends on release even when the cursor left the plot.
+        handled = super().on_event(context, event)
+        if (event.type == 'LEFTMOUSE') and (event.value == 'RELEASE'):
+            self._drag = None
+        return handled
+
+    def _points(self, series: Series, width: int, height: int) -> Any:
+        '''Points of a line in pixels from the bottom left of the plot, at most two per pixel column.'''
+        x_min, x_max = self._x_range
+        y_min, y_max = self._y_range
+        start, stop = series.span(x_min, x_max)
+
+        # The arrays are sliced without copying, only the kept indices are gathered.
+        if stop - start > width * 2:
+            indices = _extremes(series.y[start:stop], width) + start
+        else:
+            indices = np.arange(start, stop)
+
+        x = series.x[indices] if (series.x is not None) else indices
+        points = np.empty((len(indices), 2), dtype=np.float32)
+        points[:, 0] = (x - x_min) * (width / (x_max - x_min))
+        points[:, 1] = (series.y[indices] - y_min) * (height / (y_max - y_min))
+        return points
+
+
+def _extremes(y: Any, buckets: int) -> Any:
+    '''Indices of the lowest and highest value in each of a number of equal buckets, in order, with the ends.'''
+    size = len(y) // buckets
+    bulk = y[:size * buckets].reshape(buckets, size)
+    base = np.arange(buckets) * size
+
+    pairs = np.stack((bulk.argmin(axis=1) + base, bulk.argmax(axis=1) + base), axis=1)
+    pairs.sort(axis=1)
+
+    # The first and last value and values that don't fill a bucket are kept, so the line reaches both edges.
+    return np.concatenate(((0,), pairs.ravel(), np.arange(size * buckets, len(y)), (len(y) - 1,)))
+
+
+def _valid_range(value: Tuple[float, float]) -> Tuple[float, float]:
+    '''Range with the lowest value first, widened when it's empty so it can be divided by.'''
+    low, high = sorted((float(value[0]), float(value[1])))
+    if high - low < 1e-12:
+        low, high = low - 0.5, high + 0.5
+    return low, high
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Tuple, Type, TypeVar, Union
+
+from .animation import stop_animation
+from .layout import Layout
+from .style import DEFAULT_STYLE, Style
+from .widget import _EMPTY, Widget
+
+W = TypeVar('W', bound=Widget)
+
+
+class WidgetPool:
+    '''Detached widgets kept for reuse, by widget class and style template, so rebuilt lists don't allocate.
+
+    Acquire widgets instead of constructing them, and release them instead of dropping them.
+    Released widgets and their descendants are reset and kept, the next acquire with the same class
+    and styles gets one back. Attributes that subclasses add are left as they were.
+    '''
+
+    # Most widgets kept per class and style template, the rest are left to the garbage collector.
+    limit: int = 1024
+
+    def __init__(self):
+        self._free: Dict[Tuple[type, Tuple[Style, ...]], List[Widget]] = {}
+
+        # Widgets constructed, handed out again, and taken back.
+        self.allocated = 0
+        self.reused = 0
+        self.released = 0
+
+    def __len__(self) -> int:
+        return sum(len(widgets) for widgets in self._free.values())
+
+    def acquire(self, cls: Type[W] = Widget, styles: Iterable[Style] = (), parent: Union[Widget, None] = None) -> W:
+        '''Get a reset widget of a class with these styles, reused if one was released, added to the parent.'''
+        styles = tuple(styles)
+        free = self._free.get((cls, styles))
+
+        if free:
+            widget = free.pop()
+            self.reused += 1
+
+            if parent is not None:
+                parent.append(widget)
+
+        else:
+            widget = cls(parent)
+            self.allocated += 1
+
+        widget.styles[:] = styles
+        return widget
+
+    def release(self, widget: Widget):
+        '''Detach a widget from its parent and keep it and its descendants for reuse.'''
+        if widget._parent is not None:
+            widget._parent.remove(widget, free=False)
+
+        self._keep(widget)
+
+    def release_children(self, widget: Widget):
+        '''Detach all children of a widget and keep them for reuse, like before rebuilding a list.'''
+        if widget._children:
+            children = widget._children[:]
+            widget.clear(free=False)
+
+            for child in children:
+                self._keep(child)
+
+    def clear(self):
+        '''Forget all kept widgets.'''
+        self._free.clear()
+
+    def _keep(self, widget: Widget):
+        for child in widget._children:
+            self._keep(child)
+
+        _reset(widget)
+        self.released += 1
+
+        free = self._free.setdefault((type(widget), tuple(widget.styles)), [])
+        if len(free) < self.limit:
+            free.append(widget)
+
+
+def _reset(widget: Widget):
+    '''Clear the state of a widget as if it was just constructed.'''
+    stop_animation(widget)
+    widget.unfocus()
+    widget._parent = None
+    widget._children.clear()
+
+    widget._hover = False
+    widget._buttons = _EMPTY
+    widget._keys = _EMPTY
+    widget._classes = _EMPTY
+    widget._scroller = None
+    widget.style_sheet = None
+    widget._texture = None
+    widget._text = None
+    widget._spec = None
+
+    # A fresh style so the next styles apply without transitions from the old ones, and a fresh layout
+    # because the old one may be views into the arrays of a former parent.
+    widget._style = DEFAULT_STYLE
+    widget._layout = Layout()
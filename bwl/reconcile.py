@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Sequence, Type, Union
+
+from .dirty import mark_dirty
+from .widget import Widget, _free
+
+if TYPE_CHECKING:
+    from .content import Texture
+    from .style import Style
+
+
+class Spec:
+    '''Description of a widget, built again whenever the data it shows changes and reconciled with the widgets.
+
+    The key identifies a widget among its siblings across rebuilds, so it keeps its hover, buttons and scroll state.
+    Children are left alone when they're none, for widgets that manage their own children like grid views.
+    Setup is called once with a widget when it's created for this spec.
+    A spec that is reused as is, for data that didn't change, is skipped with all its descendants.
+    '''
+    __slots__ = ('key', 'cls', 'text', 'texture', 'styles', 'classes', 'children', 'setup')
+
+    def __init__(
+        self,
+        key: Any = None,
+        cls: Type[Widget] = Widget,
+        text: Union[str, None] = None,
+        texture: Union[Texture, None] = None,
+        styles: Iterable[Style] = (),
+        classes: Iterable[str] = (),
+        children: Union[Sequence[Spec], None] = None,
+        setup: Callable[[Widget], None] = None,
+    ):
+        self.key = key
+        self.cls = cls
+        self.text = text
+        self.texture = texture
+        self.styles = tuple(styles)
+        self.classes = frozenset(classes)
+        self.children = children
+        self.setup = setup
+
+
+def build(spec: Spec) -> Widget:
+    '''Create a widget and its descendants from a spec.'''
+    widget = spec.cls()
+
+    if spec.setup is not None:
+        spec.setup(widget)
+
+    # A new widget has nothing to compare with, so only what the spec sets is set.
+    widget._spec = spec
+
+    if spec.text is not None:
+        widget.text = spec.text
+    if spec.texture is not None:
+        widget.texture = spec.texture
+    if spec.styles:
+        widget.styles = list(spec.styles)
+    if spec.classes:
+        widget.classes = spec.classes
+
+    if spec.children:
+        children = widget._children
+
+        for child_spec in spec.children:
+            child = build(child_spec)
+            child._parent = widget
+            children.append(child)
+
+    return widget
+
+
+def update(widget: Widget, spec: Spec):
+    '''Change a widget to match a spec, only what differs from it is set.'''
+    if widget._spec is spec:
+        return
+
+    widget._spec = spec
+
+    if widget.text != spec.text:
+        widget.text = spec.text
+
+    if widget._texture is not spec.texture:
+        widget.texture = spec.texture
+
+    if tuple(widget.styles) != spec.styles:
+        widget.styles = list(spec.styles)
+
+    if widget._classes != spec.classes:
+        widget.classes = spec.classes
+
+    if spec.children is not None:
+        reconcile(widget, spec.children)
+
+
+def reconcile(parent: Widget, specs: Sequence[Spec]):
+    '''Change the children of a widget to match specs, reusing children by key, or by order when they have none.
+
+    Children with a key or class that's no longer described are removed and freed.
+    The parent is only marked for layout when its children were added, removed or reordered.
+    '''
+    keyed: Dict[Any, Widget] = {}
+    unkeyed: List[Widget] = []
+
+    for child in parent._children:
+        key = child._spec.key if (child._spec is not None) else None
+
+        if key is None:
+            unkeyed.append(child)
+        else:
+            keyed[key] = child
+
+    children = []
+    seen = set()
+    position = 0
+
+    for spec in specs:
+        child = None
+
+        if spec.key is not None:
+            if spec.key in seen:
+                raise Exception(f'Duplicate key {spec.key!r} among siblings')
+            seen.add(spec.key)
+
+            child = keyed.pop(spec.key, None)
+
+        elif position < len(unkeyed):
+            child = unkeyed[position]
+            unkeyed[position] = None
+            position += 1
+
+        # A widget of another class can't show this spec.
+        if (child is not None) and (type(child) is not spec.cls):
+            keyed[object()] = child
+            child = None
+
+        if child is None:
+            child = build(spec)
+            child._parent = parent
+        else:
+            update(child, spec)
+
+        children.append(child)
+
+    if children == parent._children:
+        return
+
+    parent._children[:] = children
+    mark_dirty(parent)
+
+    for child in list(keyed.values()) + unkeyed:
+        if child is not None:
+            child._parent = None
+            child._hover = False
+            _free(child)
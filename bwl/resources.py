@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+from .backends import get_backend
+from .content import Font, Texture
+
+
+class _Entry:
+    '''Loaded resource with the number of its users and its size in bytes.'''
+    __slots__ = ('resource', 'key', 'count', 'size')
+
+    def __init__(self, resource: Union[Font, Texture], key: Tuple[str, str], size: int):
+        self.resource = resource
+        self.key = key
+        self.count = 0
+        self.size = size
+
+
+class ResourceManager:
+    '''Fonts and textures shared by every widget tree and operator that uses them, loaded once and freed when unused.
+
+    Files are found by a hash of their content, which is only computed again when the path, size or modification
+    time changed, so the same file under another path or a copy is loaded once. Every get counts a user and every
+    release uncounts one. Resources nobody uses are freed on a timer, outside of drawing, or by calling collect.
+    A resource that's used again before then is reused instead of loaded again.
+    '''
+
+    # Seconds to wait after a resource is unused before freeing it.
+    delay: float = 0
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._users: Dict[int, _Entry] = {}
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self._unused: List[_Entry] = []
+        self._scheduled = False
+
+    def font(self, path: Path) -> Font:
+        '''Get the font from a file, loaded once per content.'''
+        path = Path(path)
+        key = ('font', self._hash(path))
+        entry = self._entries.get(key)
+
+        if entry is None:
+            entry = self._add(Font(path), key, path.stat().st_size)
+
+        return self._use(entry)
+
+    def texture(self, path: Path) -> Texture:
+        '''Get the texture from an image file, loaded once per content.'''
+        path = Path(path)
+        key = ('texture', self._hash(path))
+        entry = self._entries.get(key)
+
+        if entry is None:
+            texture = Texture.from_file(path)
+            entry = self._add(texture, key, texture.width * texture.height * 4)
+
+        return self._use(entry)
+
+    def texture_from_buffer(self, name: str, buffer: bytes, width: int, height: int) -> Texture:
+        '''Get the texture from an encoded buffer, created once per content and size.'''
+        digest = hashlib.sha256(buffer)
+        digest.update(f'{width}x{height}'.encode())
+        key = ('buffer', digest.hexdigest())
+        entry = self._entries.get(key)
+
+        if entry is None:
+            entry = self._add(Texture.from_buffer(name, buffer, width, height), key, width * height * 4)
+
+        return self._use(entry)
+
+    def acquire(self, resource: Union[Font, Texture]) -> Union[Font, Texture]:
+        '''Count another user of a resource from this manager, like a tree that shares it with another.'''
+        return self._use(self._entry(resource))
+
+    def release(self, resource: Union[Font, Texture]):
+        '''Uncount a user of a resource, it's freed later when nobody uses it.'''
+        entry = self._entry(resource)
+
+        if entry.count <= 0:
+            raise Exception('Resource was released more often than it was used')
+
+        entry.count -= 1
+
+        if entry.count == 0:
+            self._unused.append(entry)
+
+            if not self._scheduled:
+                self._scheduled = True
+                get_backend().register_timer(self._collect, self.delay)
+
+    def collect(self) -> int:
+        '''Free the resources nobody uses, call this where nothing draws with them, return how many were freed.'''
+        unused = self._unused
+        self._unused = []
+        freed = 0
+
+        for entry in unused:
+            # Resources used again since they were released are kept.
+            if (entry.count == 0) and (self._entries.get(entry.key) is entry):
+                del self._entries[entry.key]
+                del self._users[id(entry.resource)]
+                entry.resource.remove()
+                freed += 1
+
+        return freed
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        '''Number of loaded fonts and textures, how many of those are unused, and their size in bytes.'''
+        entries = self._entries.values()
+        return {
+            'fonts': sum(1 for entry in entries if entry.key[0] == 'font'),
+            'textures': sum(1 for entry in entries if entry.key[0] != 'font'),
+            'unused': sum(1 for entry in entries if entry.count == 0),
+            'bytes': sum(entry.size for entry in entries),
+        }
+
+    def _hash(self, path: Path) -> str:
+        '''Hash of the content of a file, stored until the file changes.'''
+        status = path.stat()
+        key = (str(path.resolve()), status.st_size, status.st_mtime_ns)
+        digest = self._hashes.get(key)
+
+        if digest is None:
+            digest = self._hashes[key] = hashlib.sha256(path.read_bytes()).hexdigest()
+
+        return digest
+
+    def _add(self, resource: Union[Font, Texture], key: Tuple[str, str], size: int) -> _Entry:
+        entry = self._entries[key] = self._users[id(resource)] = _Entry(resource, key, size)
+        return entry
+
+    def _use(self, entry: _Entry) -> Union[Font, Texture]:
+        entry.count += 1
+        return entry.resource
+
+    def _entry(self, resource: Union[Font, Texture]) -> _Entry:
+        entry = self._users.get(id(resource))
+
+        if (entry is None) or (entry.resource is not resource):
+            raise Exception('Resource was not loaded by this manager')
+
+        return entry
+
+    def _collect(self) -> None:
+        self._scheduled = False
+        self.collect()
+        return None
+
+
+class _Managers:
+    '''Stored resource manager.'''
+    current: ResourceManager = None
+
+
+def get_resource_manager() -> ResourceManager:
+    '''Get the resource manager shared by everything in this session.'''
+    if _Managers.current is None:
+        _Managers.current = ResourceManager()
+
+    return _Managers.current
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from math import exp
+from typing import TYPE_CHECKING
+
+from .animation import animate
+from .backends import get_backend
+from .dirty import mark_moved
+from .layout import translate_children
+from .style import Direction, Display
+
+if TYPE_CHECKING:
+    from .widget import Widget
+
+
+class Scroller:
+    '''Scroll offset of a scroll widget, with smooth wheel scrolling, drag to scroll and flinging.'''
+    __slots__ = (
+        'widget',
+        'offset',
+        'target',
+        'velocity',
+        'dragging',
+        '_animating',
+        '_press_position',
+        '_press_offset',
+        '_last_offset',
+        '_last_time',
+    )
+
+    # Pixels per wheel step.
+    wheel_step: float = 40
+
+    # How fast smooth scrolling approaches its target, per second.
+    smoothing: float = 18
+
+    # Pixels the cursor must move before a press becomes a drag.
+    threshold: float = 10
+
+    # How fast flinging slows down, per second.
+    friction: float = 4
+
+    # Slowest fling in pixels per second, anything below stops.
+    min_velocity: float = 20
+
+    def __init__(self, widget: Widget):
+        self.widget = widget
+        self.offset: float = 0
+        self.target: float = 0
+        self.velocity: float = 0
+        self.dragging: bool = False
+
+        self._animating = False
+        self._press_position: float = None
+        self._press_offset: float = 0
+        self._last_offset: float = 0
+        self._last_time: float = 0
+
+    @property
+    def limit(self) -> float:
+        '''Largest offset, so content doesn't scroll past its end.'''
+        layout = self.widget._layout
+
+        if self.widget._style.direction is Direction.HORIZONTAL:
+            return max(0, layout.content.width - layout.inside.width)
+        else:
+            return max(0, layout.content.height - layout.inside.height)
+
+    def wheel(self, steps: float):
+        '''Scroll smoothly by a number of wheel steps, positive is towards the end.'''
+        self.velocity = 0
+        self.target = self._clamp(self.target + steps * self.wheel_step)
+        self._start()
+
+    def press(self, position: float):
+        '''Start a potential drag at a cursor position along the scroll axis.'''
+        self._press_position = position
+        self._press_offset = self.offset
+        self._last_offset = self.offset
+        self._last_time = get_backend().time()
+        self.velocity = 0
+        self.target = self.offset
+
+    def drag(self, position: float):
+        '''Move the cursor while pressed, scroll once it moved past the threshold.'''
+        if self._press_position is None:
+            return
+
+        delta = position - self._press_position
+
+        if not self.dragging:
+            if abs(delta) <= self.threshold:
+                return
+
+            # Start dragging from here, so the content doesn't jump by the threshold.
+            self.dragging = True
+            self._press_position = position
+            delta = 0
+
+        self.scroll_to(self._press_offset - delta)
+
+        # Track velocity for flinging on release.
+        now = get_backend().time()
+        elapsed = now - self._last_time
+
+        if elapsed > 0:
+            velocity = (self.offset - self._last_offset) / elapsed
+            self.velocity = velocity * 0.8 + self.velocity * 0.2
+            self._last_offset = self.offset
+            self._last_time = now
+
+    def release(self):
+        '''Stop dragging, fling if the cursor was still moving.'''
+        was_dragging = self.dragging
+        self.dragging = False
+        self._press_position = None
+
+        # A pause before release means no fling.
+        if was_dragging and (get_backend().time() - self._last_time < 0.1) and (abs(self.velocity) > self.min_velocity):
+            self._start()
+        else:
+            self.velocity = 0
+
+    def scroll_to(self, offset: float):
+        '''Jump to an offset without smoothing.'''
+        self.target = self._clamp(offset)
+        self._apply(self.target)
+
+    def fit(self):
+        '''Clamp the offset after the content or the widget changed size, without moving children.'''
+        self.offset = self._clamp(self.offset)
+        self.target = self._clamp(self.target)
+
+    def step(self, now: float) -> bool:
+        '''Advance smooth scrolling or flinging, return whether it's still moving.'''
+        elapsed = max(now - self._last_time, 0)
+        self._last_time = now
+
+        if self.dragging:
+            self._animating = False
+            return False
+
+        if self.velocity:
+            offset = self.offset + self.velocity * elapsed
+            self.velocity *= exp(-self.friction * elapsed)
+
+            # Stop at the ends and when slow enough.
+            if (offset != self._clamp(offset)) or (abs(self.velocity) < self.min_velocity):
+                self.velocity = 0
+
+            self.target = self._clamp(offset)
+            self._apply(self.target)
+
+        elif abs(self.target - self.offset) > 0.5:
+            self._apply(self.offset + (self.target - self.offset) * (1 - exp(-self.smoothing * elapsed)))
+
+        else:
+            self._apply(self.target)
+
+        self._animating = bool(self.velocity) or (self.offset != self.target)
+        return self._animating
+
+    def _clamp(self, offset: float) -> float:
+        return max(0, min(self.limit, offset))
+
+    def _start(self):
+        if not self._animating:
+            self._animating = True
+            self._last_time = get_backend().time()
+            animate(self.step)
+
+    def _apply(self, offset: float):
+        '''Set the offset and move the children, without computing layout.'''
+        delta = offset - self.offset
+        self.offset = offset
+
+        if not delta:
+            return
+
+        horizontal = self.widget._style.direction is Direction.HORIZONTAL
+        x, y = (-delta, 0) if horizontal else (0, -delta)
+        translate_children(self.widget, x, y)
+
+        # Grids also need other cells once these scroll out of view.
+        if self.widget._style.display is Display.GRID:
+            mark_moved(self.widget)
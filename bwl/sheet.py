@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, List, Tuple
+
+from .style import DEFAULT_STYLE, ComputedStyle, Style
+
+if TYPE_CHECKING:
+    from .widget import Widget
+
+
+class Rule:
+    '''Style applied to widgets that have all classes and states of a selector.'''
+    __slots__ = ('selector', 'classes', 'states', 'style', 'order')
+
+    def __init__(self, selector: str, style: Style, order: int):
+        self.selector = selector
+        self.classes: FrozenSet[str] = frozenset(re.findall(r'\.([\w-]+)', selector))
+        self.states: FrozenSet[str] = frozenset(re.findall(r':([\w-]+)', selector))
+        self.style = style
+        self.order = order
+
+        if re.sub(r'[.:][\w-]+', '', selector).strip():
+            raise Exception(f'Invalid selector: {selector}')
+
+    @property
+    def specificity(self) -> Tuple[int, int]:
+        '''More specific rules take precedence, then later rules.'''
+        return len(self.classes) + len(self.states), self.order
+
+
+class StyleSheet:
+    '''Styles shared by widgets through class names and states, like .item, .item:hover and .item.selected.
+
+    Rules are indexed by class, so a widget only checks rules for classes it has. Results are stored per
+    combination of classes and active states, so widgets that look the same share one computed style.
+    '''
+
+    def __init__(self, rules: Dict[str, Style] = None):
+        self._rules: List[Rule] = []
+        self._index: Dict[str, List[Rule]] = {}
+
+        # States that can be used in selectors, by name.
+        self._states: Dict[str, Callable[[Widget], bool]] = {
+            'hover': lambda widget: widget._hover,
+            'active': lambda widget: bool(widget._buttons),
+            'focus': lambda widget: widget.focused,
+        }
+
+        # Results per set of classes, and per set of classes and active states.
+        self._relevant: Dict[FrozenSet[str], Tuple[Tuple[str, Callable[[Widget], bool]], ...]] = {}
+        self._computed: Dict[Tuple[FrozenSet[str], FrozenSet[str]], ComputedStyle] = {}
+
+        if rules is not None:
+            for selector, style in rules.items():
+                self.add(selector, style)
+
+    def add(self, selector: str, style: Style):
+        '''Add a rule, selectors combine classes and states without spaces.'''
+        if style.criteria is not None:
+            raise Exception('Styles in a style sheet use selectors instead of criteria')
+
+        rule = Rule(selector, style, len(self._rules))
+
+        for state in rule.states:
+            if state not in self._states:
+                raise Exception(f'Unknown state :{state} in selector {selector}')
+
+        # Index by one class, the widget must have it for the rule to match. Rules without classes go under ''.
+        key = min(rule.classes) if rule.classes else ''
+        self._rules.append(rule)
+        self._index.setdefault(key, []).append(rule)
+        self._invalidate()
+
+    def add_state(self, name: str, predicate: Callable[[Widget], bool]):
+        '''Add a state that can be used in selectors as :name.'''
+        self._states[name] = predicate
+        self._invalidate()
+
+    def compute(self, widget: Widget) -> ComputedStyle:
+        '''Get the computed style for the classes and states of a widget.'''
+        classes = widget._classes
+        relevant = self._relevant.get(classes)
+
+        if relevant is None:
+            relevant = self._relevant_states(classes)
+
+        states = frozenset(name for name, predicate in relevant if predicate(widget))
+        key = (classes, states)
+        computed = self._computed.get(key)
+
+        if computed is None:
+            computed = self._match(classes, states)
+            self._computed[key] = computed
+
+        return computed
+
+    def _candidates(self, classes: FrozenSet[str]) -> List[Rule]:
+        rules = list(self._index.get('', ()))
+
+        for name in classes:
+            rules.extend(self._index.get(name, ()))
+
+        return [rule for rule in rules if rule.classes <= classes]
+
+    def _relevant_states(self, classes: FrozenSet[str]) -> Tuple[Tuple[str, Callable[[Widget], bool]], ...]:
+        names = set()
+
+        for rule in self._candidates(classes):
+            names.update(rule.states)
+
+        relevant = tuple((name, self._states[name]) for name in sorted(names))
+        self._relevant[classes] = relevant
+        return relevant
+
+    def _match(self, classes: FrozenSet[str], states: FrozenSet[str]) -> ComputedStyle:
+        rules = [rule for rule in self._candidates(classes) if rule.states <= states]
+        rules.sort(key=lambda rule: rule.specificity)
+        return ComputedStyle((DEFAULT_STYLE,) + tuple(rule.style for rule in rules))
+
+    def _invalidate(self):
+        self._relevant.clear()
+        self._computed.clear()
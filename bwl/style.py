@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 from enum import Enum, auto
-from typing import TYPE_CHECKING, Callable, Iterator, overload
-
-from bpy.types import Context
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Tuple, overload
+from weakref import WeakValueDictionary
 
+from .animation import Easing, Transition, transition_style
 from .content import Font
+from .dirty import restyle
 
 if TYPE_CHECKING:
+    from bpy.types import Context
+
+    from .sheet import StyleSheet
     from .widget import Widget
 
 
@@ -15,10 +19,18 @@ class Display(Enum):
     '''How to display the widget.'''
     STANDARD = auto()
     SCROLL = auto()
+    GRID = auto()
     FLOAT = auto()
     NONE = auto()
 
 
+class TextWrap(Enum):
+    '''How text fits the width of its widget.'''
+    NONE = auto()
+    WRAP = auto()
+    ELLIPSIS = auto()
+
+
 class Visibility(Enum):
     '''How a widget should be rendered.'''
     VISIBLE = auto()
@@ -38,8 +50,52 @@ class Align(Enum):
     END = auto()
 
 
-class Size:
+class Value:
+    '''Immutable value which is interned, so equal values share one instance and compare by identity.'''
+    __slots__ = ('__weakref__',)
+
+    # Names of the values, in constructor order.
+    _fields: Tuple[str, ...] = ()
+    _interned: WeakValueDictionary
+
+    def __init_subclass__(cls):
+        cls._interned = WeakValueDictionary()
+
+    @classmethod
+    def _intern(cls, values: tuple):
+        instance = cls._interned.get(values)
+
+        if instance is None:
+            instance = object.__new__(cls)
+            for name, value in zip(cls._fields, values):
+                object.__setattr__(instance, name, value)
+            cls._interned[values] = instance
+
+        return instance
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f'{type(self).__name__} is immutable, create a new one instead')
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f'{type(self).__name__} is immutable, create a new one instead')
+
+    def __reduce__(self):
+        return type(self), tuple(getattr(self, name) for name in self._fields)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo: dict):
+        return self
+
+    def copy(self):
+        return self
+
+
+class Size(Value):
     '''The size along an axis.'''
+    __slots__ = ('type', 'value')
+    _fields = __slots__
 
     class Type(Enum):
         '''How to calculate the size.'''
@@ -49,9 +105,8 @@ class Size:
         CHILDREN = auto()
         TEXTURE = auto()
 
-    def __init__(self, type: Type, value: float = None):
-        self.type = type
-        self.value = value
+    def __new__(cls, type: Type, value: float = None) -> Size:
+        return cls._intern((type, value))
 
     @classmethod
     def absolute(cls, pixels: float):
@@ -74,34 +129,37 @@ class Size:
         return cls(cls.Type.TEXTURE)
 
 
-class Sides:
+class Sides(Value):
     '''Values used for margin and padding.'''
+    __slots__ = ('top', 'right', 'bottom', 'left')
+    _fields = __slots__
 
     @overload
-    def __init__(self):
+    def __new__(cls) -> Sides:
         ...
 
     @overload
-    def __init__(self, value: float):
+    def __new__(cls, value: float) -> Sides:
         ...
 
     @overload
-    def __init__(self, vertical: float, horizontal: float):
+    def __new__(cls, vertical: float, horizontal: float) -> Sides:
         ...
 
     @overload
-    def __init__(self, top: float, horizontal: float, bottom: float):
+    def __new__(cls, top: float, horizontal: float, bottom: float) -> Sides:
         ...
 
     @overload
-    def __init__(self, top: float, right: float, bottom: float, left: float):
+    def __new__(cls, top: float, right: float, bottom: float, left: float) -> Sides:
         ...
 
-    def __init__(self, top: float = None, right: float = None, bottom: float = None, left: float = None):
-        self.top = top if (top is not None) else 0
-        self.right = right if (right is not None) else self.top
-        self.bottom = bottom if (bottom is not None) else self.top
-        self.left = left if (left is not None) else self.right
+    def __new__(cls, top: float = None, right: float = None, bottom: float = None, left: float = None) -> Sides:
+        top = top if (top is not None) else 0
+        right = right if (right is not None) else top
+        bottom = bottom if (bottom is not None) else top
+        left = left if (left is not None) else right
+        return cls._intern((top, right, bottom, left))
 
     @property
     def width(self) -> float:
@@ -113,50 +171,55 @@ class Sides:
         '''Sum of the top and bottom values.'''
         return self.top + self.bottom
 
-    def copy(self) -> Sides:
-        return Sides(self.top, self.right, self.bottom, self.left)
-
 
-class Corners:
+class Corners(Value):
     '''Values used for border radius.'''
+    __slots__ = ('top_left', 'bottom_left', 'top_right', 'bottom_right')
+    _fields = __slots__
 
     @overload
-    def __init__(self):
+    def __new__(cls) -> Corners:
         ...
 
     @overload
-    def __init__(self, value: float):
+    def __new__(cls, value: float) -> Corners:
         ...
 
     @overload
-    def __init__(self, top: float, bottom: float):
+    def __new__(cls, top: float, bottom: float) -> Corners:
         ...
 
     @overload
-    def __init__(self, top_left: float, bottom: float, top_right: float):
+    def __new__(cls, top_left: float, bottom: float, top_right: float) -> Corners:
         ...
 
     @overload
-    def __init__(self, top_left: float, bottom_left: float, top_right: float, bottom_right: float):
+    def __new__(cls, top_left: float, bottom_left: float, top_right: float, bottom_right: float) -> Corners:
         ...
 
-    def __init__(
-        self,
+    def __new__(
+        cls,
         top_left: float = None,
         bottom_left: float = None,
         top_right: float = None,
         bottom_right: float = None,
-    ):
-        self.top_left = top_left if (top_left is not None) else 0
-        self.bottom_left = bottom_left if (bottom_left is not None) else self.top_left
-        self.top_right = top_right if (top_right is not None) else self.top_left
-        self.bottom_right = bottom_right if (bottom_right is not None) else self.bottom_left
+    ) -> Corners:
+        top_left = top_left if (top_left is not None) else 0
+        bottom_left = bottom_left if (bottom_left is not None) else top_left
+        top_right = top_right if (top_right is not None) else top_left
+        bottom_right = bottom_right if (bottom_right is not None) else bottom_left
+        return cls._intern((top_left, bottom_left, top_right, bottom_right))
 
     def __iter__(self) -> Iterator[float]:
         return iter((self.top_left, self.bottom_left, self.top_right, self.bottom_right))
 
     def clamped(self, size: float) -> Corners:
         half_size = size / 2
+
+        # Most corners already fit, so avoid the lookup.
+        if max(self.top_left, self.bottom_left, self.top_right, self.bottom_right) <= half_size:
+            return self
+
         return Corners(
             min(half_size, self.top_left),
             min(half_size, self.bottom_left),
@@ -164,54 +227,81 @@ class Corners:
             min(half_size, self.bottom_right),
         )
 
-    def copy(self) -> Corners:
-        return Corners(self.top_left, self.bottom_left, self.top_right, self.bottom_right)
-
 
-class Color:
+class Color(Value):
     '''Color in float values including alpha.'''
+    __slots__ = ('red', 'green', 'blue', 'alpha')
+    _fields = __slots__
 
     @overload
-    def __init__(self):
+    def __new__(cls) -> Color:
         ...
 
     @overload
-    def __init__(self, gray: float):
+    def __new__(cls, gray: float) -> Color:
         ...
 
     @overload
-    def __init__(self, gray: float, alpha: float):
+    def __new__(cls, gray: float, alpha: float) -> Color:
         ...
 
     @overload
-    def __init__(self, red: float, green: float, blue: float):
+    def __new__(cls, red: float, green: float, blue: float) -> Color:
         ...
 
     @overload
-    def __init__(self, red: float, green: float, blue: float, alpha: float):
+    def __new__(cls, red: float, green: float, blue: float, alpha: float) -> Color:
         ...
 
-    def __init__(self, *args: float):
+    def __new__(cls, *args: float) -> Color:
         if len(args) == 0:
-            self.red, self.green, self.blue, self.alpha = (0, 0, 0, 1)
+            return cls._intern((0, 0, 0, 1))
         elif len(args) == 1:
-            self.red, self.green, self.blue, self.alpha = (args[0], args[0], args[0], 1)
+            return cls._intern((args[0], args[0], args[0], 1))
         elif len(args) == 2:
-            self.red, self.green, self.blue, self.alpha = (args[0], args[0], args[0], args[1])
+            return cls._intern((args[0], args[0], args[0], args[1]))
         elif len(args) == 3:
-            self.red, self.green, self.blue, self.alpha = (args[0], args[1], args[2], 1)
+            return cls._intern((args[0], args[1], args[2], 1))
         elif len(args) == 4:
-            self.red, self.green, self.blue, self.alpha = (args[0], args[1], args[2], args[3])
+            return cls._intern((args[0], args[1], args[2], args[3]))
+        raise TypeError('Color takes up to 4 values')
 
     def __iter__(self) -> Iterator[float]:
         return iter((self.red, self.green, self.blue, self.alpha))
 
-    def copy(self) -> Color:
-        return Color(self.red, self.green, self.blue, self.alpha)
-
 
 class Style:
-    '''Visual properties of a widget.'''
+    '''Visual properties of a widget, immutable so it can be shared, compared and hashed.'''
+    __slots__ = (
+        'criteria',
+        'display',
+        'visibility',
+        'direction',
+        'scroll',
+        'align_x',
+        'align_y',
+        'offset_x',
+        'offset_y',
+        'width',
+        'height',
+        'cell_width',
+        'cell_height',
+        'margin',
+        'padding',
+        'foreground_color',
+        'background_color',
+        'border_color',
+        'border_radius',
+        'border_thickness',
+        'font',
+        'font_size',
+        'text_wrap',
+        'transition',
+        '_hash',
+    )
+
+    # Names of the properties, in constructor order.
+    _fields: Tuple[str, ...] = __slots__[:-1]
 
     def __init__(
         self,
@@ -226,6 +316,8 @@ class Style:
         offset_y: float = None,
         width: Size = None,
         height: Size = None,
+        cell_width: Size = None,
+        cell_height: Size = None,
         margin: Sides = None,
         padding: Sides = None,
         foreground_color: Color = None,
@@ -235,36 +327,72 @@ class Style:
         border_thickness: float = None,
         font: Font = None,
         font_size: int = None,
+        text_wrap: TextWrap = None,
+        transition: Transition = None,
     ):
-        self.criteria = criteria
+        set = object.__setattr__
+
+        set(self, 'criteria', criteria)
+
+        set(self, 'display', display)
+        set(self, 'visibility', visibility)
+
+        set(self, 'direction', direction)
+        set(self, 'scroll', scroll)
+
+        set(self, 'align_x', align_x)
+        set(self, 'align_y', align_y)
 
-        self.display = display
-        self.visibility = visibility
+        set(self, 'offset_x', offset_x)
+        set(self, 'offset_y', offset_y)
 
-        self.direction = direction
-        self.scroll = scroll
+        set(self, 'width', width)
+        set(self, 'height', height)
 
-        self.align_x = align_x
-        self.align_y = align_y
+        set(self, 'cell_width', cell_width)
+        set(self, 'cell_height', cell_height)
 
-        self.offset_x = offset_x
-        self.offset_y = offset_y
+        set(self, 'margin', margin)
+        set(self, 'padding', padding)
 
-        self.width = width
-        self.height = height
+        set(self, 'foreground_color', foreground_color)
+        set(self, 'background_color', background_color)
+        set(self, 'border_color', border_color)
 
-        self.margin = margin
-        self.padding = padding
+        set(self, 'border_radius', border_radius)
+        set(self, 'border_thickness', border_thickness)
 
-        self.foreground_color = foreground_color
-        self.background_color = background_color
-        self.border_color = border_color
+        set(self, 'font', font)
+        set(self, 'font_size', font_size)
+        set(self, 'text_wrap', text_wrap)
 
-        self.border_radius = border_radius
-        self.border_thickness = border_thickness
+        set(self, 'transition', transition)
 
-        self.font = font
-        self.font_size = font_size
+        set(self, '_hash', None)
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f'Style is immutable, use style.replace({name}=...) instead')
+
+    def __delattr__(self, name: str):
+        raise AttributeError('Style is immutable, use style.replace() instead')
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Style):
+            return NotImplemented
+        return hash(self) == hash(other) and self._values() == other._values()
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            object.__setattr__(self, '_hash', hash(self._values()))
+        return self._hash
+
+    def __reduce__(self):
+        return Style, self._values()
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self._fields)
 
     def __add__(self, other: Style) -> Style:
         return Style(
@@ -279,6 +407,8 @@ class Style:
             offset_y=other.offset_y if (other.offset_y is not None) else self.offset_y,
             width=other.width if (other.width is not None) else self.width,
             height=other.height if (other.height is not None) else self.height,
+            cell_width=other.cell_width if (other.cell_width is not None) else self.cell_width,
+            cell_height=other.cell_height if (other.cell_height is not None) else self.cell_height,
             margin=other.margin if (other.margin is not None) else self.margin,
             padding=other.padding if (other.padding is not None) else self.padding,
             foreground_color=other.foreground_color if (other.foreground_color is not None) else self.foreground_color,
@@ -288,31 +418,18 @@ class Style:
             border_thickness=other.border_thickness if (other.border_thickness is not None) else self.border_thickness,
             font=other.font if (other.font is not None) else self.font,
             font_size=other.font_size if (other.font_size is not None) else self.font_size,
+            text_wrap=other.text_wrap if (other.text_wrap is not None) else self.text_wrap,
+            transition=other.transition if (other.transition is not None) else self.transition,
         )
 
+    def replace(self, **changes) -> Style:
+        '''Create a new style with some properties replaced, this is how styles are changed.'''
+        values = {name: getattr(self, name) for name in self._fields}
+        values.update(changes)
+        return Style(**values)
+
     def copy(self) -> Style:
-        return Style(
-            criteria=self.criteria,
-            display=self.display,
-            visibility=self.visibility,
-            direction=self.direction,
-            scroll=self.scroll,
-            align_x=self.align_x,
-            align_y=self.align_y,
-            offset_x=self.offset_x,
-            offset_y=self.offset_y,
-            width=self.width,
-            height=self.height,
-            margin=self.margin,
-            padding=self.padding,
-            foreground_color=self.foreground_color,
-            background_color=self.background_color,
-            border_color=self.border_color,
-            border_radius=self.border_radius,
-            border_thickness=self.border_thickness,
-            font=self.font,
-            font_size=self.font_size,
-        )
+        return self
 
 
 DEFAULT_STYLE = Style(
@@ -327,6 +444,8 @@ DEFAULT_STYLE = Style(
     offset_y=0,
     width=Size.children(),
     height=Size.children(),
+    cell_width=Size.absolute(100),
+    cell_height=Size.absolute(100),
     margin=Sides(0),
     padding=Sides(0),
     foreground_color=Color(1),
@@ -336,16 +455,89 @@ DEFAULT_STYLE = Style(
     border_thickness=0,
     font=Font(None),
     font_size=14,
+    text_wrap=TextWrap.NONE,
+    transition=None,
 )
 
 
-def compute_style(widget: Widget, context: Context):
-    '''Compute style for the given widget and its children.'''
-    widget._style = DEFAULT_STYLE
+class _Resolved:
+    '''Property of a computed style, resolved from its layers on first access and then stored on the instance.'''
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance: ComputedStyle, owner: type):
+        if instance is None:
+            return self
+
+        for layer in reversed(instance.layers):
+            value = getattr(layer, self.name)
+            if value is not None:
+                break
+
+        # The instance attribute shadows this descriptor from now on.
+        instance.__dict__[self.name] = value
+        return value
+
+
+class ComputedStyle:
+    '''View over layers of styles, each property is resolved when it's first used.'''
+
+    def __init__(self, layers: Tuple[Style, ...]):
+        # Later layers take precedence, the first layer must define every property.
+        self.layers = layers
+
+
+for _name in Style._fields:
+    setattr(ComputedStyle, _name, _Resolved(_name))
+
+
+class _ComputedStyles:
+    '''Stored computed styles, shared by widgets with the same layers.'''
+    table: Dict[Tuple[Style, ...], ComputedStyle] = {}
+    limit: int = 4096
+
+
+def resolve_style(layers: Tuple[Style, ...]) -> ComputedStyle:
+    '''Get the computed style for the given layers, reuse it if it exists.'''
+    computed = _ComputedStyles.table.get(layers)
+
+    if computed is None:
+        # Styles replaced every frame would otherwise pile up.
+        if len(_ComputedStyles.table) >= _ComputedStyles.limit:
+            _ComputedStyles.table.clear()
+
+        computed = ComputedStyle(layers)
+        _ComputedStyles.table[layers] = computed
+
+    return computed
+
+
+def compute_style(widget: Widget, context: Context, sheet: StyleSheet = None):
+    '''Compute style for the given widget and its children, using the nearest style sheet.'''
+    if widget.style_sheet is not None:
+        sheet = widget.style_sheet
+
+    # Styles on the widget itself override the style sheet.
+    layers = [style for style in widget.styles if (style.criteria is None) or style.criteria(widget, context)]
+
+    if sheet is None:
+        computed = resolve_style((DEFAULT_STYLE, *layers))
+    elif layers:
+        computed = resolve_style((*sheet.compute(widget).layers, *layers))
+    else:
+        computed = sheet.compute(widget)
+
+    # Animate changes, except for the first style a widget gets.
+    if (widget._animation is not None) or (
+        (computed is not widget._style) and (widget._style is not DEFAULT_STYLE) and (computed.transition is not None)
+    ):
+        computed = transition_style(widget, computed)
 
-    for style in widget.styles:
-        if style.criteria is None or style.criteria(widget, context):
-            widget._style += style
+    if computed is not widget._style:
+        restyle(widget, widget._style, computed)
+        widget._style = computed
 
     for child in widget._children:
-        compute_style(child, context)
+        compute_style(child, context, sheet)
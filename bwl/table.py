@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Tuple, Union
+
+from .dirty import mark_dirty
+from .grid import GridView
+from .style import Align, Color, Direction, Display, Sides, Size, Style, TextWrap
+from .widget import Widget, _free
+
+if TYPE_CHECKING:
+    from bpy.types import Context, Event
+
+    from .scroll import Scroller
+
+
+class Column:
+    '''Column of a table, with its title, width in pixels, and an optional key to sort its text by.'''
+    __slots__ = ('title', 'width', 'key', 'style')
+
+    def __init__(self, title: str, width: float = 100, key: Callable[[str], Any] = None):
+        self.title = title
+        self.width = width
+        self.key = key
+
+        # Shared by the header cell and every row cell of this column.
+        self.style = Style(width=Size.absolute(width))
+
+
+class Table(Widget):
+    '''Table with a header and rows of text from a data source, only the rows in view have widgets.
+
+    The source is called with a row index and column index, and returns the text of that cell.
+    Clicking a header sorts the rows by that column, dragging the edge of a header resizes its column.
+    The header stays in place while the rows scroll.
+    '''
+    __slots__ = ('source', '_columns', '_header', '_body', '_order', '_sort_column', '_sort_ascending')
+
+    # Height of a row in pixels.
+    row_height: float = 24
+
+    # Narrowest a column can be resized to.
+    min_column_width: float = 24
+
+    # Styles of the parts of a table, replace them on the class or on a subclass to theme tables.
+    header_style = Style(
+        direction=Direction.HORIZONTAL,
+        width=Size.flexible(),
+        height=Size.absolute(28),
+        background_color=Color(0.2),
+    )
+    header_cell_style = Style(
+        height=Size.flexible(),
+        padding=Sides(0, 6),
+        align_y=Align.CENTER,
+        foreground_color=Color(0.9),
+        background_color=Color(0.2),
+        text_wrap=TextWrap.ELLIPSIS,
+    )
+    body_style = Style(
+        display=Display.GRID,
+        width=Size.flexible(),
+        height=Size.flexible(),
+        cell_width=Size.relative(1),
+        background_color=Color(0.25),
+    )
+    row_style = Style(
+        direction=Direction.HORIZONTAL,
+        width=Size.flexible(),
+        height=Size.flexible(),
+        background_color=Color(0.25),
+    )
+    odd_row_style = Style(background_color=Color(0.28))
+    cell_style = Style(
+        height=Size.flexible(),
+        padding=Sides(0, 6),
+        align_y=Align.CENTER,
+        foreground_color=Color(0.85),
+        background_color=Color(0, 0),
+        text_wrap=TextWrap.ELLIPSIS,
+    )
+
+    def __init__(
+        self,
+        parent: Union[Widget, None] = None,
+        columns: Iterable[Column] = (),
+        rows: int = 0,
+        source: Callable[[int, int], str] = None,
+    ):
+        super().__init__(parent)
+        self.styles = [Style(direction=Direction.VERTICAL, width=Size.flexible(), height=Size.flexible())]
+        self.source = source
+
+        self._columns: Tuple[Column, ...] = ()
+        self._order: Union[List[int], None] = None
+        self._sort_column: Union[int, None] = None
+        self._sort_ascending = True
+
+        self._header = Widget(parent=self)
+        self._header.styles = [self.header_style]
+
+        self._body = _TableBody(self, rows)
+        self._body.styles = [self.body_style.replace(cell_height=Size.absolute(self.row_height))]
+
+        self.columns = columns
+
+    @property
+    def columns(self) -> Tuple[Column, ...]:
+        '''The columns of this table, setting them rebuilds the header and rows.'''
+        return self._columns
+
+    @columns.setter
+    def columns(self, columns: Iterable[Column]):
+        self._columns = tuple(columns)
+        self._sort_column = None
+        self._order = None
+
+        self._header.clear()
+        for index in range(len(self._columns)):
+            _HeaderCell(self, index)
+
+        self._body.clear()
+        self._update_titles()
+        mark_dirty(self)
+
+    @property
+    def rows(self) -> int:
+        '''Number of rows from the source.'''
+        return self._body.count
+
+    @rows.setter
+    def rows(self, rows: int):
+        self._body.count = rows
+        self._sort()
+
+    @property
+    def scroller(self) -> Scroller:
+        '''The scroll state of the rows.'''
+        return self._body.scroller
+
+    @property
+    def sort_column(self) -> Union[int, None]:
+        '''Index of the column rows are sorted by, or none if they're in source order.'''
+        return self._sort_column
+
+    @property
+    def sort_ascending(self) -> bool:
+        '''Whether rows are sorted in ascending order.'''
+        return self._sort_ascending
+
+    def sort(self, column: Union[int, None], ascending: bool = True):
+        '''Sort rows by the text in a column, or go back to source order with none.'''
+        self._sort_column = column
+        self._sort_ascending = ascending
+        self._sort()
+        self._update_titles()
+
+    def refresh(self):
+        '''Show changed data from the source, sorting again if sorted.'''
+        self._sort()
+
+    def resize_column(self, column: int, width: float):
+        '''Set the width of a column, the header and the rows in view follow.'''
+        width = max(self.min_column_width, width)
+        target = self._columns[column]
+        target.width = width
+        target.style = target.style.replace(width=Size.absolute(width))
+
+        self._header._children[column].styles[1] = target.style
+        for _, row in self._body.cells:
+            row._children[column].styles[1] = target.style
+
+    def source_row(self, row: int) -> int:
+        '''Source index of the row shown at the given position.'''
+        return self._order[row] if (self._order is not None) else row
+
+    def cell_text(self, row: int, column: int) -> str:
+        '''Text of a cell, from the source.'''
+        return self.source(row, column) if (self.source is not None) else ''
+
+    def _sort(self):
+        column = self._sort_column
+
+        if column is None:
+            self._order = None
+        else:
+            key = self._columns[column].key
+            text = self.cell_text
+
+            if key is None:
+                sort_key = lambda row: text(row, column)
+            else:
+                sort_key = lambda row: key(text(row, column))
+
+            self._order = sorted(range(self._body.count), key=sort_key, reverse=not self._sort_ascending)
+
+        self._body.refresh()
+
+    def _update_titles(self):
+        for index, (column, cell) in enumerate(zip(self._columns, self._header._children)):
+            if index == self._sort_column:
+                cell.text = f'{column.title} {"▲" if self._sort_ascending else "▼"}'
+            else:
+                cell.text = column.title
+
+
+class _TableBody(GridView):
+    '''Rows of a table, one grid line per row so only the rows in view have widgets.'''
+    __slots__ = ('table',)
+
+    def __init__(self, table: Table, rows: int):
+        super().__init__(table, rows)
+        self.table = table
+
+    def clear(self, free: bool = True):
+        '''Remove all rows, after the columns changed.'''
+        spare = self._free[:]
+        self._cells.clear()
+        self._free.clear()
+        super().clear(free)
+
+        # Rows out of view are already detached.
+        if free:
+            for row in spare:
+                _free(row)
+
+    def create_cell(self) -> Widget:
+        row = Widget()
+        row.styles = [self.table.row_style]
+
+        for column in self.table.columns:
+            cell = Widget(parent=row)
+            cell.styles = [self.table.cell_style, column.style]
+
+        return row
+
+    def update_cell(self, cell: Widget, index: int):
+        table = self.table
+        source = table.source_row(index)
+
+        cell.styles[1:] = [table.odd_row_style] if (index % 2) else []
+
+        for column, child in enumerate(cell._children):
+            child.styles[1] = table.columns[column].style
+            child.text = table.cell_text(source, column)
+
+
+class _HeaderCell(Widget):
+    '''Header of a column, sorts when clicked and resizes its column when its edge is dragged.'''
+    __slots__ = ('table', 'column', '_resize_x', '_resize_width')
+
+    # Pixels from the right edge where dragging resizes.
+    edge: float = 5
+
+    def __init__(self, table: Table, column: int):
+        super().__init__(table._header)
+        self.table = table
+        self.column = column
+        self.styles = [table.header_cell_style, table.columns[column].style]
+
+        self._resize_x: Union[float, None] = None
+        self._resize_width: float = 0
+
+    def on_mouse_press(self, context: Context, event: Event) -> bool:
+        if event.type == 'LEFTMOUSE':
+            border = self._layout.border
+            if event.mouse_region_x >= border.x + border.width - self.edge:
+                self._resize_x = event.mouse_region_x
+                self._resize_width = self.table.columns[self.column].width
+            return True
+        return False
+
+    def on_mouse_move(self, context: Context, event: Event) -> bool:
+        if self._resize_x is not None:
+            self.table.resize_column(self.column, self._resize_width + event.mouse_region_x - self._resize_x)
+            return True
+        return False
+
+    def on_mouse_release(self, context: Context, event: Event) -> bool:
+        if event.type == 'LEFTMOUSE':
+            if self._resize_x is not None:
+                self._resize_x = None
+            elif self.table.sort_column == self.column:
+                self.table.sort(self.column, not self.table.sort_ascending)
+            else:
+                self.table.sort(self.column)
+            return True
+        return False
+
+    def on_event(self, context: Context, event: Event) -> bool:
+        # Resizing ends on release even when the cursor left the header.
+        handled = super().on_event(context, event)
+        if (event.type == 'LEFTMOUSE') and (event.value == 'RELEASE') and (self._resize_x is not None):
+            self._resize_x = None
+            return True
+        return handled
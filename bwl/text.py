@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, List, Tuple
+
+from .backends import Backend, get_backend
+from .style import TextWrap
+
+# Distance between the tops of wrapped lines, as a factor of the font size.
+LINE_HEIGHT = 1.25
+
+# Shown at the end of text that was cut off.
+ELLIPSIS = '…'
+
+
+class Lines:
+    '''Text fitted to a width, as lines with their widths.'''
+    __slots__ = ('lines', 'widths', 'width', 'height', 'cap_height', 'line_height')
+
+    def __init__(self, lines: Tuple[str, ...], widths: Tuple[float, ...], cap_height: float, line_height: float):
+        self.lines = lines
+        self.widths = widths
+        self.width: float = max(widths, default=0)
+        self.height: float = cap_height + line_height * (len(lines) - 1)
+        self.cap_height = cap_height
+        self.line_height = line_height
+
+
+class _Text:
+    '''Stored text measurements, shared by all widgets and cleared when the backend changes.'''
+    backend: Backend = None
+    widths: Dict[Tuple[int, int, str], float] = {}
+    heights: Dict[Tuple[int, int], float] = {}
+    lines: Dict[Tuple[int, int, str, TextWrap, float], Lines] = {}
+    prefixes: Dict[Tuple[int, int, str], Tuple[float, ...]] = {}
+    limit: int = 65536
+
+
+def text_width(font_id: int, font_size: int, text: str) -> float:
+    '''Width of text on one line, measured once per font, size and text.'''
+    backend = _backend()
+    key = (font_id, font_size, text)
+    width = _Text.widths.get(key)
+
+    if width is None:
+        # Texts that change every frame would otherwise pile up.
+        if len(_Text.widths) >= _Text.limit:
+            _Text.widths.clear()
+
+        width = _Text.widths[key] = backend.text_dimensions(font_id, font_size, text)[0]
+
+    return width
+
+
+def prefix_widths(font_id: int, font_size: int, text: str) -> Tuple[float, ...]:
+    '''Widths of every prefix of text from the empty one, summed from character widths once per text.'''
+    _backend()
+    key = (font_id, font_size, text)
+    widths = _Text.prefixes.get(key)
+
+    if widths is None:
+        if len(_Text.prefixes) >= _Text.limit:
+            _Text.prefixes.clear()
+
+        # Characters repeat across texts, so their widths are mostly cached already.
+        characters = (text_width(font_id, font_size, character) for character in text)
+        widths = _Text.prefixes[key] = tuple(accumulate(characters, initial=0))
+
+    return widths
+
+
+def text_height(font_id: int, font_size: int) -> float:
+    '''Height of a line of text, measured once per font and size.'''
+    backend = _backend()
+    key = (font_id, font_size)
+    height = _Text.heights.get(key)
+
+    if height is None:
+        # Get height from capital A because it looks better.
+        height = _Text.heights[key] = backend.text_dimensions(font_id, font_size, 'A')[1]
+
+    return height
+
+
+def fit_text(font_id: int, font_size: int, text: str, wrap: TextWrap, width: float) -> Lines:
+    '''Break text into lines or cut it off to fit a width, once per text, font, size, mode and width.'''
+    # Text on one line doesn't depend on the width.
+    if wrap is TextWrap.NONE:
+        width = None
+
+    _backend()
+    key = (font_id, font_size, text, wrap, width)
+    lines = _Text.lines.get(key)
+
+    if lines is None:
+        if len(_Text.lines) >= _Text.limit:
+            _Text.lines.clear()
+
+        if wrap is TextWrap.WRAP:
+            parts = _wrap(font_id, font_size, text, width)
+        elif wrap is TextWrap.ELLIPSIS:
+            parts = [_ellipsize(font_id, font_size, text, width)]
+        else:
+            parts = [text]
+
+        widths = tuple(text_width(font_id, font_size, part) for part in parts)
+        height = text_height(font_id, font_size)
+        lines = _Text.lines[key] = Lines(tuple(parts), widths, height, font_size * LINE_HEIGHT)
+
+    return lines
+
+
+def _backend() -> Backend:
+    '''The current backend, measurements from another backend are forgotten.'''
+    backend = get_backend()
+
+    if backend is not _Text.backend:
+        _Text.backend = backend
+        _Text.widths.clear()
+        _Text.heights.clear()
+        _Text.lines.clear()
+        _Text.prefixes.clear()
+
+    return backend
+
+
+def _wrap(font_id: int, font_size: int, text: str, width: float) -> List[str]:
+    '''Break text at spaces and newlines into lines no wider than width, words that don't fit are broken.'''
+    space = text_width(font_id, font_size, ' ')
+    lines = []
+
+    for paragraph in text.split('\n'):
+        line = ''
+        line_width = 0
+
+        for word in paragraph.split(' '):
+            word_width = text_width(font_id, font_size, word)
+
+            # Add words to the line while they fit, measured per word so they're cached across texts.
+            if line and (line_width + space + word_width <= width):
+                line = f'{line} {word}'
+                line_width += space + word_width
+                continue
+
+            if line:
+                lines.append(line)
+
+            # Words longer than a whole line are broken where they stop fitting, searching their prefix widths.
+            if (word_width > width) and (len(word) > 1):
+                offsets = prefix_widths(font_id, font_size, word)
+                start = 0
+
+                while (offsets[-1] - offsets[start] > width) and (len(word) - start > 1):
+                    end = max(start + 1, bisect_right(offsets, offsets[start] + width) - 1)
+                    lines.append(word[start:end])
+                    start = end
+
+                word = word[start:]
+                word_width = text_width(font_id, font_size, word)
+
+            line = word
+            line_width = word_width
+
+        lines.append(line)
+
+    return lines
+
+
+def _ellipsize(font_id: int, font_size: int, text: str, width: float) -> str:
+    '''Cut text off with an ellipsis where it stops fitting, or keep it if it fits.'''
+    if text_width(font_id, font_size, text) <= width:
+        return text
+
+    count = _fitting(font_id, font_size, text, width, ELLIPSIS)
+    return text[:count].rstrip() + ELLIPSIS
+
+
+def _fitting(font_id: int, font_size: int, text: str, width: float, suffix: str = '') -> int:
+    '''Length of the longest prefix that fits in width with the suffix, by binary search over prefix widths.'''
+    if suffix:
+        width -= text_width(font_id, font_size, suffix)
+
+    return max(bisect_right(prefix_widths(font_id, font_size, text), width) - 1, 0)
@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, List, Tuple, Union
+
+from .backends import get_backend
+from .style import Align, Color, Corners, Sides, Size, Style
+from .text import LINE_HEIGHT, text_height, text_width
+from .widget import Widget
+
+if TYPE_CHECKING:
+    from bpy.types import Context, Event
+
+    from .backends import Backend
+
+
+class _GapBuffer:
+    '''Text stored as the characters before and after a gap, so editing at the gap doesn't copy the rest.'''
+    __slots__ = ('before', 'after')
+
+    def __init__(self, text: str = ''):
+        self.before: List[str] = list(text)
+
+        # Reversed, so the character right after the gap is last.
+        self.after: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.before) + len(self.after)
+
+    def __str__(self) -> str:
+        return self.slice(0, len(self))
+
+    def move(self, index: int):
+        '''Move the gap to an index, only the characters in between are moved.'''
+        before = self.before
+        after = self.after
+
+        if index < len(before):
+            moved = before[index:]
+            del before[index:]
+            moved.reverse()
+            after.extend(moved)
+        elif index > len(before):
+            count = index - len(before)
+            moved = after[-count:]
+            del after[-count:]
+            moved.reverse()
+            before.extend(moved)
+
+    def replace(self, start: int, stop: int, text: str):
+        '''Replace the characters from start to stop with text.'''
+        self.move(stop)
+        del self.before[start:]
+        self.before.extend(text)
+
+    def slice(self, start: int, stop: int) -> str:
+        '''The characters from start to stop.'''
+        before = self.before
+        after = self.after
+        split = len(before)
+
+        if stop <= split:
+            return ''.join(before[start:stop])
+
+        end = len(after)
+        tail = after[end - (stop - split):end - max(0, start - split)]
+        tail.reverse()
+
+        if start >= split:
+            return ''.join(tail)
+        return ''.join(before[start:]) + ''.join(tail)
+
+
+class TextInput(Widget):
+    '''Single line text field, click it to focus it and type.
+
+    The text is kept in a gap buffer, and the x offset of each caret position is measured once from the widths
+    of the characters before it. An edit only forgets the offsets after it, and those are measured again as far
+    as they're needed to draw the characters in view. Editing doesn't compute layout, only the text in view is drawn.
+    '''
+    __slots__ = ('_buffer', '_caret', '_anchor', '_offsets', '_font', '_scroll')
+
+    # Width of the caret in pixels.
+    caret_width: float = 1
+
+    # Color behind selected text.
+    selection_color = Color(0.25, 0.45, 0.65)
+
+    # Styles of a text input, replace them on the class or on a subclass to theme text inputs.
+    input_style = Style(
+        width=Size.flexible(),
+        height=Size.absolute(24),
+        padding=Sides(0, 4),
+        align_y=Align.CENTER,
+        foreground_color=Color(0.9),
+        background_color=Color(0.15),
+        border_color=Color(0.3),
+        border_radius=Corners(3),
+        border_thickness=1,
+    )
+    focused_style = Style(
+        criteria=lambda widget, context: widget.focused,
+        border_color=Color(0.45, 0.65, 0.85),
+    )
+
+    def __init__(self, parent: Union[Widget, None] = None, text: str = ''):
+        super().__init__(parent)
+        self.styles = [self.input_style, self.focused_style]
+
+        self._buffer = _GapBuffer()
+        self._caret = 0
+        self._anchor = 0
+
+        # Caret offsets measured so far, for the font they were measured with.
+        self._offsets: List[float] = [0]
+        self._font: Tuple[int, int] = None
+
+        # Pixels of text scrolled out of view on the left.
+        self._scroll: float = 0
+
+        self.text = text
+
+    @property
+    def text(self) -> str:
+        '''The text in this input, setting it puts the caret at the end.'''
+        return str(self._buffer)
+
+    @text.setter
+    def text(self, text: str):
+        self._buffer = _GapBuffer(_single_line(text))
+        self._offsets = [0]
+        self._scroll = 0
+        self._move(len(self._buffer), False)
+
+    @property
+    def caret(self) -> int:
+        '''Index of the caret, setting it clears the selection.'''
+        return self._caret
+
+    @caret.setter
+    def caret(self, caret: int):
+        self._move(caret, False)
+
+    @property
+    def selection(self) -> Tuple[int, int]:
+        '''Start and stop index of the selected text, equal when nothing is selected.'''
+        return min(self._anchor, self._caret), max(self._anchor, self._caret)
+
+    @property
+    def selected_text(self) -> str:
+        '''The selected text.'''
+        return self._buffer.slice(*self.selection)
+
+    def select(self, start: int, stop: int):
+        '''Select the text from start to stop, the caret goes to stop.'''
+        self._move(start, False)
+        self._move(stop, True)
+
+    def select_all(self):
+        '''Select all text.'''
+        self.select(0, len(self._buffer))
+
+    def insert(self, text: str):
+        '''Replace the selection with text, or insert it at the caret.'''
+        start, stop = self.selection
+        text = _single_line(text)
+        self._replace(start, stop, text)
+        self._move(start + len(text), False)
+
+    def caret_x(self, index: int) -> float:
+        '''Distance from the start of the text to a caret position, measured up to there if it wasn't yet.'''
+        offsets = self._measured()
+
+        if len(offsets) <= index:
+            style = self._style
+            x = offsets[-1]
+
+            for character in self._buffer.slice(len(offsets) - 1, index):
+                x += text_width(style.font.id, style.font_size, character)
+                offsets.append(x)
+
+        return offsets[index]
+
+    def index_at(self, x: float) -> int:
+        '''Caret position closest to a distance from the start of the text.'''
+        offsets = self._measure_to(x)
+        index = bisect_left(offsets, x)
+
+        if index >= len(offsets):
+            return len(offsets) - 1
+        if (index > 0) and (x - offsets[index - 1] < offsets[index] - x):
+            return index - 1
+        return index
+
+    def on_change(self, context: Context):
+        '''Called after the text was edited by typing, deleting, cutting or pasting.'''
+        pass
+
+    def on_confirm(self, context: Context):
+        '''Called when enter is pressed, focus is taken away after.'''
+        pass
+
+    def draw(self, backend: Backend, area_height: float):
+        style = self._style
+        inside = self._layout.inside
+        left = self._scroll
+        right = left + inside.width
+
+        # The caret and selection are as tall as a line, aligned like the text.
+        line_height = style.font_size * LINE_HEIGHT
+        cap_height = text_height(style.font.id, style.font_size)
+        line_y = inside.y + (inside.height - line_height) * _ALIGN[style.align_y]
+        text_y = line_y + (line_height - cap_height) / 2
+
+        focused = self.focused
+        start, stop = self.selection
+
+        if focused and (start != stop):
+            x0 = max(left, self.caret_x(start))
+            x1 = min(right, self.caret_x(stop))
+
+            if x1 > x0:
+                backend.draw_rect(
+                    x=inside.x + x0 - left,
+                    y=area_height - line_y - line_height,
+                    width=x1 - x0,
+                    height=line_height,
+                    color=self.selection_color,
+                    border_color=self.selection_color,
+                    border_radius=Corners(0),
+                    border_thickness=0,
+                )
+
+        # Only characters that fit entirely are drawn, the text isn't clipped.
+        offsets = self._measure_to(right)
+        first = bisect_left(offsets, left)
+        last = bisect_right(offsets, right) - 1
+
+        if first < last:
+            backend.draw_text(
+                font_id=style.font.id,
+                font_size=style.font_size,
+                color=style.foreground_color,
+                x=inside.x + offsets[first] - left,
+                y=area_height - text_y - cap_height,
+                text=self._buffer.slice(first, last),
+            )
+
+        if focused:
+            backend.draw_rect(
+                x=inside.x + self.caret_x(self._caret) - left,
+                y=area_height - line_y - line_height,
+                width=self.caret_width,
+                height=line_height,
+                color=style.foreground_color,
+                border_color=style.foreground_color,
+                border_radius=Corners(0),
+                border_thickness=0,
+            )
+
+    def on_mouse_press(self, context: Context, event: Event) -> bool:
+        if event.type == 'LEFTMOUSE':
+            self.focus()
+            self._move(self._index_at_mouse(event), event.shift)
+            return True
+        return False
+
+    def on_mouse_move(self, context: Context, event: Event) -> bool:
+        if 'LEFTMOUSE' in self._buttons:
+            self._move(self._index_at_mouse(event), True)
+            return True
+        return False
+
+    def on_key_press(self, context: Context, event: Event) -> bool:
+        if not self.focused:
+            return False
+
+        key = event.type
+        start, stop = self.selection
+
+        if key in ('LEFT_ARROW', 'RIGHT_ARROW'):
+            step = -1 if (key == 'LEFT_ARROW') else 1
+
+            if event.ctrl:
+                index = self._word(self._caret, step)
+            elif (start != stop) and not event.shift:
+                index = start if (step < 0) else stop
+            else:
+                index = self._caret + step
+
+            self._move(index, event.shift)
+
+        elif key == 'HOME':
+            self._move(0, event.shift)
+
+        elif key == 'END':
+            self._move(len(self._buffer), event.shift)
+
+        elif key in ('BACK_SPACE', 'DEL'):
+            if start == stop:
+                step = -1 if (key == 'BACK_SPACE') else 1
+                index = self._word(self._caret, step) if event.ctrl else self._caret + step
+                index = max(0, min(len(self._buffer), index))
+                start, stop = min(index, self._caret), max(index, self._caret)
+
+            if start != stop:
+                self._replace(start, stop, '')
+                self._move(start, False)
+                self.on_change(context)
+
+        elif event.ctrl and (key == 'A'):
+            self.select_all()
+
+        elif event.ctrl and (key in ('C', 'X')):
+            if start != stop:
+                get_backend().set_clipboard(context, self.selected_text)
+
+                if key == 'X':
+                    self.insert('')
+                    self.on_change(context)
+
+        elif event.ctrl and (key == 'V'):
+            self.insert(get_backend().get_clipboard(context))
+            self.on_change(context)
+
+        elif key in ('RET', 'NUMPAD_ENTER'):
+            self.on_confirm(context)
+            self.unfocus()
+
+        elif key == 'ESC':
+            self.unfocus()
+
+        elif event.unicode and event.unicode.isprintable() and not event.ctrl:
+            self.insert(event.unicode)
+            self.on_change(context)
+
+        else:
+            return False
+
+        return True
+
+    def _measured(self) -> List[float]:
+        '''Offsets measured so far, forgotten when the font changed.'''
+        font = (self._style.font.id, self._style.font_size)
+
+        if font != self._font:
+            self._font = font
+            self._offsets = [0]
+
+        return self._offsets
+
+    def _measure_to(self, x: float) -> List[float]:
+        '''Measure offsets in steps until one is past x or all are measured.'''
+        offsets = self._measured()
+        length = len(self._buffer)
+
+        while (offsets[-1] <= x) and (len(offsets) <= length):
+            self.caret_x(min(length, len(offsets) + 63))
+
+        return offsets
+
+    def _replace(self, start: int, stop: int, text: str):
+        self._buffer.replace(start, stop, text)
+
+        # Offsets before the edit are still valid.
+        del self._measured()[start + 1:]
+
+    def _move(self, index: int, extend: bool):
+        '''Move the caret, extending the selection or clearing it, and scroll to keep the caret in view.'''
+        self._caret = max(0, min(len(self._buffer), index))
+        if not extend:
+            self._anchor = self._caret
+
+        # Before the first layout there's no width to keep the caret in.
+        width = self._layout.inside.width - self.caret_width
+        if width <= 0:
+            return
+
+        x = self.caret_x(self._caret)
+        if x < self._scroll:
+            self._scroll = x
+        elif x > self._scroll + width:
+            self._scroll = max(0, x - width)
+
+    def _word(self, index: int, step: int) -> int:
+        '''Caret position at the start of the previous word or the end of the next word.'''
+        if step < 0:
+            before = self._buffer.slice(0, index).rstrip()
+            return before.rfind(' ') + 1
+
+        after = self._buffer.slice(index, len(self._buffer))
+        rest = after.lstrip()
+        end = rest.find(' ')
+        return index + len(after) - len(rest) + (end if (end >= 0) else len(rest))
+
+    def _index_at_mouse(self, event: Event) -> int:
+        return self.index_at(event.mouse_region_x - self._layout.inside.x + self._scroll)
+
+
+# Where alignment puts the remaining space.
+_ALIGN = {Align.START: 0.0, Align.CENTER: 0.5, Align.END: 1.0}
+
+
+def _single_line(text: str) -> str:
+    '''Text with line breaks replaced by spaces.'''
+    return text.replace('\r\n', ' ').replace('\n', ' ').replace('\r', ' ')
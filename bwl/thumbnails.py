@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import struct
+import time
+import weakref
+import zlib
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Deque, Dict, Tuple, Union
+
+from .backends import get_backend
+from .content import Texture
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+if TYPE_CHECKING:
+    from .widget import Widget
+
+
+class _Load:
+    '''Image file being decoded, with the widgets waiting for it.'''
+    __slots__ = ('path', 'future', 'widgets')
+
+    def __init__(self, path: str, future: Future):
+        self.path = path
+        self.future = future
+        self.widgets: weakref.WeakSet[Widget] = weakref.WeakSet()
+
+
+class ThumbnailLoader:
+    '''Loads image files as small textures in the background, for galleries of many files.
+
+    Files are decoded and scaled down on a thread pool, widgets show a placeholder texture meanwhile.
+    Decoded thumbnails are uploaded on a timer, a few per tick within a time budget, so drawing stays smooth.
+    Cancel the load of a widget when it leaves the view, like in GridView.release_cell, loading another file
+    into the same widget cancels its previous load. Textures are kept per file until the loader is cleared.
+    Without Pillow, PNG files are decoded with numpy, which holds the GIL for rows with average or paeth filters
+    in between its steps, give it a process pool to keep those off the main thread entirely.
+    '''
+
+    # Longest side of thumbnails in pixels.
+    size: int = 128
+
+    # Seconds spent uploading per timer tick, at least one thumbnail is uploaded per tick.
+    budget: float = 0.004
+
+    # Seconds between timer ticks while files are loading.
+    interval: float = 1 / 60
+
+    # Threads of the pool made when no executor is given.
+    workers: int = 4
+
+    # Color of the placeholder made when no placeholder is given.
+    placeholder_color: Tuple[float, float, float, float] = (0.5, 0.5, 0.5, 0.25)
+
+    def __init__(self, placeholder: Union[Texture, None] = None, executor: Union[Executor, None] = None):
+        self._placeholder = placeholder
+        self._own_placeholder = placeholder is None
+        self._executor = executor
+        self._own_executor = executor is None
+
+        self._textures: Dict[str, Texture] = {}
+        self._loads: Dict[str, _Load] = {}
+        self._waiting: weakref.WeakKeyDictionary[Widget, _Load] = weakref.WeakKeyDictionary()
+
+        # Appended to by pool threads and taken from by the timer, a deque is safe for that.
+        self._done: Deque[_Load] = deque()
+        self._scheduled = False
+
+    @property
+    def placeholder(self) -> Texture:
+        '''Texture widgets show while their file loads.'''
+        if self._placeholder is None:
+            pixels = struct.pack('4f', *self.placeholder_color)
+            self._placeholder = Texture.from_pixels('placeholder', pixels, 1, 1)
+
+        return self._placeholder
+
+    @property
+    def pending(self) -> int:
+        '''Number of files being decoded or waiting to be uploaded.'''
+        return len(self._loads)
+
+    def load(self, widget: Widget, path: Path):
+        '''Show a thumbnail of an image file as the texture of a widget, the placeholder until it's loaded.'''
+        key = str(path)
+        load = self._waiting.get(widget)
+
+        if (load is not None) and (load.path == key):
+            return
+
+        self.cancel(widget)
+        texture = self._textures.get(key)
+
+        if texture is not None:
+            widget.texture = texture
+            return
+
+        widget.texture = self.placeholder
+        load = self._loads.get(key)
+
+        # Widgets showing the same file share one decode.
+        if load is None:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='bwl-thumbnails')
+
+            load = self._loads[key] = _Load(key, self._executor.submit(decode_thumbnail, Path(path), self.size))
+            load.future.add_done_callback(lambda _, load=load: self._done.append(load))
+
+        load.widgets.add(widget)
+        self._waiting[widget] = load
+
+        if not self._scheduled:
+            self._scheduled = True
+            get_backend().register_timer(self._upload, 0)
+
+    def cancel(self, widget: Widget):
+        '''Stop loading a file for a widget, the decode is cancelled when no other widget waits for it.'''
+        load = self._waiting.pop(widget, None)
+
+        if load is not None:
+            load.widgets.discard(widget)
+
+            if not load.widgets:
+                load.future.cancel()
+                del self._loads[load.path]
+
+    def texture(self, path: Path) -> Union[Texture, None]:
+        '''The loaded thumbnail of a file, or none if it isn't loaded.'''
+        return self._textures.get(str(path))
+
+    def clear(self):
+        '''Cancel all loads and free all thumbnails, widgets that show them should no longer be drawn.'''
+        for load in self._loads.values():
+            load.future.cancel()
+
+        self._loads.clear()
+        self._waiting.clear()
+        self._done.clear()
+
+        for texture in self._textures.values():
+            texture.remove()
+        self._textures.clear()
+
+        if self._own_placeholder and (self._placeholder is not None):
+            self._placeholder.remove()
+            self._placeholder = None
+
+        if self._own_executor and (self._executor is not None):
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def on_error(self, widget: Widget, path: Path, error: Exception):
+        '''Called when a file can't be loaded, the widget keeps the placeholder.'''
+        pass
+
+    def _upload(self) -> Union[float, None]:
+        start = time.perf_counter()
+        first = True
+
+        while self._done and (first or (time.perf_counter() - start < self.budget)):
+            load = self._done.popleft()
+
+            # Cancelled loads, or ones replaced by a later load of the same file, are dropped.
+            if self._loads.get(load.path) is not load:
+                continue
+
+            del self._loads[load.path]
+            widgets = list(load.widgets)
+
+            for widget in widgets:
+                del self._waiting[widget]
+
+            error = load.future.exception()
+            if error is not None:
+                for widget in widgets:
+                    self.on_error(widget, Path(load.path), error)
+                first = False
+                continue
+
+            pixels, width, height = load.future.result()
+            texture = self._textures[load.path] = Texture.from_pixels(Path(load.path).name, pixels, width, height)
+
+            for widget in widgets:
+                widget.texture = texture
+
+            first = False
+
+        if self._loads:
+            return self.interval
+
+        self._scheduled = False
+        return None
+
+
+def decode_thumbnail(path: Path, size: int) -> Tuple[np.ndarray, int, int]:
+    '''Decode an image file scaled down to fit in a square, safe to call from any thread or process.
+
+    Return RGBA float pixels with the bottom row first, and the width and height.
+    Pillow is used when it's installed, otherwise only PNG files can be decoded.
+    '''
+    if np is None:
+        raise Exception('Decoding thumbnails needs NumPy')
+
+    if PILImage is not None:
+        with PILImage.open(path) as image:
+            image.draft('RGB', (size, size))
+            image.thumbnail((size, size))
+            pixels = np.asarray(image.convert('RGBA'), dtype=np.float32) / 255
+    else:
+        pixels = _downscale(_decode_png(Path(path).read_bytes()), size)
+
+    pixels = np.ascontiguousarray(pixels[::-1])
+    return pixels, pixels.shape[1], pixels.shape[0]
+
+
+def _downscale(pixels: np.ndarray, size: int) -> np.ndarray:
+    '''Average pixels in boxes so the longest side is size, when it's larger.'''
+    height, width = pixels.shape[:2]
+    scale = size / max(width, height)
+
+    if scale >= 1:
+        return pixels
+
+    for axis, length in ((0, height), (1, width)):
+        target = max(round(length * scale), 1)
+        starts = (np.arange(target) * length) // target
+        counts = np.diff(np.append(starts, length)).astype(np.float32)
+        shape = (-1, 1, 1) if axis == 0 else (1, -1, 1)
+        pixels = np.add.reduceat(pixels, starts, axis=axis) / counts.reshape(shape)
+
+    return pixels
+
+
+# Channels per color type of a PNG file.
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def _decode_png(data: bytes) -> np.ndarray:
+    '''RGBA float pixels of a PNG file with the top row first, 8 or 16 bits per channel and not interlaced.'''
+    if data[:8] != b'\x89PNG\r\n\x1a\n':
+        raise Exception('Not a PNG file')
+
+    chunks = []
+    palette = transparency = None
+    position = 8
+
+    while position < len(data):
+        length, kind = struct.unpack('>I4s', data[position:position + 8])
+        content = data[position + 8:position + 8 + length]
+        position += length + 12
+
+        if kind == b'IHDR':
+            width, height, depth, color, _, _, interlace = struct.unpack('>IIBBBBB', content)
+        elif kind == b'PLTE':
+            palette = np.frombuffer(content, np.uint8).reshape(-1, 3)
+        elif kind == b'tRNS':
+            transparency = content
+        elif kind == b'IDAT':
+            chunks.append(content)
+        elif kind == b'IEND':
+            break
+
+    if (depth not in (8, 16)) or (color not in _PNG_CHANNELS) or interlace:
+        raise Exception('Unsupported PNG file')
+
+    channels = _PNG_CHANNELS[color]
+    pixel_size = channels * depth // 8
+    rows = _unfilter(zlib.decompress(b''.join(chunks)), height, width * pixel_size, pixel_size)
+
+    if color == 3:
+        colors = np.full((256, 4), 255, dtype=np.uint8)
+        colors[:len(palette), :3] = palette
+        if transparency is not None:
+            colors[:len(transparency), 3] = np.frombuffer(transparency, np.uint8)
+        return colors[rows.reshape(height, width)].astype(np.float32) / 255
+
+    if depth == 16:
+        values = rows.view('>u2').reshape(height, width, channels).astype(np.float32) / 65535
+    else:
+        values = rows.reshape(height, width, channels).astype(np.float32) / 255
+
+    pixels = np.ones((height, width, 4), dtype=np.float32)
+    if channels <= 2:
+        pixels[..., :3] = values[..., :1]
+    else:
+        pixels[..., :3] = values[..., :3]
+    if channels in (2, 4):
+        pixels[..., 3] = values[..., -1]
+
+    return pixels
+
+
+def _unfilter(data: bytes, height: int, stride: int, pixel_size: int) -> np.ndarray:
+    '''Bytes of PNG scanlines with their filters undone, one row per scanline.'''
+    lines = np.frombuffer(data, np.uint8)[:height * (stride + 1)].reshape(height, stride + 1)
+    kinds = lines[:, 0]
+
+    if kinds.max(initial=0) > 4:
+        raise Exception('Unsupported PNG filter')
+
+    # Average and paeth depend on the byte to the left, so they can't be done with whole rows.
+    if np.any(kinds >= 3):
+        return _unfilter_diagonals(lines, height, stride // pixel_size, pixel_size)
+
+    rows = np.empty((height, stride), dtype=np.uint8)
+    prior = np.zeros(stride, dtype=np.uint8)
+
+    for y in range(height):
+        kind = kinds[y]
+        line = lines[y, 1:]
+
+        if kind == 0:
+            rows[y] = line
+        elif kind == 1:
+            rows[y] = np.cumsum(line.reshape(-1, pixel_size), axis=0, dtype=np.uint8).reshape(-1)
+        else:
+            rows[y] = line + prior
+
+        prior = rows[y]
+
+    return rows
+
+
+def _unfilter_diagonals(lines: np.ndarray, height: int, width: int, pixel_size: int) -> np.ndarray:
+    '''Undo filters of any kind one diagonal of pixels at a time, from the top left.
+
+    A pixel only depends on the pixels left, above and above left of it, which are all on earlier diagonals.
+    Pixels are stored skewed so each diagonal is a column, with a zero row above and zero pixels left of each row.
+    '''
+    ys = np.arange(height)[:, None]
+    columns = ys + np.arange(width)[None, :] + 2
+
+    filtered = np.zeros((height, height + width + 1, pixel_size), dtype=np.int16)
+    filtered[ys, columns] = lines[:, 1:].reshape(height, width, pixel_size)
+
+    skewed = np.zeros((height + 1, height + width + 1, pixel_size), dtype=np.int16)
+    kinds = lines[:, 0, None]
+    sub, up, average, paeth = kinds == 1, kinds == 2, kinds == 3, kinds == 4
+
+    for diagonal in range(height + width - 1):
+        first = max(0, diagonal - width + 1)
+        last = min(height, diagonal + 1)
+        column = diagonal + 2
+
+        left = skewed[first + 1:last + 1, column - 1]
+        above = skewed[first:last, column - 1]
+        corner = skewed[first:last, column - 2]
+
+        distance_left = np.abs(above - corner)
+        distance_above = np.abs(left - corner)
+        distance_corner = np.abs(left + above - corner - corner)
+        nearest = np.where(
+            (distance_left <= distance_above) & (distance_left <= distance_corner),
+            left,
+            np.where(distance_above <= distance_corner, above, corner),
+        )
+
+        rows = slice(first, last)
+        predictor = np.where(sub[rows], left, 0)
+        predictor += np.where(up[rows], above, 0)
+        predictor += np.where(average[rows], (left + above) >> 1, 0)
+        predictor += np.where(paeth[rows], nearest, 0)
+
+        skewed[first + 1:last + 1, column] = (filtered[rows, column] + predictor) & 255
+
+    return skewed[ys + 1, columns].astype(np.uint8).reshape(height, width * pixel_size)
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Sequence, Set, Tuple, Union
+
+from .grid import GridView
+from .style import Align, Color, Direction, Display, Sides, Size, Style, TextWrap
+from .widget import Widget
+
+if TYPE_CHECKING:
+    from bpy.types import Context, Event
+
+
+class _Node:
+    '''Item in a tree view, its children are asked for when it's first expanded.'''
+    __slots__ = ('item', 'depth', 'expanded', 'children')
+
+    def __init__(self, item: Any, depth: int):
+        self.item = item
+        self.depth = depth
+        self.expanded = False
+        self.children: Union[List[_Node], None] = None
+
+
+class TreeView(GridView):
+    '''Tree of items from a children callback, only expanded nodes ask for children and only rows in view have widgets.
+
+    The visible nodes are kept as a flat list of rows, expanding or collapsing a node only inserts or removes its rows.
+    The label callback gives the text of an item, has_children tells whether to show an expander without asking
+    for the children. By default nodes show an expander until they're expanded and turn out to have no children.
+    '''
+    __slots__ = ('children_of', 'label', 'has_children', '_roots', '_rows', '_selected', '_guide_style', '_expander_style')
+
+    # Pixels per level of depth, sets the width of expanders and the margin of guides.
+    indent: float = 16
+
+    # Height of a row in pixels.
+    row_height: float = 22
+
+    # Styles of the parts of a tree view, replace them on the class or on a subclass to theme tree views.
+    tree_style = Style(
+        display=Display.GRID,
+        width=Size.flexible(),
+        height=Size.flexible(),
+        cell_width=Size.relative(1),
+        background_color=Color(0.25),
+    )
+    row_style = Style(
+        direction=Direction.HORIZONTAL,
+        width=Size.flexible(),
+        height=Size.flexible(),
+        background_color=Color(0, 0),
+    )
+    selected_row_style = Style(background_color=Color(0.25, 0.45, 0.65))
+    guide_style = Style(
+        width=Size.absolute(1),
+        height=Size.flexible(),
+        background_color=Color(0.4),
+    )
+    expander_style = Style(
+        height=Size.flexible(),
+        align_x=Align.CENTER,
+        align_y=Align.CENTER,
+        foreground_color=Color(0.7),
+        background_color=Color(0, 0),
+    )
+    label_style = Style(
+        width=Size.flexible(),
+        height=Size.flexible(),
+        padding=Sides(0, 4),
+        align_y=Align.CENTER,
+        foreground_color=Color(0.85),
+        background_color=Color(0, 0),
+        text_wrap=TextWrap.ELLIPSIS,
+    )
+
+    def __init__(
+        self,
+        parent: Union[Widget, None] = None,
+        roots: Iterable[Any] = (),
+        children: Callable[[Any], Sequence[Any]] = None,
+        label: Callable[[Any], str] = str,
+        has_children: Callable[[Any], bool] = None,
+    ):
+        super().__init__(parent)
+        self.styles = [self.tree_style.replace(cell_height=Size.absolute(self.row_height))]
+        indent = self.indent
+        self._guide_style = self.guide_style.replace(margin=Sides(0, indent - 1 - indent // 2, 0, indent // 2))
+        self._expander_style = self.expander_style.replace(width=Size.absolute(indent))
+        self.children_of = children
+        self.label = label
+        self.has_children = has_children
+
+        self._roots: List[_Node] = []
+        self._rows: List[_Node] = []
+        self._selected: Set[_Node] = set()
+
+        self.roots = roots
+
+    @property
+    def roots(self) -> Tuple[Any, ...]:
+        '''The top level items, setting them collapses everything.'''
+        return tuple(node.item for node in self._roots)
+
+    @roots.setter
+    def roots(self, roots: Iterable[Any]):
+        self._roots = [_Node(item, 0) for item in roots]
+        self._rows = self._roots[:]
+        self._selected.clear()
+        self.count = len(self._rows)
+        self.refresh()
+
+    @property
+    def rows(self) -> Tuple[Any, ...]:
+        '''The items of the visible rows, in order.'''
+        return tuple(node.item for node in self._rows)
+
+    @property
+    def selection(self) -> Tuple[Any, ...]:
+        '''The selected items, in row order where visible.'''
+        return tuple(node.item for node in self._rows if node in self._selected)
+
+    def item(self, row: int) -> Any:
+        '''The item shown in a row.'''
+        return self._rows[row].item
+
+    def is_expanded(self, row: int) -> bool:
+        '''Whether the node in a row is expanded.'''
+        return self._rows[row].expanded
+
+    def expand(self, row: int):
+        '''Show the children of the node in a row, and their expanded descendants.'''
+        node = self._rows[row]
+        if node.expanded:
+            return
+
+        if not self._materialize(node):
+            # Hide the expander of a node that turned out to be a leaf.
+            self.refresh()
+            return
+
+        node.expanded = True
+        self._rows[row + 1:row + 1] = self._descendants(node)
+        self._changed()
+
+    def collapse(self, row: int):
+        '''Hide the descendants of the node in a row, they stay materialized and keep their expansion.'''
+        node = self._rows[row]
+        if not node.expanded:
+            return
+
+        node.expanded = False
+        end = row + 1
+        while (end < len(self._rows)) and (self._rows[end].depth > node.depth):
+            end += 1
+
+        del self._rows[row + 1:end]
+        self._changed()
+
+    def toggle(self, row: int):
+        '''Expand the node in a row if it's collapsed, collapse it otherwise.'''
+        if self._rows[row].expanded:
+            self.collapse(row)
+        else:
+            self.expand(row)
+
+    def select(self, row: int, extend: bool = False):
+        '''Select the node in a row, toggling it without clearing the others when extending.'''
+        node = self._rows[row]
+
+        if extend:
+            self._selected ^= {node}
+        else:
+            self._selected = {node}
+
+        self.refresh()
+
+    def reload(self):
+        '''Forget all children that were asked for, and collapse everything.'''
+        self.roots = [node.item for node in self._roots]
+
+    def create_cell(self) -> Widget:
+        row = _TreeRow(self)
+        row.styles = [self.row_style]
+
+        expander = _Expander(self, row)
+        expander.styles = [self._expander_style]
+
+        label = Widget(parent=row)
+        label.styles = [self.label_style]
+
+        return row
+
+    def update_cell(self, cell: _TreeRow, index: int):
+        node = self._rows[index]
+        cell.index = index
+        cell.styles[1:] = [self.selected_row_style] if (node in self._selected) else []
+
+        # Rows reused at another depth show or hide guides, and only create them when deeper than before.
+        for level in range(len(cell._children) - 2, node.depth):
+            guide = Widget()
+            guide.styles = [self._guide_style]
+            cell.insert(level, guide)
+
+        for level, guide in enumerate(cell._children[:-2]):
+            guide.styles[1:] = [] if (level < node.depth) else [_HIDDEN]
+
+        expander, label = cell._children[-2:]
+        if self._expandable(node):
+            expander.text = '▾' if node.expanded else '▸'
+        else:
+            expander.text = None
+        label.text = self.label(node.item)
+
+    def _materialize(self, node: _Node) -> List[_Node]:
+        '''Children of a node, asked for once.'''
+        if node.children is None:
+            items = self.children_of(node.item) if (self.children_of is not None) else ()
+            node.children = [_Node(item, node.depth + 1) for item in items]
+        return node.children
+
+    def _expandable(self, node: _Node) -> bool:
+        '''Whether to show an expander, without asking for the children of nodes that weren't expanded.'''
+        if node.children is None:
+            return self.has_children(node.item) if (self.has_children is not None) else True
+        return bool(node.children)
+
+    def _descendants(self, node: _Node) -> List[_Node]:
+        '''Rows under an expanded node.'''
+        rows = []
+        for child in self._materialize(node):
+            rows.append(child)
+            if child.expanded:
+                rows.extend(self._descendants(child))
+        return rows
+
+    def _changed(self):
+        # Rows after the change moved, so the rows in view show other nodes.
+        self.count = len(self._rows)
+        self.refresh()
+
+
+# Hides guides deeper than the node of a reused row.
+_HIDDEN = Style(display=Display.NONE)
+
+
+class _TreeRow(Widget):
+    '''Row of a tree view, selects its node when clicked.'''
+    __slots__ = ('tree', 'index')
+
+    def __init__(self, tree: TreeView):
+        super().__init__()
+        self.tree = tree
+        self.index = 0
+
+    def on_mouse_release(self, context: Context, event: Event) -> bool:
+        if (event.type == 'LEFTMOUSE') and not self.tree.scroller.dragging:
+            self.tree.select(self.index, extend=event.ctrl)
+            return True
+        return False
+
+
+class _Expander(Widget):
+    '''Arrow in front of a node with children, expands or collapses it when clicked.'''
+    __slots__ = ('tree', 'row')
+
+    def __init__(self, tree: TreeView, row: _TreeRow):
+        super().__init__(row)
+        self.tree = tree
+        self.row = row
+
+    def on_mouse_release(self, context: Context, event: Event) -> bool:
+        if (event.type == 'LEFTMOUSE') and (self.text is not None) and not self.tree.scroller.dragging:
+            self.tree.toggle(self.row.index)
+            return True
+        return False
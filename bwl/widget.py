@@ -1,36 +1,120 @@
 from __future__ import annotations
 
-from typing import List, Set, Tuple, Union
-
-from bpy.types import Context, Event
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, Iterator, List, Sequence, Tuple, Union, overload
 
+from .animation import stop_animation
+from .backends import Backend, get_backend
 from .content import Texture
+from .dirty import mark_dirty, mark_text
 from .event import is_keyboard, is_mouse, is_move, is_scroll
 from .layout import Layout, compute_layout
 from .render import compile_shaders, render_widget
-from .style import DEFAULT_STYLE, Display, Style, compute_style
+from .scroll import Scroller
+from .style import DEFAULT_STYLE, ComputedStyle, Direction, Display, Size, Style, compute_style
+
+if TYPE_CHECKING:
+    from bpy.types import Context, Event
+
+    from .reconcile import Spec
+    from .sheet import StyleSheet
+
+# Frozen sets are replaced on change, so widgets without any share one empty set.
+_EMPTY: FrozenSet[str] = frozenset()
+_class_sets: Dict[FrozenSet[str], FrozenSet[str]] = {_EMPTY: _EMPTY}
+
+
+class _Focus:
+    '''Stored focus, the widget which gets keyboard events wherever the cursor is, until a press outside it.'''
+    widget: Union[Widget, None] = None
+
+
+class ChildView(Sequence):
+    '''Read-only view of the children of a widget, it follows changes instead of copying them.'''
+    __slots__ = ('_children',)
+
+    def __init__(self, children: List[Widget]):
+        self._children = children
+
+    @overload
+    def __getitem__(self, index: int) -> Widget:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Tuple[Widget, ...]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Widget, Tuple[Widget, ...]]:
+        if isinstance(index, slice):
+            return tuple(self._children[index])
+        return self._children[index]
+
+    def __len__(self) -> int:
+        return len(self._children)
+
+    def __iter__(self) -> Iterator[Widget]:
+        return iter(self._children)
+
+    def __reversed__(self) -> Iterator[Widget]:
+        return reversed(self._children)
+
+    def __contains__(self, widget: Widget) -> bool:
+        return any(child is widget for child in self._children)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (ChildView, tuple, list)):
+            return len(self) == len(other) and all(a is b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'ChildView({self._children!r})'
 
 
 class Widget:
     '''Widget which can render and handle events.'''
+    __slots__ = (
+        '_parent',
+        '_children',
+        '_style',
+        '_layout',
+        '_hover',
+        '_buttons',
+        '_keys',
+        '_classes',
+        '_animation',
+        '_scroller',
+        'style_sheet',
+        'styles',
+        '_texture',
+        '_text',
+        '_spec',
+        '__weakref__',
+    )
 
     def __init__(self, parent: Union[Widget, None] = None):
         if parent is not None:
             parent._children.append(self)
+            mark_dirty(parent)
 
         self._parent: Union[Widget, None] = parent
         self._children: List[Widget] = []
 
-        self._style: Style = DEFAULT_STYLE
+        self._style: Union[Style, ComputedStyle] = DEFAULT_STYLE
         self._layout: Layout = Layout()
+        self._animation = None
+        self._scroller: Union[Scroller, None] = None
 
         self._hover: bool = False
-        self._buttons: Set[str] = set()
-        self._keys: Set[str] = set()
+        self._buttons: FrozenSet[str] = _EMPTY
+        self._keys: FrozenSet[str] = _EMPTY
 
+        self._classes: FrozenSet[str] = _EMPTY
+        self.style_sheet: Union[StyleSheet, None] = None
         self.styles: List[Style] = []
-        self.texture: Union[Texture, None] = None
-        self.text: Union[str, None] = None
+        self._texture: Union[Texture, None] = None
+        self._text: Union[str, None] = None
+
+        # Description this widget was last reconciled with, which holds its key.
+        self._spec: Union[Spec, None] = None
 
     @property
     def parent(self) -> Union[Widget, None]:
@@ -38,14 +122,123 @@ class Widget:
         return self._parent
 
     @property
-    def siblings(self) -> Tuple[Widget, ...]:
+    def siblings(self) -> Sequence[Widget]:
         '''This widget and its siblings.'''
         return self.parent.children if (self.parent is not None) else (self,)
 
     @property
-    def children(self) -> Tuple[Widget, ...]:
-        '''The children of this widget.'''
-        return tuple(self._children)
+    def children(self) -> ChildView:
+        '''The children of this widget, as a read-only view.'''
+        return ChildView(self._children)
+
+    def insert(self, index: int, child: Widget):
+        '''Add a child at an index, taking it from its parent if it has one.'''
+        ancestor = self
+        while ancestor is not None:
+            if ancestor is child:
+                raise Exception('A widget can not be added to itself or its descendants')
+            ancestor = ancestor._parent
+
+        if child._parent is not None:
+            child._parent._detach(child)
+
+        self._children.insert(index, child)
+        child._parent = self
+
+        # Marks the child too, its layout was computed for another place.
+        mark_dirty(child)
+
+    def append(self, child: Widget):
+        '''Add a child after the others, taking it from its parent if it has one.'''
+        self.insert(len(self._children), child)
+
+    def remove(self, child: Widget, free: bool = True):
+        '''Remove a child, it and its descendants are freed unless they will be added again.'''
+        self._detach(child)
+
+        if free:
+            _free(child)
+
+    def move(self, child: Widget, index: int):
+        '''Move a child to another index among its siblings.'''
+        if child._parent is not self:
+            raise Exception('Widget is not a child of this widget')
+
+        self._children.remove(child)
+        self._children.insert(index, child)
+        mark_dirty(self)
+
+    def clear(self, free: bool = True):
+        '''Remove all children, they and their descendants are freed unless they will be added again.'''
+        children = self._children[:]
+        self._children.clear()
+        mark_dirty(self)
+
+        for child in children:
+            child._parent = None
+            child._hover = False
+            _leave(child)
+
+            if free:
+                _free(child)
+
+    def on_free(self):
+        '''Called when this widget was removed for good, override to free resources like textures.'''
+        pass
+
+    def _detach(self, child: Widget):
+        '''Take a child out of this widget, only the ancestors that contained it need layout.'''
+        if child._parent is not self:
+            raise Exception('Widget is not a child of this widget')
+
+        self._children.remove(child)
+        child._parent = None
+        child._hover = False
+        _leave(child)
+        mark_dirty(self)
+
+    @property
+    def text(self) -> Union[str, None]:
+        '''Text drawn inside this widget.'''
+        return self._text
+
+    @text.setter
+    def text(self, text: Union[str, None]):
+        if text != self._text:
+            self._text = text
+            mark_text(self)
+
+    @property
+    def texture(self) -> Union[Texture, None]:
+        '''Texture drawn as the background of this widget.'''
+        return self._texture
+
+    @texture.setter
+    def texture(self, texture: Union[Texture, None]):
+        if texture is not self._texture:
+            self._texture = texture
+
+            # Only widgets sized by their texture need layout.
+            if Size.Type.TEXTURE in (self._style.width.type, self._style.height.type):
+                mark_dirty(self)
+
+    @property
+    def classes(self) -> FrozenSet[str]:
+        '''Class names used to match rules in the style sheet.'''
+        return self._classes
+
+    @classes.setter
+    def classes(self, classes: Iterable[str]):
+        # Widgets with the same classes share one set, there are few distinct combinations.
+        classes = frozenset(classes)
+        self._classes = _class_sets.setdefault(classes, classes)
+
+    @property
+    def scroller(self) -> Scroller:
+        '''The scroll state of this widget, used when its display is scroll.'''
+        if self._scroller is None:
+            self._scroller = Scroller(self)
+        return self._scroller
 
     @property
     def hover(self) -> bool:
@@ -53,14 +246,28 @@ class Widget:
         return self._hover
 
     @property
-    def buttons(self) -> Set[str]:
+    def focused(self) -> bool:
+        '''Whether this widget has keyboard focus.'''
+        return _Focus.widget is self
+
+    def focus(self):
+        '''Give keyboard focus to this widget, taking it from the widget that had it.'''
+        _Focus.widget = self
+
+    def unfocus(self):
+        '''Take keyboard focus from this widget, if it has it.'''
+        if _Focus.widget is self:
+            _Focus.widget = None
+
+    @property
+    def buttons(self) -> FrozenSet[str]:
         '''The mouse buttons that are pressed on this widget.'''
-        return self._buttons.copy()
+        return self._buttons
 
     @property
-    def keys(self) -> Set[str]:
+    def keys(self) -> FrozenSet[str]:
         '''The keyboard keys that are pressed on this widget.'''
-        return self._keys.copy()
+        return self._keys
 
     def compute(self, context: Context):
         '''Compute style and layout of this widget and its children.'''
@@ -77,48 +284,98 @@ class Widget:
         if self._style.display is Display.NONE:
             return False
 
+        # Pressing outside the focused widget and its children takes focus away, whichever widget handles the press.
+        if (self._parent is None) and is_mouse(event) and (event.value == 'PRESS'):
+            focused = _Focus.widget
+            if (focused is not None) and not focused._layout.under_mouse(context, event):
+                focused.unfocus()
+
         for child in reversed(self._children):
             if child.handle(context, event):
                 return True
 
         return self.on_event(context, event)
 
+    def grid_count(self) -> int:
+        '''Number of cells when display is grid, one per shown child.'''
+        return sum(1 for child in self._children if child._style.display is not Display.NONE)
+
+    def grid_cells(self, context: Context, start: int, stop: int) -> Iterable[Tuple[int, Widget]]:
+        '''Index and widget of the cells to lay out when display is grid, the cells from start to stop are in view.
+
+        All shown children are given, so their layouts stay valid. Override to only give the cells in view.
+        '''
+        return enumerate(child for child in self._children if child._style.display is not Display.NONE)
+
     def on_event(self, context: Context, event: Event) -> bool:
         '''Called on all events, delegates to more specific methods.'''
+        # Scroll widgets scroll by themselves, after giving the specific methods a chance.
+        scroll = self._style.display in (Display.SCROLL, Display.GRID)
+
         if is_move(event):
             self._hover = self._layout.under_mouse(context, event)
+            if scroll and ('LEFTMOUSE' in self._buttons):
+                self.scroller.drag(self._scroll_position(context, event))
+                return self.on_mouse_move(context, event) or self.scroller.dragging
             return self.on_mouse_move(context, event)
 
         elif is_mouse(event):
             if event.value == 'PRESS':
                 if self._hover:
-                    self._buttons.add(event.type)
+                    self._buttons = self._buttons | {event.type}
+                    if scroll and (event.type == 'LEFTMOUSE'):
+                        self.scroller.press(self._scroll_position(context, event))
+                        self.on_mouse_press(context, event)
+                        return True
                     return self.on_mouse_press(context, event)
 
             elif event.value == 'RELEASE':
                 if event.type in self._buttons:
-                    self._buttons.remove(event.type)
+                    self._buttons = self._buttons - {event.type}
+                    if scroll and (event.type == 'LEFTMOUSE'):
+                        self.scroller.release()
                     if self._hover:
                         return self.on_mouse_release(context, event)
 
         elif is_scroll(event):
             if self._hover:
-                return self.on_mouse_scroll(context, event)
+                if self.on_mouse_scroll(context, event):
+                    return True
+                if scroll:
+                    self.scroller.wheel(-1 if event.type in ('WHEELUPMOUSE', 'WHEELINMOUSE') else 1)
+                    return True
 
         elif is_keyboard(event):
+            # The focused widget gets keys wherever the cursor is.
+            focused = _Focus.widget is self
+
             if event.value == 'PRESS':
-                if self._hover:
-                    self._keys.add(event.type)
+                if self._hover or focused:
+                    self._keys = self._keys | {event.type}
                     return self.on_key_press(context, event)
 
             elif event.value == 'RELEASE':
                 if event.type in self._keys:
-                    self._keys.remove(event.type)
-                    if self._hover:
+                    self._keys = self._keys - {event.type}
+                    if self._hover or focused:
                         return self.on_key_release(context, event)
 
         return False
 
+    def _scroll_position(self, context: Context, event: Event) -> float:
+        '''Cursor position along the scroll axis.'''
+        if self._style.direction is Direction.HORIZONTAL:
+            return event.mouse_region_x
+        else:
+            return get_backend().area_size(context)[1] - event.mouse_region_y
+
+    def draw(self, backend: Backend, area_height: float):
+        '''Called after drawing the background and text of this widget, override to draw more.
+
+        Coordinates given to the backend are in framebuffer space, where Y is area height minus layout Y.
+        '''
+        pass
+
     def on_mouse_move(self, context: Context, event: Event) -> bool:
         '''Called on mouse move events.'''
         return False
@@ -136,9 +393,28 @@ class Widget:
         return False
 
     def on_key_press(self, context: Context, event: Event) -> bool:
-        '''Called on key press events inside this widget.'''
+        '''Called on key press events inside this widget, or anywhere when it has focus.'''
         return False
 
     def on_key_release(self, context: Context, event: Event) -> bool:
-        '''Called on key release events inside this widget, if the key was pressed inside this widget.'''
+        '''Called on key release events inside this widget or when it has focus, if the key was pressed on it.'''
         return False
+
+
+def _leave(widget: Widget):
+    '''Stop transitions and take focus from a widget that left the tree and its descendants, so nothing keeps them.'''
+    for child in widget._children:
+        _leave(child)
+
+    stop_animation(widget)
+    widget.unfocus()
+
+
+def _free(widget: Widget):
+    '''Let a removed widget and its descendants free their resources, descendants first.'''
+    for child in widget._children:
+        _free(child)
+
+    stop_animation(widget)
+    widget.unfocus()
+    widget.on_free()
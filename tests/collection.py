@@ -0,0 +1,14 @@
+'''Pytest plugin which collects the repository root as a plain folder, it's the Blender add-on and imports bpy.'''
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+
+
+def pytest_collect_directory(path: Path, parent: pytest.Collector):
+    if path == ROOT:
+        return pytest.Dir.from_parent(parent, path=path)
+    return None
@@ -0,0 +1,61 @@
+'''Tests for the Blender Widget Library, run with `python -m pytest` from the repository root.'''
+from __future__ import annotations
+
+import shutil
+import struct
+import zlib
+from pathlib import Path
+
+import pytest
+
+from bwl.animation import _Animations
+from bwl.backends import set_backend
+from bwl.backends.headless import Context, HeadlessBackend
+from bwl.document import _Documents
+from bwl.resources import _Managers
+from bwl.widget import _Focus
+
+RESOURCES = Path(__file__).parent.parent.joinpath('resources')
+
+
+@pytest.fixture(autouse=True)
+def backend() -> HeadlessBackend:
+    '''Fresh headless backend and stored state for every test, so tests don't see each other's widgets.'''
+    backend = HeadlessBackend()
+    set_backend(backend)
+
+    _Animations.widgets.clear()
+    _Animations.animators.clear()
+    _Animations.running = False
+    _Focus.widget = None
+    _Managers.current = None
+    _Documents.compiled.clear()
+    _Documents.decoded.clear()
+    _Documents.users.clear()
+
+    yield backend
+    set_backend(None)
+
+
+@pytest.fixture
+def context() -> Context:
+    return Context(800, 600)
+
+
+def write_png(path: Path, width: int, height: int, color: bytes = b'\xff\xff\xff\xff'):
+    '''Write a PNG file of one color, the images in resources may only be Git LFS pointers.'''
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)
+    data = zlib.compress((b'\x00' + color * width) * height)
+    path.write_bytes(b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', data) + chunk(b'IEND', b''))
+
+
+@pytest.fixture
+def resources(tmp_path: Path) -> Path:
+    '''Folder with a copy of the example font and two images.'''
+    shutil.copy(RESOURCES.joinpath('roboto.ttf'), tmp_path.joinpath('roboto.ttf'))
+    write_png(tmp_path.joinpath('blender.png'), 32, 32)
+    write_png(tmp_path.joinpath('cross.png'), 16, 16, b'\xff\x00\x00\xff')
+    return tmp_path
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+
+from bwl.animation import Easing, Transition, _Animations, ease, is_animating
+from bwl.style import Color, Size, Style
+from bwl.widget import Widget
+
+
+def fading(parent: Widget = None, transition: Transition = Transition(1.0, Easing.LINEAR)) -> Widget:
+    '''Widget which fades from black to white on hover.'''
+    widget = Widget(parent)
+    widget.styles = [
+        Style(width=Size.absolute(10), background_color=Color(0, 0, 0, 1), transition=transition),
+        Style(width=Size.absolute(20), background_color=Color(1, 1, 1, 1), criteria=lambda widget, context: widget._hover),
+    ]
+    return widget
+
+
+@pytest.mark.parametrize('easing', list(Easing))
+def test_ease_ends(easing):
+    assert ease(easing, 0) == pytest.approx(0)
+    assert ease(easing, 1) == pytest.approx(1)
+
+
+def test_first_style_is_not_animated(context):
+    widget = fading()
+    widget._hover = True
+    widget.compute(context)
+
+    assert widget._style.background_color == Color(1, 1, 1, 1)
+    assert not is_animating()
+
+
+def test_transition(backend, context):
+    widget = fading()
+    widget.compute(context)
+    widget._hover = True
+    widget.compute(context)
+    assert _Animations.widgets == {widget}
+
+    backend.advance(0.5)
+    assert widget._style.background_color.red == pytest.approx(0.5, abs=0.02)
+
+    backend.advance(0.6)
+    assert widget._style.background_color == Color(1, 1, 1, 1)
+    assert not is_animating()
+    assert not _Animations.running
+
+
+def test_only_listed_properties(backend, context):
+    widget = fading(transition=Transition(1.0, Easing.LINEAR, ('width',)))
+    widget.compute(context)
+    widget._hover = True
+    widget.compute(context)
+
+    # Colors change at once, the width animates.
+    assert widget._style.background_color == Color(1, 1, 1, 1)
+    backend.advance(0.5)
+    assert widget._style.width.value == pytest.approx(15, abs=0.5)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import gc
+
+from bwl.binding import Bindings, Observable
+from bwl.widget import Widget
+
+
+def test_observed_and_polled():
+    bindings = Bindings()
+    widget = Widget()
+    name = Observable('a')
+    count = [1]
+    bindings.bind(widget, 'text', name)
+    bindings.bind(widget, 'classes', lambda: {f'count{count[0]}'})
+
+    assert bindings.update() == 2
+    assert (widget.text, widget.classes) == ('a', {'count1'})
+    assert bindings.update() == 0
+
+    name.value = 'b'
+    count[0] = 2
+    assert bindings.update() == 2
+    assert (widget.text, widget.classes) == ('b', {'count2'})
+
+
+def test_unbind():
+    bindings = Bindings()
+    widget = Widget()
+    name = Observable('a')
+    binding = bindings.bind(widget, 'text', name)
+    bindings.unbind(binding)
+
+    name.value = 'b'
+    assert bindings.update() == 0
+    assert widget.text is None
+    assert len(bindings) == 0
+
+
+def test_bindings_of_collected_widgets_are_dropped():
+    bindings = Bindings()
+    name = Observable('a')
+
+    # The observable never changes, the bindings are still dropped with their widgets.
+    for _ in range(10):
+        bindings.bind(Widget(), 'text', name)
+    gc.collect()
+
+    widget = Widget()
+    bindings.bind(widget, 'text', name)
+    assert len(bindings) == 1
+    assert len(name._subscribers) == 1
+
+    assert bindings.update() == 1
+    assert widget.text == 'a'
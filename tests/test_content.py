@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import array
+import sys
+
+import numpy as np
+import pytest
+
+from bwl.content import Texture
+
+
+def test_from_pixels_copies():
+    pixels = np.random.default_rng(0).random((3, 2, 4), dtype=np.float32)
+    texture = Texture.from_pixels('pixels', pixels, 2, 3)
+    expected = pixels.copy()
+    pixels[:] = 0
+
+    assert (texture.width, texture.height) == (2, 3)
+    assert np.array_equal(np.asarray(texture.data.pixels), expected)
+
+
+def test_from_pixels_buffers():
+    values = array.array('f', [0.5] * 16)
+    assert Texture.from_pixels('array', values, 2, 2).width == 2
+    assert Texture.from_pixels('bytes', values.tobytes(), 4, 1).height == 1
+
+
+def test_from_pixels_size():
+    with pytest.raises(Exception, match='must be 2x2 RGBA'):
+        Texture.from_pixels('small', np.zeros((1, 2, 4), dtype=np.float32), 2, 2)
+
+    with pytest.raises(Exception, match='contiguous'):
+        Texture.from_pixels('strided', np.zeros((2, 4, 4), dtype=np.float32)[:, ::2], 2, 2)
+
+
+
+def test_from_pixels_rejects_other_types():
+    with pytest.raises(Exception, match="32-bit floats, not format 'B'"):
+        Texture.from_pixels('bytes', np.zeros((2, 2, 16), dtype=np.uint8), 2, 2)
+
+    with pytest.raises(Exception, match='32-bit floats'):
+        Texture.from_pixels('doubles', np.zeros((2, 1, 4), dtype=np.float64), 2, 2)
+
+    with pytest.raises(Exception, match='32-bit floats'):
+        Texture.from_pixels('swapped', np.zeros((2, 2, 4), dtype='>f4' if (sys.byteorder == 'little') else '<f4'), 2, 2)
+
+def test_update():
+    texture = Texture.from_pixels('pixels', np.zeros((4, 4, 4), dtype=np.float32), 4, 4)
+    texture.update(np.ones((2, 3, 4), dtype=np.float32), 1, 2, 3, 2)
+    pixels = np.asarray(texture.data.pixels)
+
+    assert pixels[2:4, 1:4].min() == 1
+    assert pixels.sum() == 2 * 3 * 4
+
+    with pytest.raises(Exception, match='outside'):
+        texture.update(np.ones((2, 2, 4), dtype=np.float32), 3, 3, 2, 2)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import json
+import marshal
+from pathlib import Path
+
+import pytest
+
+from bwl import document
+from bwl.document import _Documents, compile_document, load_document
+from bwl.resources import get_resource_manager
+from bwl.style import Align, Size
+from bwl.widget import Widget
+
+PANEL = {
+    'fonts': {'roboto': 'roboto.ttf'},
+    'textures': {'blender': 'blender.png'},
+    'styles': {
+        'window': {'width': 400, 'height': 'children', 'padding': [8, 12], 'font': 'roboto'},
+        'row': {'width': '100%', 'height': 24, 'align_x': 'center'},
+    },
+    'sheet': {'.button:hover': {'background_color': 0.4}},
+    'root': {
+        'key': 'window',
+        'styles': 'window',
+        'children': [
+            {'key': 'title', 'styles': ['row', {'font_size': 18}], 'text': 'Title'},
+            {'key': 'icon', 'texture': 'blender', 'styles': {'width': 'texture', 'height': 'texture'}},
+            {'key': 'ok', 'classes': ['button'], 'styles': 'row', 'text': 'OK'},
+        ],
+    },
+}
+
+
+@pytest.fixture
+def panel(resources: Path) -> Path:
+    path = resources.joinpath('panel.json')
+    path.write_text(json.dumps(PANEL))
+    return path
+
+
+def test_build(panel):
+    loaded = load_document(panel, None)
+    root = loaded.build()
+
+    assert [child._spec.key for child in root.children] == ['title', 'icon', 'ok']
+    assert root.styles[0].width == Size.absolute(400)
+    assert root.children[0].styles[0].align_x is Align.CENTER
+    assert root.children[0].styles[1].font_size == 18
+    assert root.children[2].classes == {'button'}
+    assert root.style_sheet is not None
+    assert root.styles[0].font is loaded.fonts['roboto']
+
+
+def test_cache_file(panel, tmp_path, monkeypatch):
+    cache = tmp_path.joinpath('cache')
+    load_document(panel, cache)
+    assert len(list(cache.glob('*.bwlc'))) == 1
+
+    # Loading again in another session reads the cache file instead of compiling.
+    _Documents.compiled.clear()
+    monkeypatch.setattr(document, 'compile_document', None)
+    assert load_document(panel, cache).build() is not None
+
+
+
+@pytest.mark.parametrize('planted', [(), (1, (), (), ('not a style',), (), None), (1, (), (), (), (('.a', 5),), None)])
+def test_malformed_cache_file(panel, tmp_path, planted):
+    cache = tmp_path.joinpath('cache')
+    load_document(panel, cache)
+    path = next(cache.glob('*.bwlc'))
+    path.write_bytes(marshal.dumps(planted))
+
+    # A cache file of the wrong shape is compiled again and replaced.
+    _Documents.compiled.clear()
+    assert load_document(panel, cache).build() is not None
+    assert marshal.loads(path.read_bytes()) == compile_document(PANEL)
+
+
+def test_default_cache_folder_is_per_user(monkeypatch, tmp_path):
+    monkeypatch.setattr(document.sys, 'platform', 'linux')
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert document._user_cache_folder() == tmp_path.joinpath('bwl')
+
+    monkeypatch.delenv('XDG_CACHE_HOME')
+    assert document._user_cache_folder() == Path.home().joinpath('.cache', 'bwl')
+
+def test_loads_share_styles(panel):
+    first = load_document(panel, None)
+    second = load_document(panel, None)
+
+    assert first is not second
+    assert second.sheet is first.sheet
+    assert second.spec() is first.spec()
+    assert second.fonts['roboto'] is first.fonts['roboto']
+
+
+def test_remove_one_of_two_loads(backend, panel):
+    first = load_document(panel, None)
+    second = load_document(panel, None)
+    font = second.fonts['roboto']
+
+    first.remove()
+    backend.advance(0.1)
+    assert font.id > 0
+    assert get_resource_manager().stats['fonts'] == 1
+    assert second.build() is not None
+
+    # Removing again does nothing, it doesn't release the resources of the other document.
+    first.remove()
+    backend.advance(0.1)
+    assert font.id > 0
+
+    second.remove()
+    backend.advance(0.1)
+    assert font.id == 0
+    assert get_resource_manager().stats == {'fonts': 0, 'textures': 0, 'unused': 0, 'bytes': 0}
+
+
+
+def test_removed_documents_let_go_of_styles(panel):
+    first = load_document(panel, None)
+    second = load_document(panel, None)
+    digest = first.digest
+
+    first.remove()
+    assert digest in _Documents.decoded
+
+    second.remove()
+    second.remove()
+    assert digest not in _Documents.decoded
+    assert digest not in _Documents.users
+
+def test_load_after_resources_were_freed(backend, panel):
+    first = load_document(panel, None)
+    first.remove()
+    backend.advance(0.1)
+
+    # Styles of the first document use its freed font, so they're made again.
+    second = load_document(panel, None)
+    assert second.styles['window'] is not first.styles['window']
+    assert second.styles['window'].font is second.fonts['roboto']
+    assert second.fonts['roboto'].id > 0
+
+
+def test_classes(panel):
+    class Button(Widget):
+        pass
+
+    data = json.loads(panel.read_text())
+    data['root']['children'][2]['class'] = 'Button'
+    panel.write_text(json.dumps(data))
+    loaded = load_document(panel, None)
+
+    assert isinstance(loaded.build({'Button': Button}).children[2], Button)
+
+    with pytest.raises(Exception, match='Unknown widget class Button'):
+        loaded.build()
+
+
+def test_compile_errors():
+    with pytest.raises(Exception, match='no root'):
+        compile_document({})
+    with pytest.raises(Exception, match='Unknown style missing'):
+        compile_document({'root': {'styles': 'missing'}})
+    with pytest.raises(Exception, match='Unknown style property colour'):
+        compile_document({'root': {'styles': {'colour': 1}}})
+    with pytest.raises(Exception, match='Invalid value'):
+        compile_document({'root': {'styles': {'width': [1, 2]}}})
+    with pytest.raises(Exception, match='Unknown texture'):
+        compile_document({'root': {'texture': 'missing'}})
+
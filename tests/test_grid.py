@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from bwl.animation import _Animations
+from bwl.grid import GridView
+from bwl.style import Color, Display, Size, Style, Transition
+from bwl.widget import Widget, _Focus
+
+
+class Rows(GridView):
+    '''Grid of rows that fade to white on hover.'''
+
+    def create_cell(self) -> Widget:
+        cell = Widget()
+        cell.styles = [
+            Style(background_color=Color(0, 0, 0, 1), transition=Transition(1.0)),
+            Style(background_color=Color(1, 1, 1, 1), criteria=lambda widget, context: widget._hover),
+        ]
+        return cell
+
+
+def grid(scroll: float = 0) -> Style:
+    return Style(
+        display=Display.GRID,
+        width=Size.absolute(200),
+        height=Size.absolute(100),
+        cell_width=Size.relative(1),
+        cell_height=Size.absolute(20),
+        scroll=scroll,
+    )
+
+
+def test_cells_that_leave_the_view_are_reused(context):
+    view = Rows(count=100)
+    view.styles = [grid()]
+    view.compute(context)
+    assert [index for index, _ in view.cells] == [0, 1, 2, 3, 4]
+
+    first = view.cells[0][1]
+    view.styles = [grid(scroll=200)]
+    view.compute(context)
+    assert [index for index, _ in view.cells] == [10, 11, 12, 13, 14]
+    assert first in view.children
+    assert first.parent is view
+
+
+def test_cells_that_leave_the_view_stop_transitions_and_lose_focus(backend, context):
+    view = Rows(count=100)
+    view.styles = [grid()]
+    view.compute(context)
+
+    cell = view.cells[0][1]
+    cell.focus()
+    cell._hover = True
+    view.compute(context)
+    assert cell in _Animations.widgets
+
+    # The cell is reused for another item, which doesn't fade from the hover of the old one.
+    view.styles = [grid(scroll=500)]
+    view.compute(context)
+    assert cell in view.children
+    assert not _Animations.widgets
+    assert cell._style.background_color == Color(0, 0, 0, 1)
+    assert _Focus.widget is None
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import random
+from typing import Iterator
+
+import pytest
+
+from bwl import layout, packed
+from bwl.packed import packable
+from bwl.style import Align, Direction, Display, Sides, Size, Style, TextWrap
+from bwl.widget import Widget
+
+
+def area(area) -> tuple:
+    return area.x, area.y, area.width, area.height
+
+
+def descendants(widget: Widget) -> Iterator[Widget]:
+    yield widget
+    for child in widget._children:
+        yield from descendants(child)
+
+
+def snapshot(root: Widget) -> list:
+    '''Every computed area of every widget, rounded, and which scissor they use.
+
+    Content areas are only kept for widgets with children and text areas for widgets with text.
+    '''
+    result = []
+
+    for widget in descendants(root):
+        computed = widget._layout
+        areas = (computed.margin, computed.border, computed.padding, computed.inside)
+        if widget._children:
+            areas += (computed.content,)
+        if widget.text:
+            areas += (computed.text,)
+        scissor = area(computed.scissor) if (computed.scissor is not None) else None
+        result.append((tuple(round(value, 4) for value in sum(map(area, areas), ())), scissor))
+
+    return result
+
+
+def test_stack(context):
+    root = Widget()
+    root.styles = [Style(width=Size.flexible(), height=Size.flexible(), padding=Sides(10))]
+    fixed = Widget(root)
+    fixed.styles = [Style(width=Size.absolute(100), height=Size.absolute(50))]
+    flexible = Widget(root)
+    flexible.styles = [Style(width=Size.flexible(), height=Size.flexible(), margin=Sides(5))]
+    root.compute(context)
+
+    assert area(root._layout.inside) == (10, 10, 780, 580)
+    assert area(fixed._layout.margin) == (10, 10, 100, 50)
+    assert area(flexible._layout.margin) == (10, 60, 780, 530)
+    assert area(flexible._layout.inside) == (15, 65, 770, 520)
+
+
+def homogeneous(direction: Direction, count: int) -> Widget:
+    '''Scrolled list of rows or columns that all have the same style, with text in some.'''
+    root = Widget()
+    root.styles = [Style(width=Size.flexible(), height=Size.flexible(), padding=Sides(3))]
+    items = Widget(root)
+    items.styles = [Style(display=Display.SCROLL, width=Size.flexible(), height=Size.flexible(), direction=direction)]
+    main = Size.absolute(18)
+    cross = Size(Size.Type.RELATIVE, 0.5)
+    style = Style(
+        width=main if (direction is Direction.HORIZONTAL) else cross,
+        height=cross if (direction is Direction.HORIZONTAL) else main,
+        margin=Sides(1, 2),
+        padding=Sides(2),
+        align_x=Align.CENTER,
+        align_y=Align.END,
+    )
+
+    for index in range(count):
+        item = Widget(items)
+        item.styles = [style]
+        if index % 3:
+            item.text = f'item {index}'
+
+    return root
+
+
+@pytest.mark.parametrize('direction', list(Direction))
+def test_packed_matches_per_child(context, monkeypatch, direction):
+    root = homogeneous(direction, 100)
+    root.compute(context)
+    assert packable(root.children[0]) is not None
+    arrays = snapshot(root)
+
+    monkeypatch.setattr(packed, 'PACK_MINIMUM', 10**9)
+    root = homogeneous(direction, 100)
+    root.compute(context)
+    assert packable(root.children[0]) is None
+    assert snapshot(root) == arrays
+
+
+def test_mixed_text_wrap_is_not_packed(context, monkeypatch):
+    def mixed() -> Widget:
+        root = Widget()
+        root.styles = [Style(width=Size.flexible(), height=Size.flexible())]
+        for index in range(100):
+            item = Widget(root)
+            item.styles = [Style(
+                width=Size.absolute(60),
+                height=Size.absolute(40),
+                text_wrap=TextWrap.WRAP if index % 2 else TextWrap.NONE,
+            )]
+            item.text = 'a long line of text'
+        return root
+
+    root = mixed()
+    root.compute(context)
+    assert packable(root) is None
+    assert root.children[0]._layout.lines.height < root.children[1]._layout.lines.height
+
+    monkeypatch.setattr(packed, 'PACK_MINIMUM', 10**9)
+    expected = mixed()
+    expected.compute(context)
+    assert snapshot(root) == snapshot(expected)
+
+
+def test_clean_subtrees_are_skipped(context, monkeypatch):
+    root = Widget()
+    root.styles = [Style(width=Size.flexible(), height=Size.flexible(), direction=Direction.HORIZONTAL)]
+    columns = [Widget(root) for _ in range(10)]
+
+    for column in columns:
+        column.styles = [Style(width=Size.absolute(100), height=Size.flexible())]
+        for index in range(10):
+            row = Widget(column)
+            row.styles = [Style(width=Size.flexible(), height=Size.absolute(20))]
+            row.text = f'row {index}'
+
+    root.compute(context)
+    calls = []
+    compute_width = layout.compute_width
+
+    def counted(widget, *args, **kwargs):
+        calls.append(widget)
+        return compute_width(widget, *args, **kwargs)
+
+    monkeypatch.setattr(layout, 'compute_width', counted)
+    columns[3].insert(0, Widget())
+    root.compute(context)
+
+    # The root and the changed column are computed again, the other columns are only visited.
+    assert set(calls) <= {root, *columns, *descendants(columns[3])}
+    assert area(columns[3].children[1]._layout.margin) == (300, 0, 100, 20)
+
+
+def random_style(rng: random.Random) -> Style:
+    def size() -> Size:
+        return rng.choice((Size.absolute(rng.randint(10, 60)), Size.flexible(), Size(Size.Type.RELATIVE, 0.5)))
+
+    return Style(
+        width=size(),
+        height=size(),
+        direction=rng.choice(list(Direction)),
+        align_x=rng.choice(list(Align)),
+        align_y=rng.choice(list(Align)),
+        padding=Sides(rng.randint(0, 4)),
+        margin=Sides(rng.randint(0, 3)),
+        display=rng.choice([Display.STANDARD] * 6 + [Display.SCROLL, Display.FLOAT]),
+        offset_x=rng.choice((0, 0, 3)),
+    )
+
+
+def random_tree(rng: random.Random, parent: Widget, depth: int = 0):
+    for _ in range(rng.randint(1, 4) if (depth < 3) else 0):
+        widget = Widget(parent)
+        widget.styles = [random_style(rng)]
+
+        if rng.random() < 0.5:
+            widget.text = 'hello world ' * rng.randint(1, 3)
+
+        random_tree(rng, widget, depth + 1)
+
+
+def mutate(rng: random.Random, root: Widget):
+    widget = rng.choice(list(descendants(root))[1:])
+    parent = widget.parent
+    choice = rng.random()
+
+    if choice < 0.2:
+        Widget(widget).styles = [random_style(rng)]
+    elif choice < 0.35:
+        parent.remove(widget)
+    elif choice < 0.5:
+        parent.move(widget, rng.randint(0, len(parent.children) - 1))
+    elif choice < 0.65:
+        widget.styles = [random_style(rng)]
+    elif choice < 0.8:
+        widget.text = 'x' * rng.randint(1, 30)
+    else:
+        target = rng.choice(list(descendants(root)))
+        if target not in descendants(widget):
+            target.append(widget)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_incremental_matches_full(context, seed):
+    rng = random.Random(seed)
+
+    for _ in range(8):
+        root = Widget()
+        root.styles = [Style(width=Size.flexible(), height=Size.flexible())]
+        random_tree(rng, root)
+        root.compute(context)
+
+        for _ in range(20):
+            if not root.children:
+                break
+
+            mutate(rng, root)
+            root.compute(context)
+            incremental = snapshot(root)
+
+            for widget in descendants(root):
+                widget._layout.dirty = True
+
+            root.compute(context)
+            assert incremental == snapshot(root)
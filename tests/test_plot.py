@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import numpy as np
+
+from bwl.plot import _extremes, _valid_range
+
+
+def test_extremes_keep_peaks():
+    y = np.zeros(100)
+    y[13], y[57] = 5, -5
+    indices = _extremes(y, 10)
+
+    assert 13 in indices
+    assert 57 in indices
+    assert indices[0] == 0
+    assert indices[-1] == 99
+    assert (np.diff(indices) >= 0).all()
+
+
+def test_extremes_of_each_bucket():
+    y = np.random.default_rng(0).normal(size=1003)
+    indices = _extremes(y, 10)
+
+    # Two per bucket, the ends, and the values that don't fill a bucket.
+    assert len(indices) == 2 * 10 + 2 + 3
+
+    for bucket in range(10):
+        values = y[bucket * 100:(bucket + 1) * 100]
+        kept = y[indices[1 + 2 * bucket:3 + 2 * bucket]]
+        assert kept.min() == values.min()
+        assert kept.max() == values.max()
+
+    assert list(indices[-4:-1]) == [1000, 1001, 1002]
+
+
+def test_valid_range():
+    assert _valid_range((3, 1)) == (1, 3)
+    assert _valid_range((2, 2)) == (1.5, 2.5)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from bwl.animation import _Animations
+from bwl.pool import WidgetPool
+from bwl.style import Color, Size, Style, Transition
+from bwl.widget import Widget, _Focus
+
+ROW = Style(width=Size.flexible(), height=Size.absolute(20))
+
+
+def test_acquire_reuses_released_widgets():
+    pool = WidgetPool()
+    parent = Widget()
+    first = pool.acquire(Widget, [ROW], parent)
+    label = pool.acquire(Widget, [], first)
+    label.text = 'label'
+
+    pool.release(first)
+    assert not parent.children
+    assert first.parent is None
+    assert len(pool) == 2
+
+    again = pool.acquire(Widget, [ROW], parent)
+    assert again is first
+    assert not again.children
+    assert again.parent is parent
+    assert (pool.allocated, pool.reused, pool.released) == (2, 1, 2)
+
+
+def test_acquire_by_class_and_styles():
+    pool = WidgetPool()
+    pool.release(pool.acquire(Widget, [ROW]))
+
+    other = pool.acquire(Widget, [])
+    assert pool.reused == 0
+    assert other.styles == []
+
+
+def test_release_children_resets_state():
+    pool = WidgetPool()
+    parent = Widget()
+    rows = [pool.acquire(Widget, [ROW], parent) for _ in range(3)]
+    rows[1]._hover = True
+    rows[2].focus()
+
+    pool.release_children(parent)
+    assert not parent.children
+    assert not rows[1].hover
+    assert _Focus.widget is None
+    assert len(pool) == 3
+
+
+def test_release_during_transition(backend, context):
+    pool = WidgetPool()
+    widget = pool.acquire(Widget, [])
+    widget.styles = [
+        Style(background_color=Color(0, 0, 0, 1), transition=Transition(1.0)),
+        Style(background_color=Color(1, 1, 1, 1), criteria=lambda widget, context: widget._hover),
+    ]
+    widget.compute(context)
+    widget._hover = True
+    widget.compute(context)
+    assert widget in _Animations.widgets
+
+    # A root widget isn't detached from anything, so only the pool can stop its transition.
+    pool.release(widget)
+    assert widget not in _Animations.widgets
+
+    # The next animation step must not touch the released widget.
+    backend.advance(0.1)
+    assert widget._animation is None
+
+
+def test_limit():
+    pool = WidgetPool()
+    pool.limit = 2
+    parent = Widget()
+
+    for _ in range(4):
+        pool.acquire(Widget, [ROW], parent)
+
+    pool.release_children(parent)
+    assert len(pool) == 2
+    assert pool.released == 4
+
+
+def test_reused_widget_starts_from_default_style(backend, context):
+    pool = WidgetPool()
+    root = Widget()
+    root.styles = [Style(width=Size.flexible(), height=Size.flexible())]
+    styles = [
+        Style(background_color=Color(0, 0, 0, 1), transition=Transition(1.0)),
+        Style(background_color=Color(1, 1, 1, 1), criteria=lambda widget, context: widget._hover),
+    ]
+    widget = pool.acquire(Widget, styles, root)
+    widget._hover = True
+    root.compute(context)
+    backend.advance(2)
+    assert widget._style.background_color == Color(1, 1, 1, 1)
+
+    pool.release(widget)
+    again = pool.acquire(Widget, styles, root)
+    assert again is widget
+    root.compute(context)
+
+    # Not hovered, so black right away rather than fading from the white of its last use.
+    assert not _Animations.widgets
+    assert again._style.background_color == Color(0, 0, 0, 1)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import os
+import struct
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from bwl.backends import set_backend
+from bwl.backends.headless import Context, Image
+from bwl.backends.raster import RasterBackend
+from bwl.content import Texture
+from bwl.style import Align, Color, Corners, Direction, Display, Sides, Size, Style
+from bwl.widget import Widget
+
+# Golden images are written again instead of compared when this is set.
+UPDATE = bool(os.environ.get('BWL_UPDATE_GOLDEN'))
+GOLDEN = Path(__file__).parent.joinpath('golden')
+
+WIDTH = 160
+HEIGHT = 120
+
+
+def read_png(path: Path) -> np.ndarray:
+    '''8 bit RGBA pixels of a PNG file written by RasterBackend.write_png, which doesn't filter scanlines.'''
+    data = path.read_bytes()
+    width, height = struct.unpack('>II', data[16:24])
+    chunks = []
+    position = 8
+
+    while position < len(data):
+        length, kind = struct.unpack('>I4s', data[position:position + 8])
+        if kind == b'IDAT':
+            chunks.append(data[position + 8:position + 8 + length])
+        position += length + 12
+
+    rows = np.frombuffer(zlib.decompress(b''.join(chunks)), np.uint8).reshape(height, width * 4 + 1)
+    assert not rows[:, 0].any()
+    return rows[:, 1:].reshape(height, width, 4)
+
+
+@pytest.fixture
+def raster() -> RasterBackend:
+    backend = RasterBackend(WIDTH, HEIGHT)
+    set_backend(backend)
+    return backend
+
+
+def render(backend: RasterBackend, root: Widget, name: str):
+    '''Render a tree and compare the frame with its golden image, off by one in 8 bits at most.'''
+    context = Context(WIDTH, HEIGHT)
+    backend.clear((0, 0, 0, 1))
+    root.compute(context)
+    root.render(context)
+    path = GOLDEN.joinpath(f'{name}.png')
+
+    if UPDATE:
+        GOLDEN.mkdir(exist_ok=True)
+        backend.write_png(path)
+
+    assert path.exists(), f'No golden image {path.name}, run with BWL_UPDATE_GOLDEN=1 to write it'
+    golden = read_png(path).astype(np.int16)
+    difference = np.abs(backend.image().astype(np.int16) - golden)
+    assert difference.max() <= 1, f'{np.count_nonzero(difference > 1)} pixels differ from {path.name}'
+
+
+def full(**properties) -> Style:
+    return Style(width=Size.flexible(), height=Size.flexible(), **properties)
+
+
+def box(parent: Widget, width: float, height: float, **properties) -> Widget:
+    widget = Widget(parent)
+    widget.styles = [Style(width=Size.absolute(width), height=Size.absolute(height), **properties)]
+    return widget
+
+
+def test_rectangles(raster):
+    root = Widget()
+    root.styles = [full(padding=Sides(8), direction=Direction.HORIZONTAL, background_color=Color(0.1))]
+    box(root, 40, 40, background_color=Color(1, 0, 0), margin=Sides(4))
+    box(root, 40, 60, background_color=Color(0, 0.5, 1), border_color=Color(1), border_thickness=3, margin=Sides(4))
+    box(root, 50, 50, background_color=Color(0, 1, 0, 0.5), border_radius=Corners(12), margin=Sides(4))
+    render(raster, root, 'rectangles')
+
+
+def test_borders_and_corners(raster):
+    root = Widget()
+    root.styles = [full(align_x=Align.CENTER, align_y=Align.CENTER, background_color=Color(0.2))]
+    outer = box(
+        root, 120, 90,
+        background_color=Color(0.9, 0.9, 0.2),
+        border_color=Color(0.1, 0.1, 0.6),
+        border_thickness=4,
+        border_radius=Corners(20, 4, 20, 4),
+        padding=Sides(12),
+    )
+    box(outer, 40, 30, background_color=Color(1, 1, 1, 0.8), border_radius=Corners(15))
+    render(raster, root, 'borders')
+
+
+def test_scroll_clips_children(raster):
+    root = Widget()
+    root.styles = [full(align_x=Align.CENTER, align_y=Align.CENTER, background_color=Color(0.1))]
+    scroll = box(root, 100, 70, display=Display.SCROLL, padding=Sides(4), background_color=Color(0.3))
+
+    for index in range(5):
+        box(scroll, 120, 20, margin=Sides(2), background_color=Color(0.2 * index, 0.5, 1 - 0.2 * index))
+
+    render(raster, root, 'scroll')
+
+
+def test_text_and_texture(raster):
+    root = Widget()
+    root.styles = [full(padding=Sides(6), background_color=Color(0.05))]
+
+    label = box(root, 148, 24, foreground_color=Color(1), background_color=Color(0.3), font_size=16)
+    label.text = 'A label'
+
+    # Bottom row first, like images in Blender.
+    pixels = np.zeros((2, 2, 4), dtype=np.float32)
+    pixels[..., 3] = 1
+    pixels[0, 0, 0] = pixels[0, 1, 1] = pixels[1, 0, 2] = 1
+    pixels[1, 1, :3] = 1
+    image = box(root, 64, 64, margin=Sides(4))
+    image.texture = Texture(Image('checker', 2, 2, pixels))
+
+    render(raster, root, 'texture')
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import pytest
+
+from bwl.reconcile import Spec, build, reconcile, update
+from bwl.style import Size, Style
+from bwl.widget import Widget
+
+ROW = Style(width=Size.flexible(), height=Size.absolute(20))
+
+
+class Freed(Widget):
+    '''Widget which counts how often it was freed.'''
+    frees = 0
+
+    def on_free(self):
+        Freed.frees += 1
+
+
+def rows(*names: str, cls=Widget):
+    return [Spec(key=name, cls=cls, text=name, styles=[ROW]) for name in names]
+
+
+def test_build():
+    root = build(Spec(styles=[ROW], children=[Spec(text='a'), Spec(text='b', classes=['label'])]))
+
+    assert root.styles == [ROW]
+    assert [child.text for child in root.children] == ['a', 'b']
+    assert root.children[1].classes == {'label'}
+    assert all(child.parent is root for child in root.children)
+
+
+def test_reconcile_keeps_widgets_by_key(context):
+    root = Widget()
+    reconcile(root, rows('a', 'b', 'c'))
+    a, b, c = root.children
+    b._hover = True
+    root.compute(context)
+
+    reconcile(root, rows('c', 'new', 'b'))
+    assert root.children[0] is c
+    assert root.children[2] is b
+    assert b.hover
+    assert root.children[1].text == 'new'
+    assert a.parent is None
+    assert root._layout.dirty
+
+
+def test_reconcile_by_order_without_keys():
+    root = Widget()
+    reconcile(root, [Spec(text='a'), Spec(text='b')])
+    first = root.children[0]
+
+    reconcile(root, [Spec(text='c')])
+    assert root.children == [first]
+    assert first.text == 'c'
+
+
+def test_reconcile_unchanged_order_keeps_layout(context):
+    root = Widget()
+    reconcile(root, rows('a', 'b'))
+    root.compute(context)
+
+    reconcile(root, rows('a', 'b'))
+    assert not root._layout.dirty
+
+
+def test_reconcile_replaces_other_class():
+    Freed.frees = 0
+    root = Widget()
+    reconcile(root, rows('a', cls=Freed))
+    old = root.children[0]
+
+    reconcile(root, rows('a'))
+    assert type(root.children[0]) is Widget
+    assert old.parent is None
+    assert Freed.frees == 1
+
+
+def test_reconcile_frees_removed():
+    Freed.frees = 0
+    root = Widget()
+    reconcile(root, [Spec(key='a', cls=Freed, children=[Spec(cls=Freed)]), *rows('b')])
+    removed = root.children[0]
+    removed.children[0].focus()
+
+    reconcile(root, rows('b'))
+    assert Freed.frees == 2
+    assert not removed.children[0].focused
+
+
+def test_reconcile_duplicate_keys():
+    with pytest.raises(Exception, match='Duplicate key'):
+        reconcile(Widget(), rows('a', 'a'))
+
+
+def test_update_skips_same_spec():
+    spec = Spec(text='a', children=rows('x'))
+    widget = build(spec)
+    widget.text = 'changed'
+
+    update(widget, spec)
+    assert widget.text == 'changed'
+
+    update(widget, Spec(text='a', children=None))
+    assert widget.text == 'a'
+    assert len(widget.children) == 1
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import shutil
+
+import pytest
+
+from bwl.content import Font
+from bwl.resources import ResourceManager, get_resource_manager
+
+
+def test_loaded_once_per_content(resources):
+    manager = ResourceManager()
+    shutil.copy(resources.joinpath('roboto.ttf'), resources.joinpath('copy.ttf'))
+
+    font = manager.font(resources.joinpath('roboto.ttf'))
+    assert manager.font(resources.joinpath('copy.ttf')) is font
+    assert manager.texture(resources.joinpath('blender.png')) is manager.texture(resources.joinpath('blender.png'))
+    assert manager.texture(resources.joinpath('cross.png')) is not manager.texture(resources.joinpath('blender.png'))
+
+    stats = manager.stats
+    assert (stats['fonts'], stats['textures'], stats['unused']) == (1, 2, 0)
+
+
+def test_freed_when_unused(backend, resources):
+    manager = ResourceManager()
+    font = manager.font(resources.joinpath('roboto.ttf'))
+    manager.font(resources.joinpath('roboto.ttf'))
+
+    manager.release(font)
+    backend.advance(0.1)
+    assert font.id > 0
+
+    manager.release(font)
+    assert manager.stats['unused'] == 1
+    backend.advance(0.1)
+    assert font.id == 0
+    assert manager.stats['fonts'] == 0
+
+
+def test_used_again_before_collect(resources):
+    manager = ResourceManager()
+    font = manager.font(resources.joinpath('roboto.ttf'))
+    manager.release(font)
+
+    assert manager.font(resources.joinpath('roboto.ttf')) is font
+    assert manager.collect() == 0
+    assert font.id > 0
+
+
+def test_collect(resources):
+    manager = ResourceManager()
+    texture = manager.texture(resources.joinpath('blender.png'))
+    assert manager.stats['bytes'] == texture.width * texture.height * 4
+
+    manager.release(texture)
+    assert manager.collect() == 1
+    assert manager.stats['bytes'] == 0
+
+
+def test_acquire(resources):
+    manager = ResourceManager()
+    font = manager.font(resources.joinpath('roboto.ttf'))
+    assert manager.acquire(font) is font
+
+    manager.release(font)
+    manager.release(font)
+
+    with pytest.raises(Exception, match='released more often'):
+        manager.release(font)
+
+
+def test_not_loaded_by_manager(resources):
+    with pytest.raises(Exception, match='not loaded by this manager'):
+        ResourceManager().release(Font(resources.joinpath('roboto.ttf')))
+
+
+def test_texture_from_buffer():
+    manager = ResourceManager()
+    texture = manager.texture_from_buffer('a', b'data', 2, 2)
+
+    assert manager.texture_from_buffer('b', b'data', 2, 2) is texture
+    assert manager.texture_from_buffer('a', b'data', 4, 1) is not texture
+
+
+def test_shared_manager():
+    assert get_resource_manager() is get_resource_manager()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from bwl.style import TextWrap
+from bwl.text import ELLIPSIS, _fitting, fit_text, prefix_widths
+
+# The headless backend measures every character as half the font size wide.
+SIZE = 10
+
+
+def test_prefix_widths():
+    assert prefix_widths(0, SIZE, 'abc') == (0, 5, 10, 15)
+    assert prefix_widths(0, SIZE, '') == (0,)
+
+
+def test_fitting():
+    assert _fitting(0, SIZE, 'abcdef', 15) == 3
+    assert _fitting(0, SIZE, 'abcdef', 14.9) == 2
+    assert _fitting(0, SIZE, 'abcdef', 100) == 6
+    assert _fitting(0, SIZE, 'abcdef', 1) == 0
+    assert _fitting(0, SIZE, 'abcdef', 20, ELLIPSIS) == 3
+
+
+def test_ellipsis():
+    assert fit_text(0, SIZE, 'hello world', TextWrap.ELLIPSIS, 100).lines == ('hello world',)
+    assert fit_text(0, SIZE, 'hello world', TextWrap.ELLIPSIS, 40).lines == (f'hello w{ELLIPSIS}',)
+
+    # Spaces before the ellipsis are dropped.
+    assert fit_text(0, SIZE, 'hello world', TextWrap.ELLIPSIS, 35).lines == (f'hello{ELLIPSIS}',)
+
+
+def test_wrap():
+    lines = fit_text(0, SIZE, 'one two three\nfour', TextWrap.WRAP, 40)
+    assert lines.lines == ('one two', 'three', 'four')
+    assert lines.widths == (35, 25, 20)
+
+
+def test_wrap_breaks_long_words():
+    assert fit_text(0, SIZE, 'abcdefghij xy', TextWrap.WRAP, 20).lines == ('abcd', 'efgh', 'ij', 'xy')
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from bwl.backends.headless import Event
+from bwl.style import Sides, Size, Style
+from bwl.textinput import TextInput, _GapBuffer
+from bwl.widget import Widget, _Focus
+
+
+def test_gap_buffer_edits():
+    buffer = _GapBuffer('hello world')
+    buffer.replace(5, 5, ',')
+    buffer.replace(0, 1, 'H')
+    buffer.replace(7, 12, 'there')
+
+    assert str(buffer) == 'Hello, there'
+    assert len(buffer) == 12
+    assert buffer.slice(3, 9) == 'lo, th'
+
+
+def test_gap_buffer_move_keeps_text():
+    buffer = _GapBuffer('abcdef')
+
+    for index in (0, 6, 3, 1, 5):
+        buffer.move(index)
+        assert len(buffer.before) == index
+        assert str(buffer) == 'abcdef'
+
+
+def test_gap_buffer_matches_string():
+    rng = random.Random(0)
+    buffer = _GapBuffer('hello world')
+    text = 'hello world'
+
+    for _ in range(2000):
+        start = rng.randint(0, len(text))
+        stop = rng.randint(start, len(text))
+        insert = rng.choice(('', 'a', 'xyz'))
+        buffer.replace(start, stop, insert)
+        text = text[:start] + insert + text[stop:]
+
+        start = rng.randint(0, len(text))
+        stop = rng.randint(start, len(text))
+        assert buffer.slice(start, stop) == text[start:stop]
+
+    assert str(buffer) == text
+
+
+def press(root: Widget, context, type: str, x: int, y: int):
+    '''Click at a point, with y from the top of the area like layout.'''
+    y = context.area.height - y
+    root.handle(context, Event('MOUSEMOVE', mouse_region_x=x, mouse_region_y=y))
+    root.handle(context, Event(type, 'PRESS', mouse_region_x=x, mouse_region_y=y))
+    root.handle(context, Event(type, 'RELEASE', mouse_region_x=x, mouse_region_y=y))
+
+
+def type_keys(root: Widget, context, text: str):
+    for character in text:
+        root.handle(context, Event(character.upper(), 'PRESS', unicode=character))
+        root.handle(context, Event(character.upper(), 'RELEASE'))
+
+
+@pytest.fixture
+def form(context) -> Widget:
+    root = Widget()
+    root.styles = [Style(width=Size.flexible(), height=Size.flexible(), padding=Sides(10))]
+    TextInput(root, 'hello world')
+    root.compute(context)
+    return root
+
+
+def test_click_focuses_and_types(form, context):
+    field = form.children[0]
+    inside = field._layout.inside
+    press(form, context, 'LEFTMOUSE', inside.x + 1, inside.y + 5)
+    assert field.focused
+    assert field.caret == 0
+
+    type_keys(form, context, 'ab')
+    assert field.text == 'abhello world'
+    assert field.caret == 2
+
+    # Keys go to the focused field wherever the cursor is.
+    form.handle(context, Event('MOUSEMOVE', mouse_region_x=700, mouse_region_y=100))
+    type_keys(form, context, 'c')
+    assert field.text == 'abchello world'
+
+
+def test_click_outside_unfocuses(form, context):
+    field = form.children[0]
+    field.focus()
+
+    press(form, context, 'LEFTMOUSE', 700, 500)
+    assert not field.focused
+    assert _Focus.widget is None
+
+
+def test_click_on_other_widget_unfocuses(form, context):
+    class Button(Widget):
+        def on_mouse_press(self, context, event) -> bool:
+            return True
+
+    button = Button(form)
+    button.styles = [Style(width=Size.absolute(100), height=Size.absolute(30))]
+    form.compute(context)
+    field = form.children[0]
+    field.focus()
+
+    # The button handles the press before the field sees it.
+    press(form, context, 'LEFTMOUSE', button._layout.inside.x + 5, button._layout.inside.y + 5)
+    assert not field.focused
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import struct
+import zlib
+from concurrent.futures import Executor, Future
+
+import numpy as np
+import pytest
+
+from bwl import thumbnails
+from bwl.thumbnails import ThumbnailLoader, _decode_png, _unfilter, _unfilter_diagonals, decode_thumbnail
+from bwl.widget import Widget
+
+# Bytes per pixel of each PNG color type at 8 bits per channel.
+CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    return a if (pa <= pb) and (pa <= pc) else (b if pb <= pc else c)
+
+
+def filtered(rows: np.ndarray, pixel_size: int, kinds) -> bytes:
+    '''Scanlines filtered byte by byte like the PNG specification, with a filter kind per row.'''
+    data = bytearray()
+    prior = [0] * rows.shape[1]
+
+    for row, kind in zip(rows.tolist(), kinds):
+        data.append(kind)
+
+        for i, value in enumerate(row):
+            a = row[i - pixel_size] if i >= pixel_size else 0
+            b = prior[i]
+            c = prior[i - pixel_size] if i >= pixel_size else 0
+            predictor = (0, a, b, (a + b) // 2, paeth(a, b, c))[kind]
+            data.append((value - predictor) % 256)
+
+        prior = row
+
+    return bytes(data)
+
+
+def encode(rows: np.ndarray, color: int, depth: int = 8, palette: bytes = None, transparency: bytes = None) -> bytes:
+    '''PNG file of raw scanlines, the filter of each row cycles through all kinds.'''
+    pixel_size = CHANNELS[color] * depth // 8
+    height, stride = rows.shape
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    header = struct.pack('>IIBBBBB', stride // pixel_size, height, depth, color, 0, 0, 0)
+    png = b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+
+    if palette is not None:
+        png += chunk(b'PLTE', palette)
+    if transparency is not None:
+        png += chunk(b'tRNS', transparency)
+
+    data = zlib.compress(filtered(rows, pixel_size, [y % 5 for y in range(height)]))
+    return png + chunk(b'IDAT', data) + chunk(b'IEND', b'')
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    return np.random.default_rng(1)
+
+
+@pytest.mark.parametrize('kind', range(5))
+@pytest.mark.parametrize('shape', ((1, 1), (9, 4), (4, 9), (16, 16)))
+def test_unfilter(rng, kind, shape):
+    height, width = shape
+    rows = rng.integers(0, 256, (height, width * 3), dtype=np.uint8)
+    data = filtered(rows, 3, [kind] * height)
+    assert (_unfilter(data, height, width * 3, 3) == rows).all()
+
+
+def test_unfilter_mixed(rng):
+    rows = rng.integers(0, 256, (23, 17 * 4), dtype=np.uint8)
+    kinds = rng.integers(0, 5, 23).tolist()
+    assert (_unfilter(filtered(rows, 4, kinds), 23, 17 * 4, 4) == rows).all()
+
+
+def test_unfilter_diagonals_of_row_filters(rng):
+    # Rows without average or paeth filters are undone a row at a time, the diagonal path handles them too.
+    rows = rng.integers(0, 256, (12, 5 * 2), dtype=np.uint8)
+    data = filtered(rows, 2, [0, 1, 2] * 4)
+    lines = np.frombuffer(data, np.uint8).reshape(12, 5 * 2 + 1)
+
+    assert (_unfilter_diagonals(lines, 12, 5, 2) == rows).all()
+    assert (_unfilter(data, 12, 5 * 2, 2) == rows).all()
+
+
+def test_unfilter_unsupported(rng):
+    data = bytearray(filtered(rng.integers(0, 256, (2, 4), dtype=np.uint8), 1, [0, 0]))
+    data[5] = 5
+
+    with pytest.raises(Exception, match='Unsupported PNG filter'):
+        _unfilter(bytes(data), 2, 4, 1)
+
+
+def test_decode_rgba(rng):
+    pixels = rng.integers(0, 256, (10, 7, 4), dtype=np.uint8)
+    assert np.allclose(_decode_png(encode(pixels.reshape(10, -1), 6)), pixels / 255)
+
+
+def test_decode_rgb(rng):
+    pixels = rng.integers(0, 256, (10, 7, 3), dtype=np.uint8)
+    decoded = _decode_png(encode(pixels.reshape(10, -1), 2))
+    assert np.allclose(decoded[..., :3], pixels / 255)
+    assert (decoded[..., 3] == 1).all()
+
+
+def test_decode_gray(rng):
+    gray = rng.integers(0, 256, (10, 7), dtype=np.uint8)
+    decoded = _decode_png(encode(gray, 0))
+    assert np.allclose(decoded[..., :3], (gray / 255)[..., None])
+
+    pixels = rng.integers(0, 256, (10, 7, 2), dtype=np.uint8)
+    decoded = _decode_png(encode(pixels.reshape(10, -1), 4))
+    assert np.allclose(decoded[..., 0], pixels[..., 0] / 255)
+    assert np.allclose(decoded[..., 3], pixels[..., 1] / 255)
+
+
+def test_decode_palette(rng):
+    palette = rng.integers(0, 256, (16, 3), dtype=np.uint8)
+    indices = rng.integers(0, 16, (10, 7), dtype=np.uint8)
+    decoded = _decode_png(encode(indices, 3, palette=palette.tobytes(), transparency=bytes((0, 128))))
+
+    assert np.allclose(decoded[..., :3], palette[indices] / 255)
+    assert (decoded[indices == 0][..., 3] == 0).all()
+    assert np.allclose(decoded[indices == 1][..., 3], 128 / 255)
+    assert (decoded[indices > 1][..., 3] == 1).all()
+
+
+def test_decode_16_bit(rng):
+    pixels = rng.integers(0, 65536, (10, 7, 3), dtype=np.uint16)
+    rows = pixels.astype('>u2').view(np.uint8).reshape(10, -1)
+    assert np.allclose(_decode_png(encode(rows, 2, 16))[..., :3], pixels / 65535)
+
+
+def test_decode_not_png():
+    with pytest.raises(Exception, match='Not a PNG file'):
+        _decode_png(b'nope')
+
+
+def test_decode_thumbnail_without_pillow(rng, tmp_path, monkeypatch):
+    monkeypatch.setattr(thumbnails, 'PILImage', None)
+    pixels = rng.integers(0, 256, (300, 200, 4), dtype=np.uint8)
+    path = tmp_path.joinpath('image.png')
+    path.write_bytes(encode(pixels.reshape(300, -1), 6))
+
+    thumbnail, width, height = decode_thumbnail(path, 128)
+    assert (width, height) == (85, 128)
+    assert thumbnail.shape == (128, 85, 4)
+    assert thumbnail.flags.c_contiguous
+
+    # The bottom row comes first, the top left pixel averages a box of the image.
+    box = pixels[:2, :2].reshape(-1, 4) / 255
+    assert np.allclose(thumbnail[-1, 0], box.mean(axis=0), atol=1e-5)
+
+
+class Immediate(Executor):
+    '''Executor which runs functions when they're submitted.'''
+
+    def submit(self, function, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(function(*args, **kwargs))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+
+def test_failed_loads_count_against_the_budget(tmp_path):
+    class Loader(ThumbnailLoader):
+        budget = 0
+
+        def on_error(self, widget, path, error):
+            errors.append(path)
+
+    errors = []
+    loader = Loader(executor=Immediate())
+    for index in range(5):
+        loader.load(Widget(), tmp_path.joinpath(f'missing{index}.png'))
+
+    # Without time left only one load is handled per tick, whether it failed or not.
+    loader._upload()
+    assert len(errors) == 1
+    assert loader.pending == 4
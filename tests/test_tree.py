@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from bwl.style import Display, Size, Style
+from bwl.tree import TreeView
+from bwl.widget import Widget
+
+
+def tree(context, calls: list, **kwargs) -> TreeView:
+    '''Tree of numbers where odd items are leaves, which records the items it was asked children of.'''
+    def children(item: int) -> list:
+        calls.append(item)
+        return [] if (item % 2) else [item * 10 + 2, item * 10 + 3]
+
+    root = Widget()
+    root.styles = [Style(width=Size.absolute(300), height=Size.absolute(200))]
+    view = TreeView(root, roots=range(1, 30), children=children, label=str, **kwargs)
+    root.compute(context)
+    return view
+
+
+def expander(view: TreeView, row: int) -> str:
+    cell = next(cell for index, cell in view.cells if index == row)
+    return cell._children[-2].text
+
+
+def test_visible_rows_dont_ask_for_children(context):
+    calls = []
+    view = tree(context, calls)
+
+    assert calls == []
+    assert expander(view, 0) == '▸'
+
+
+def test_leaf_loses_expander_when_expanded(context):
+    calls = []
+    view = tree(context, calls)
+    view.expand(0)
+    view.parent.compute(context)
+
+    assert calls == [1]
+    assert not view.is_expanded(0)
+    assert expander(view, 0) is None
+
+
+def test_expand(context):
+    calls = []
+    view = tree(context, calls)
+    view.expand(1)
+    view.parent.compute(context)
+
+    assert view.rows[:5] == (1, 2, 22, 23, 3)
+    assert expander(view, 1) == '▾'
+
+    view.collapse(1)
+    assert view.rows[:3] == (1, 2, 3)
+
+
+def test_has_children(context):
+    calls = []
+    view = tree(context, calls, has_children=lambda item: item % 2 == 0)
+
+    assert expander(view, 0) is None
+    assert expander(view, 1) == '▸'
+    assert calls == []
+
+
+def test_guides(context):
+    calls = []
+    view = tree(context, calls)
+    view.expand(1)
+    view.parent.compute(context)
+
+    cell = next(cell for index, cell in view.cells if index == 2)
+    guide, expander, label = cell.children
+    assert guide.parent is cell
+    assert guide._style.display is not Display.NONE
+    assert label._layout.margin.x == view._layout.inside.x + view.indent * 2
+
+    # Collapsing moves the cell to a top level node, which hides the guide.
+    view.collapse(1)
+    view.parent.compute(context)
+    assert cell.children[0] is guide
+    assert guide._style.display is Display.NONE
+
+
+def test_indent_of_subclass(context):
+    class Wide(TreeView):
+        indent = 30
+
+    root = Widget()
+    root.styles = [Style(width=Size.absolute(300), height=Size.absolute(200))]
+    view = Wide(root, roots=[1], children=lambda item: [2] if (item == 1) else [], label=str)
+    view.expand(0)
+    root.compute(context)
+
+    cell = next(cell for index, cell in view.cells if index == 1)
+    guide, expander, label = cell.children
+    assert expander._layout.margin.width == 30
+    assert label._layout.margin.x == view._layout.inside.x + 60
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import pytest
+
+from bwl.animation import _Animations
+from bwl.backends.headless import Event
+from bwl.style import Color, Direction, Sides, Size, Style, Transition
+from bwl.widget import Widget, _Focus
+
+ROW = Style(width=Size.flexible(), height=Size.absolute(20))
+
+
+class Freed(Widget):
+    '''Widget which counts how often it was freed.'''
+    frees = 0
+
+    def on_free(self):
+        Freed.frees += 1
+
+
+def animated(parent: Widget) -> Widget:
+    '''Widget which fades to white on hover.'''
+    widget = Widget(parent)
+    widget.styles = [
+        Style(background_color=Color(0, 0, 0, 1), transition=Transition(1.0)),
+        Style(background_color=Color(1, 1, 1, 1), criteria=lambda widget, context: widget._hover),
+    ]
+    return widget
+
+
+def hover(root: Widget, context, *widgets: Widget):
+    '''Hover widgets and compute, which starts their transitions.'''
+    root.compute(context)
+    for widget in widgets:
+        widget._hover = True
+    root.compute(context)
+
+
+def test_insert_and_move():
+    root = Widget()
+    a, b, c = Widget(root), Widget(root), Widget(root)
+
+    root.move(c, 0)
+    assert root.children == [c, a, b]
+
+    root.insert(1, b)
+    assert root.children == [c, b, a]
+    assert b.parent is root
+
+
+def test_append_takes_widget_from_other_parent():
+    first, second = Widget(), Widget()
+    child = Widget(first)
+
+    second.append(child)
+    assert not first.children
+    assert child.parent is second
+
+
+def test_remove_and_clear_free():
+    Freed.frees = 0
+    root = Widget()
+    child = Freed(root)
+    Freed(child)
+
+    root.remove(child)
+    assert child.parent is None
+    assert Freed.frees == 2
+
+    kept = Freed(root)
+    root.clear(free=False)
+    assert kept.parent is None
+    assert Freed.frees == 2
+
+
+def test_mutations_update_layout(context):
+    root = Widget()
+    rows = [Widget(root) for _ in range(3)]
+    for row in rows:
+        row.styles = [ROW]
+    root.compute(context)
+
+    root.move(rows[2], 0)
+    root.compute(context)
+    assert [row._layout.margin.y for row in rows] == [20, 40, 0]
+
+    root.remove(rows[1])
+    root.compute(context)
+    assert [row._layout.margin.y for row in (rows[0], rows[2])] == [20, 0]
+
+
+def test_move_of_other_widget():
+    root = Widget()
+    other = Widget(Widget())
+
+    with pytest.raises(Exception, match='not a child'):
+        root.move(other, 0)
+
+    assert root.children == []
+    assert other.parent is not None
+
+
+def test_remove_clears_focus_of_descendants():
+    root = Widget()
+    child = Widget(root)
+    grandchild = Widget(child)
+    grandchild.focus()
+
+    root.remove(child, free=False)
+    assert _Focus.widget is None
+
+
+def test_clear_clears_focus_of_descendants():
+    root = Widget()
+    Widget(Widget(root)).focus()
+
+    root.clear(free=False)
+    assert _Focus.widget is None
+
+
+
+def test_press_outside_focused_subtree_unfocuses(context):
+    root = Widget()
+    root.styles = [Style(width=Size.flexible(), height=Size.flexible(), direction=Direction.HORIZONTAL)]
+    focused, other = Widget(root), Widget(root)
+    for widget in (focused, other):
+        widget.styles = [Style(width=Size.absolute(100), height=Size.absolute(100), padding=Sides(10))]
+    child = Widget(focused)
+    child.styles = [Style(width=Size.flexible(), height=Size.flexible())]
+    root.compute(context)
+    focused.focus()
+
+    def press(x: float, y: float, type: str = 'LEFTMOUSE'):
+        root.handle(context, Event(type, 'PRESS', mouse_region_x=x, mouse_region_y=context.area.height - y))
+
+    press(50, 50)
+    assert _Focus.widget is focused
+
+    # Keys don't take focus, other mouse buttons do.
+    root.handle(context, Event('A', 'PRESS', mouse_region_x=150, mouse_region_y=context.area.height - 50))
+    assert _Focus.widget is focused
+
+    press(150, 50, 'RIGHTMOUSE')
+    assert _Focus.widget is None
+
+def test_remove_stops_transitions(backend, context):
+    root = Widget()
+    widget = animated(root)
+    child = animated(widget)
+    hover(root, context, widget, child)
+    assert _Animations.widgets == {widget, child}
+
+    root.remove(widget, free=False)
+    assert not _Animations.widgets
+
+    # The removed widget shows where its transition was going.
+    assert widget._style.background_color == Color(1, 1, 1, 1)
+    backend.advance(0.1)
+
+
+def test_clear_stops_transitions(backend, context):
+    root = Widget()
+    widget = animated(root)
+    hover(root, context, widget)
+
+    root.clear()
+    assert not _Animations.widgets
+    backend.advance(0.1)